@@ -0,0 +1,73 @@
+"""Compare HTTP/1.1 and HTTP/2 for concurrent GraphQL calls to one Saleor instance.
+
+Starts a local Hypercorn server that stands in for the Saleor GraphQL endpoint and
+answers every request after a fixed delay. The same burst of concurrent requests
+is sent with the connection limits used by the client registry, first over HTTP/1.1
+and then over HTTP/2.
+
+The stand-in server speaks plain-text HTTP/2 (prior knowledge), while against a real
+Saleor instance HTTP/2 is negotiated over TLS.
+
+Usage:
+    uv run python benchmarks/http2.py [--requests 200] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from servers import StandInServer, serving
+
+from saleor_mcp.client_registry import ClientRegistry
+
+CHANNELS = {"channels": [{"id": "Q2hhbm5lbDox", "slug": "default-channel"}]}
+
+
+class ChannelsServer(StandInServer):
+    """Stand-in server answering every request with the same channels."""
+
+    async def respond(self, request):
+        return CHANNELS
+
+
+async def run_burst(url: str, http2: bool, requests: int) -> float:
+    registry = ClientRegistry()
+    transport = httpx.AsyncHTTPTransport(
+        limits=registry.limits, http1=not http2, http2=http2
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        payload = {"query": "query ListChannels { channels { id slug } }"}
+        await client.post(url, json=payload)
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.post(url, json=payload) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    return elapsed
+
+
+async def main(requests: int, latency: float) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = ChannelsServer(latency)
+    async with serving(app) as url:
+        for label, http2 in (("HTTP/1.1", False), ("HTTP/2", True)):
+            app.connections.clear()
+            elapsed = await run_burst(url, http2, requests)
+            print(
+                f"{label:9} {requests} requests in {elapsed * 1000:7.1f} ms "
+                f"({requests / elapsed:7.0f} req/s) over "
+                f"{len(app.connections)} connection(s)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare HTTP/1.1 and HTTP/2 for concurrent GraphQL calls."
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
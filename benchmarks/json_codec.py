@@ -0,0 +1,100 @@
+"""Compare the standard library and orjson for encoding and decoding GraphQL calls.
+
+Decodes full 100-edge `ListOrders` and `ListProducts` response pages the way the
+client does in `get_data`, and encodes a `ListOrders` request body, first with the
+standard library `json` module and then with orjson.
+
+Usage:
+    uv run --extra orjson python benchmarks/json_codec.py [--iterations 200]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+
+import httpx
+from payloads import orders_page, products_page
+
+from saleor_mcp import json_codec
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+
+REQUEST = {
+    "query": "query ListOrders(...) { ... }",
+    "operationName": "ListOrders",
+    "variables": {
+        "first": 100,
+        "after": "W251bGwsICI5MDEiXQ==",
+        "sortBy": {"field": "CREATED_AT", "direction": "DESC"},
+        "filter": {
+            "created": {"gte": "2024-01-01", "lte": "2024-05-31"},
+            "status": ["UNFULFILLED", "PARTIALLY_FULFILLED"],
+            "search": "hoodie",
+        },
+    },
+}
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Return the median time of a call in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1_000_000
+
+
+def run(iterations: int) -> dict[str, float]:
+    client = SaleorClient(
+        url="https://example.saleor.cloud/graphql/",
+        headers={},
+        registry=ClientRegistry(),
+    )
+    results = {}
+    for name, data in (
+        ("ListOrders", orders_page()),
+        ("ListProducts", products_page()),
+    ):
+        body = json.dumps({"data": data}).encode()
+
+        def decode(body=body):
+            # A new response every time, so the parsed data isn't reused.
+            client.get_data(httpx.Response(200, content=body))
+
+        results[f"decode {name} ({len(body) // 1024} KiB)"] = measure(
+            decode, iterations
+        )
+    results["encode ListOrders request"] = measure(
+        lambda: json_codec.dumps(REQUEST), iterations
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the standard library and orjson JSON codecs."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    if json_codec.orjson is None:
+        raise SystemExit("orjson is not installed, run with `--extra orjson`.")
+    orjson = json_codec.orjson
+    setattr(json_codec, "orjson", None)
+    stdlib = run(args.iterations)
+    setattr(json_codec, "orjson", orjson)
+    fast = run(args.iterations)
+
+    print(f"{'':<34} {'json':>10} {'orjson':>10} {'speedup':>8}")
+    for name, stdlib_time in stdlib.items():
+        print(
+            f"{name:<34} {stdlib_time:>8.0f}us {fast[name]:>8.0f}us "
+            f"{stdlib_time / fast[name]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
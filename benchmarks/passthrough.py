@@ -0,0 +1,75 @@
+"""Measure how long tools take to turn a response page into their result.
+
+Takes full 100-edge `ListOrders` and `ListProducts` response pages through
+`page_result` and the conversion FastMCP makes of the returned value, first with
+the generated models and then with the data spliced in as it was returned.
+
+Usage:
+    PYTHONPATH=src python benchmarks/passthrough.py [--iterations 200]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Callable
+
+import httpx
+from payloads import orders_page, products_page
+
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+from saleor_mcp.main import mcp
+from saleor_mcp.saleor_client.list_orders import ListOrders
+from saleor_mcp.saleor_client.list_products import ListProducts
+from saleor_mcp.tools.results import page_result
+from saleor_mcp.trusted_data import TrustedData
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Return the median time of a call in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1_000_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare tool results built from models and passed through."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    client = SaleorClient(
+        url="https://example.saleor.cloud/graphql/",
+        headers={},
+        registry=ClientRegistry(),
+    )
+    print(f"{'':<26} {'models':>10} {'passthrough':>11} {'speedup':>8}")
+    for name, model, data, field in (
+        ("ListOrders", ListOrders, orders_page(), "orders"),
+        ("ListProducts", ListProducts, products_page(), "products"),
+    ):
+        body = json.dumps({"data": data}).encode()
+        tool = await mcp.get_tool(field)
+        assert tool is not None
+
+        def handle(build, body=body, field=field, tool=tool):
+            # A new response every time, so the parsed data isn't reused.
+            result = build(client.get_data(httpx.Response(200, content=body)))
+            tool.convert_result(page_result(result, field))
+
+        models = measure(lambda: handle(model.model_validate), args.iterations)
+        passthrough = measure(lambda: handle(TrustedData), args.iterations)
+        print(
+            f"{name + f' ({len(body) // 1024} KiB)':<26} {models:>8.0f}us "
+            f"{passthrough:>9.0f}us {models / passthrough:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""Realistic Saleor GraphQL response payloads for benchmarks.
+
+Pages have the shape of the `ListOrders` and `ListProducts` queries, with full
+100-edge pages and several lines per order.
+"""
+
+import base64
+from typing import Any
+
+
+def _id(type_name: str, pk: int) -> str:
+    return base64.b64encode(f"{type_name}:{pk}".encode()).decode()
+
+
+def _money(amount: float, currency: str = "USD") -> dict[str, Any]:
+    return {"gross": {"amount": round(amount, 2), "currency": currency}}
+
+
+def _page_info(has_next_page: bool = True) -> dict[str, Any]:
+    return {
+        "hasNextPage": has_next_page,
+        "hasPreviousPage": False,
+        "startCursor": "W251bGwsICIxMDAwIl0=",
+        "endCursor": "W251bGwsICI5MDEiXQ==",
+    }
+
+
+def order_node(pk: int, lines: int = 5) -> dict[str, Any]:
+    return {
+        "id": _id("Order", pk),
+        "number": str(pk),
+        "status": "UNFULFILLED",
+        "created": f"2024-05-{1 + pk % 28:02d}T10:12:41.112345+00:00",
+        "updatedAt": f"2024-05-{1 + pk % 28:02d}T11:02:13.512981+00:00",
+        "paymentStatus": "FULLY_CHARGED",
+        "channel": {"slug": "default-channel"},
+        "total": _money(19.99 * lines + pk % 7),
+        "lines": [
+            {
+                "quantity": 1 + line % 3,
+                "productSku": f"SKU-{pk}-{line}",
+                "variant": {
+                    "name": f"Size {['S', 'M', 'L', 'XL'][line % 4]}",
+                    "product": {
+                        "id": _id("Product", 100 + line),
+                        "name": f"Monospace Tee {line}",
+                    },
+                },
+                "unitPrice": _money(19.99 + line),
+            }
+            for line in range(lines)
+        ],
+        "shippingAddress": {"country": {"code": "US"}},
+        "billingAddress": {"country": {"code": "US"}},
+    }
+
+
+def orders_page(edges: int = 100, lines: int = 5) -> dict[str, Any]:
+    """Return the `data` of a `ListOrders` response."""
+    return {
+        "orders": {
+            "pageInfo": _page_info(),
+            "totalCount": 25_000,
+            "edges": [{"node": order_node(1000 - i, lines)} for i in range(edges)],
+        }
+    }
+
+
+def product_node(pk: int, variants: int = 4) -> dict[str, Any]:
+    return {
+        "id": _id("Product", pk),
+        "name": f"Monospace Tee {pk}",
+        "slug": f"monospace-tee-{pk}",
+        "externalReference": None,
+        "productType": {"id": _id("ProductType", 9), "name": "Top (clothing)"},
+        "category": {"id": _id("Category", 39), "name": "T-shirts"},
+        "defaultVariant": {"id": _id("ProductVariant", pk * 10)},
+        "productVariants": {
+            "edges": [
+                {
+                    "node": {
+                        "id": _id("ProductVariant", pk * 10 + i),
+                        "name": f"Size {['S', 'M', 'L', 'XL'][i % 4]}",
+                        "sku": f"SKU-{pk}-{i}",
+                    }
+                }
+                for i in range(variants)
+            ]
+        },
+        "created": "2021-06-22T09:22:43.112345+00:00",
+        "updatedAt": "2024-05-07T10:12:41.112345+00:00",
+        "thumbnail": {
+            "url": f"https://example.saleor.cloud/thumbnail/{pk}/256/",
+        },
+        "pricing": {
+            "priceRange": {"start": _money(19.99), "stop": _money(24.99)},
+        },
+    }
+
+
+def products_page(edges: int = 100) -> dict[str, Any]:
+    """Return the `data` of a `ListProducts` response."""
+    return {
+        "products": {
+            "pageInfo": _page_info(),
+            "totalCount": 1_200,
+            "edges": [{"node": product_node(i + 1)} for i in range(edges)],
+        }
+    }
@@ -0,0 +1,75 @@
+"""Local stand-in for the Saleor GraphQL endpoint used by benchmarks.
+
+The stand-in is a minimal ASGI app served by Hypercorn on a free local port. It
+answers every request after a fixed delay, with the data returned by `respond`.
+"""
+
+import asyncio
+import json
+import socket
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+
+class StandInServer:
+    """Minimal ASGI app answering GraphQL requests after a delay."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.connections: set[tuple[str, int]] = set()
+
+    async def respond(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Return the `data` of the response to a GraphQL request."""
+        raise NotImplementedError
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        self.connections.add(scope["client"])
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        await asyncio.sleep(self.latency)
+        data = await self.respond(json.loads(body))
+        response = json.dumps({"data": data}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(response)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def serving(app: StandInServer) -> AsyncIterator[str]:
+    """Serve the stand-in server on a free port and yield its GraphQL URL."""
+    port = free_port()
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "WARNING"
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(serve(app, config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+    try:
+        yield f"http://127.0.0.1:{port}/graphql/"
+    finally:
+        shutdown.set()
+        await server
@@ -0,0 +1,85 @@
+"""Measure the upstream latency of listing pages with and without `totalCount`.
+
+Starts a local Hypercorn server that stands in for the Saleor GraphQL endpoint.
+It answers `ListOrders` with a full page after a fixed delay, and takes longer
+when the query asks for `totalCount`, the way a `COUNT(*)` over a large orders
+table does. Pages are then fetched one after another with the client, first
+without the total and then with it.
+
+Usage:
+    uv run python benchmarks/total_count.py [--pages 20] [--latency 0.03]
+        [--count-latency 0.2]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from payloads import orders_page
+from servers import StandInServer, serving
+
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+
+
+class OrdersServer(StandInServer):
+    """Stand-in server answering `ListOrders`, slower when counting orders."""
+
+    def __init__(self, latency: float, count_latency: float) -> None:
+        super().__init__(latency)
+        self.count_latency = count_latency
+        self.counted = 0
+
+    async def respond(self, request):
+        data = orders_page()
+        if request["variables"].get("withTotal"):
+            self.counted += 1
+            await asyncio.sleep(self.count_latency)
+        else:
+            del data["orders"]["totalCount"]
+        return data
+
+
+async def fetch_pages(url: str, pages: int, with_total: bool) -> list[float]:
+    registry = ClientRegistry()
+    client = SaleorClient(url=url, headers={}, registry=registry)
+    timings = []
+    after = None
+    try:
+        for _ in range(pages):
+            started_at = time.perf_counter()
+            data = await client.list_orders(
+                first=100, after=after, withTotal=with_total
+            )
+            timings.append(time.perf_counter() - started_at)
+            assert (data.orders.totalCount is not None) == with_total
+            after = data.orders.pageInfo.endCursor
+    finally:
+        await registry.aclose()
+    return timings
+
+
+async def main(pages: int, latency: float, count_latency: float) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = OrdersServer(latency, count_latency)
+    async with serving(app) as url:
+        for label, with_total in (("without", False), ("with", True)):
+            timings = await fetch_pages(url, pages, with_total)
+            print(
+                f"{label:>7} totalCount: {pages} pages in {sum(timings):6.2f} s, "
+                f"median {statistics.median(timings) * 1000:6.1f} ms per page"
+            )
+    print(f"Counted orders for {app.counted} of {2 * pages} pages.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare listing pages with and without totalCount."
+    )
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--count-latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages, args.latency, args.count_latency))
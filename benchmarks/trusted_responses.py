@@ -0,0 +1,78 @@
+"""Measure the CPU time saved per page by skipping response validation.
+
+Takes full 100-edge `ListOrders` and `ListProducts` response pages through what
+a tool does with them: decoding, building the result and serializing it to JSON.
+Results are built once with the generated models, as with
+`UPSTREAM_VALIDATE_RESPONSES=true`, and once as `TrustedData`.
+
+Usage:
+    PYTHONPATH=src python benchmarks/trusted_responses.py [--iterations 200]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections.abc import Callable
+
+import httpx
+from payloads import orders_page, products_page
+from pydantic_core import to_jsonable_python
+
+from saleor_mcp import json_codec
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+from saleor_mcp.saleor_client.list_orders import ListOrders
+from saleor_mcp.saleor_client.list_products import ListProducts
+from saleor_mcp.trusted_data import TrustedData
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """Return the median time of a call in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare validated and trusted response handling."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    client = SaleorClient(
+        url="https://example.saleor.cloud/graphql/",
+        headers={},
+        registry=ClientRegistry(),
+    )
+    print(f"{'':<26} {'validated':>10} {'trusted':>10} {'speedup':>8}")
+    for name, model, data, field in (
+        ("ListOrders", ListOrders, orders_page(), "orders"),
+        ("ListProducts", ListProducts, products_page(), "products"),
+    ):
+        body = json.dumps({"data": data}).encode()
+
+        def handle(build, body=body, field=field):
+            # A new response every time, so the parsed data isn't reused.
+            result = build(client.get_data(httpx.Response(200, content=body)))
+            connection = getattr(result, field)
+            json_codec.dumps(
+                to_jsonable_python(
+                    {"data": {field: connection.edges, "pageInfo": connection.pageInfo}}
+                )
+            )
+
+        validated = measure(lambda: handle(model.model_validate), args.iterations)
+        trusted = measure(lambda: handle(TrustedData), args.iterations)
+        print(
+            f"{name + f' ({len(body) // 1024} KiB)':<26} {validated:>8.0f}us "
+            f"{trusted:>8.0f}us {validated / trusted:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Literal
+
+from fastmcp.exceptions import ToolError
+
+GroupBy = Literal["day", "month", "status", "channel", "country", "currency"]
+Bucket = Literal["day", "week", "month"]
+
+MAX_BUCKETS = 1000
+
+# Fields of orders needed to group them by each of the keys.
+GROUP_FIELDS: dict[GroupBy, list[str]] = {
+    "day": ["created"],
+    "month": ["created"],
+    "status": ["status"],
+    "channel": ["channel.slug"],
+    "country": ["shippingAddress.country.code", "billingAddress.country.code"],
+    "currency": [],
+}
+
+DEFAULT_GROUP_BY: list[GroupBy] = ["day"]
+
+
+class OrderAggregator:
+    """Count orders and sum their totals in groups, one order at a time.
+
+    Only the counters of the groups are kept, so memory doesn't grow with the
+    number of orders. Totals in different currencies are never added up, so
+    orders are always grouped by currency too.
+    """
+
+    def __init__(self, group_by: list[GroupBy]) -> None:
+        self.group_by: list[GroupBy] = list(dict.fromkeys([*group_by, "currency"]))
+        self.orders = 0
+        self._groups: dict[tuple[Any, ...], list[Any]] = {}
+
+    @property
+    def fields(self) -> list[str]:
+        """Return fields of orders to fetch for the aggregation."""
+        fields = ["total.gross.amount", "total.gross.currency"]
+        for key in self.group_by:
+            fields.extend(GROUP_FIELDS[key])
+        return fields
+
+    def add(self, order: dict[str, Any]) -> None:
+        """Add an order, as returned by Saleor, to its group."""
+        gross = (order.get("total") or {}).get("gross") or {}
+        key = tuple(self._group_value(order, gross, name) for name in self.group_by)
+        counters = self._groups.get(key)
+        if counters is None:
+            counters = self._groups[key] = [0, Decimal(0)]
+        counters[0] += 1
+        counters[1] += Decimal(str(gross.get("amount") or 0))
+        self.orders += 1
+
+    def groups(self) -> list[dict[str, Any]]:
+        """Return the groups sorted by their keys, with their counts and totals."""
+        return [
+            {
+                **dict(zip(self.group_by, key, strict=True)),
+                "count": count,
+                "total": float(total),
+            }
+            for key, (count, total) in sorted(
+                self._groups.items(), key=lambda item: _sort_key(item[0])
+            )
+        ]
+
+    @staticmethod
+    def _group_value(order: dict[str, Any], gross: dict[str, Any], name: str) -> Any:
+        if name == "day":
+            return (order.get("created") or "")[:10] or None
+        if name == "month":
+            return (order.get("created") or "")[:7] or None
+        if name == "status":
+            return order.get("status")
+        if name == "channel":
+            return (order.get("channel") or {}).get("slug")
+        if name == "country":
+            address = order.get("shippingAddress") or order.get("billingAddress")
+            return ((address or {}).get("country") or {}).get("code")
+        return gross.get("currency")
+
+
+def _sort_key(key: tuple[Any, ...]) -> tuple[tuple[bool, str], ...]:
+    # Groups without a value, like orders without an address, go last.
+    return tuple((value is None, str(value or "")) for value in key)
+
+
+def date_buckets(gte: date, lte: date, bucket: Bucket) -> list[tuple[date, date]]:
+    """Split a range of days into consecutive days, weeks or months.
+
+    Weeks start on Mondays and months on their first days, so the first and the
+    last bucket can be shorter than the others.
+    """
+    buckets = []
+    start = gte
+    while start <= lte:
+        if bucket == "day":
+            end = start
+        elif bucket == "week":
+            end = start + timedelta(days=6 - start.weekday())
+        else:
+            end = (start.replace(day=1) + timedelta(days=32)).replace(
+                day=1
+            ) - timedelta(days=1)
+        buckets.append((start, min(end, lte)))
+        start = end + timedelta(days=1)
+        if len(buckets) > MAX_BUCKETS:
+            raise ToolError(f"Up to {MAX_BUCKETS} buckets can be counted at once.")
+    return buckets
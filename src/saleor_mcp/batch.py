@@ -0,0 +1,92 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any
+
+from fastmcp.exceptions import ToolError
+
+from .config import get_env_int
+
+# Maximum number of objects Saleor returns in a single page.
+MAX_PAGE_SIZE = 100
+
+
+def chunked(items: Sequence[Any], size: int) -> list[Sequence[Any]]:
+    """Split items into consecutive chunks of at most `size` items."""
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+async def gather_bounded(
+    calls: Iterable[Callable[[], Awaitable[Any]]], limit: int
+) -> list[Any]:
+    """Run calls concurrently, at most `limit` at a time, and return their results.
+
+    Results are in the order of the calls. When a call fails, the others are
+    cancelled and its exception is raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await call()
+
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class BatchFetcher:
+    """Fetch objects by their IDs in as few concurrent page requests as possible."""
+
+    def __init__(
+        self,
+        max_ids: int = 500,
+        chunk_size: int = MAX_PAGE_SIZE,
+        max_concurrency: int = 4,
+    ) -> None:
+        self.max_ids = max_ids
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+
+    def unique_ids(self, ids: list[str]) -> list[str]:
+        """Return IDs without duplicates, raising if there are too many of them."""
+        unique_ids = list(dict.fromkeys(ids))
+        if len(unique_ids) > self.max_ids:
+            raise ToolError(f"Up to {self.max_ids} IDs can be fetched at once.")
+        return unique_ids
+
+    async def fetch(
+        self,
+        ids: list[str],
+        fetch_page: Callable[[list[str]], Awaitable[list[Any]]],
+    ) -> dict[str, Any]:
+        """Return edges of the objects with the given IDs, mapped by ID.
+
+        `fetch_page` gets a chunk of IDs and returns the edges of their objects.
+        IDs of objects which weren't found are missing from the result.
+        """
+        unique_ids = self.unique_ids(ids)
+        pages = await gather_bounded(
+            (
+                lambda chunk=chunk: fetch_page(list(chunk))
+                for chunk in chunked(unique_ids, self.chunk_size)
+            ),
+            self.max_concurrency,
+        )
+        return {_node_id(edge): edge for edges in pages for edge in edges}
+
+
+def _node_id(edge: Any) -> str:
+    if isinstance(edge, dict):
+        return edge["node"]["id"]
+    return edge.node.id
+
+
+batch_fetcher = BatchFetcher(
+    max_ids=get_env_int("BATCH_MAX_IDS", 500),
+    max_concurrency=get_env_int("BATCH_MAX_CONCURRENCY", 4),
+)
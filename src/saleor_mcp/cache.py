@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+from fastmcp import FastMCP
+from fastmcp.server.lifespan import lifespan
+
+from .cache_backends import (
+    KEY_PREFIX,
+    CacheBackend,
+    CacheEntry,
+    MemoryCacheBackend,
+    create_cache_backend,
+)
+from .config import get_env_float, get_env_int
+from .deadline import without_deadline
+
+logger = logging.getLogger(__name__)
+
+# Cacheable operations, with the env variable setting their TTL and the default
+# TTL in seconds. A TTL of 0 disables caching of the operation. Lists of products,
+# orders, stocks and customers change often, so caching them is only worth enabling
+# together with webhook-driven invalidation. Reports are computed by Saleor from all
+# orders of a period, so they're worth caching for a short time.
+CACHE_TTL_SETTINGS: dict[str, tuple[str, float]] = {
+    "ListChannels": ("CACHE_TTL_CHANNELS", 300.0),
+    "WarehouseDetails": ("CACHE_TTL_WAREHOUSES", 300.0),
+    "ListProducts": ("CACHE_TTL_PRODUCTS", 0),
+    "ListStocks": ("CACHE_TTL_STOCKS", 0),
+    "ListOrders": ("CACHE_TTL_ORDERS", 0),
+    "CountOrders": ("CACHE_TTL_ORDERS", 0),
+    "ListCustomers": ("CACHE_TTL_CUSTOMERS", 0),
+    "OrdersTotal": ("CACHE_TTL_REPORTS", 60.0),
+    "ReportProductSales": ("CACHE_TTL_REPORTS", 60.0),
+}
+
+
+def cache_key_prefix(api_url: str, operation_name: str) -> str:
+    """Return the prefix of the keys of an operation cached for an API URL."""
+    url_hash = hashlib.sha256(api_url.rstrip("/").encode()).hexdigest()[:16]
+    return f"{KEY_PREFIX}{url_hash}:{operation_name}:"
+
+
+def cache_key(api_url: str, operation_name: str, request_hash: str) -> str:
+    """Return the key of a cached response.
+
+    The key starts with the API URL and the operation, so entries can be evicted
+    per operation regardless of the token and variables hashed into `request_hash`.
+    """
+    return f"{cache_key_prefix(api_url, operation_name)}{request_hash}"
+
+
+class ResponseCache:
+    """Cache of upstream GraphQL responses.
+
+    Entries are response bodies stored under a key that includes the API URL and a
+    hash of the auth token and variables, so cached data is never shared between
+    tenants or tokens. An entry is fresh for the TTL of its operation and then
+    served stale for up to `stale_ttl` seconds while it is refreshed in the
+    background.
+
+    Entries are kept in `backend`, which defaults to an LRU cache in the memory of
+    the current process. Expiry times are wall-clock timestamps, so entries stored
+    in a backend shared with other processes have the same TTLs in all of them.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float],
+        stale_ttl: float = 60.0,
+        backend: CacheBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttls = {name: ttl for name, ttl in ttls.items() if ttl > 0}
+        self.stale_ttl = stale_ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self._clock = clock
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    def ttl_for(self, operation_name: str | None) -> float:
+        """Return the TTL of the given operation, or 0 if it isn't cached."""
+        return self.ttls.get(operation_name or "", 0)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for the key, unless it is missing or past its stale TTL.
+
+        Backend errors are logged and treated as misses, so an unavailable shared
+        cache doesn't fail requests.
+        """
+        try:
+            entry = await self.backend.get(key)
+            now = self._clock()
+            if entry is not None and now >= entry.stale_until:
+                await self.backend.delete(key)
+                entry = None
+        except Exception:
+            self._counters["errors"] += 1
+            logger.warning("Failed to read cached response", exc_info=True)
+            entry = None
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        self._counters["hits" if entry.is_fresh(now) else "stale_hits"] += 1
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.is_fresh(self._clock())
+
+    async def set(
+        self, key: str, value: bytes, operation_name: str, data: Any = None
+    ) -> None:
+        """Store a response body using the TTL of its operation."""
+        ttl = self.ttl_for(operation_name)
+        if not ttl:
+            return
+        now = self._clock()
+        entry = CacheEntry(
+            value=value,
+            fresh_until=now + ttl,
+            stale_until=now + ttl + self.stale_ttl,
+            data=data,
+        )
+        try:
+            await self.backend.set(key, entry)
+        except Exception:
+            self._counters["errors"] += 1
+            logger.warning("Failed to store cached response", exc_info=True)
+
+    def refresh(self, key: str, fn: Callable[[], Awaitable[Any]]) -> None:
+        """Run `fn` in the background to refresh a stale entry, once per key."""
+        if key in self._refreshing:
+            return
+        self._counters["refreshes"] += 1
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(fn), context=without_deadline()
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, fn: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await fn()
+        except Exception:
+            logger.warning("Failed to refresh cached response", exc_info=True)
+
+    async def invalidate(self, api_url: str, operation_names: Iterable[str]) -> int:
+        """Evict entries of the given operations cached for the API URL.
+
+        Entries fetched with any auth token are evicted. Returns the number of
+        evicted entries.
+        """
+        invalidated = 0
+        for operation_name in set(operation_names):
+            prefix = cache_key_prefix(api_url, operation_name)
+            invalidated += await self.backend.invalidate(prefix)
+        self._counters["invalidations"] += invalidated
+        return invalidated
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters describing the cache usage."""
+        return {
+            **self._counters,
+            "backend": type(self.backend).__name__,
+            **self.backend.stats(),
+        }
+
+
+response_cache = ResponseCache(
+    ttls={
+        operation_name: get_env_float(env_name, default)
+        for operation_name, (env_name, default) in CACHE_TTL_SETTINGS.items()
+    },
+    stale_ttl=get_env_float("CACHE_STALE_TTL", 60.0),
+    backend=create_cache_backend(
+        os.getenv("CACHE_URL", "memory://"),
+        max_bytes=get_env_int("CACHE_MAX_BYTES", 16 * 1024 * 1024),
+    ),
+)
+
+
+@lifespan
+async def response_cache_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Close the connection to the cache backend when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        await response_cache.aclose()
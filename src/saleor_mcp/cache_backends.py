@@ -0,0 +1,355 @@
+import asyncio
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    from redis import asyncio as redis_asyncio  # ty: ignore[unresolved-import]
+except ImportError:
+    redis_asyncio = None
+
+# Prefix of the keys of all cached responses, see `saleor_mcp.cache.cache_key`.
+KEY_PREFIX = "saleor-mcp:v1:"
+
+# Parsed response data takes about six times the size of the JSON body in memory.
+PARSED_DATA_FACTOR = 6
+
+
+@dataclass
+class CacheEntry:
+    value: bytes
+    fresh_until: float
+    stale_until: float
+    data: Any = field(default=None, compare=False)
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+
+# Entries shared between processes are stored as their expiry timestamps followed
+# by the response body.
+_HEADER = struct.Struct("!dd")
+
+
+def encode_entry(entry: CacheEntry) -> bytes:
+    return _HEADER.pack(entry.fresh_until, entry.stale_until) + entry.value
+
+
+def decode_entry(raw: bytes) -> CacheEntry:
+    fresh_until, stale_until = _HEADER.unpack_from(raw)
+    return CacheEntry(
+        value=raw[_HEADER.size :], fresh_until=fresh_until, stale_until=stale_until
+    )
+
+
+class CacheBackend(ABC):
+    """Storage of cached responses.
+
+    Keys are strings built by `cache_key`, so every backend can evict all entries
+    of an operation for an API URL by key prefix. Expiry timestamps are wall-clock
+    seconds, comparable between processes and hosts. Backends may drop entries
+    past their `stale_until` on their own, but don't have to.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> CacheEntry | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def invalidate(self, prefix: str) -> int:
+        """Delete all entries with keys starting with the prefix."""
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, int]:
+        return {}
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release connections held by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU cache in the memory of the current process.
+
+    Parsed response data is kept with the entries, so hits don't decode JSON
+    again. The total size of entries, counting their bodies and an estimate of
+    the size of their parsed data, is kept under `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._evictions = 0
+
+    async def get(self, key: str) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if _memory_size(entry) > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._size += _memory_size(entry)
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def invalidate(self, prefix: str) -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= _memory_size(entry)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _memory_size(entry: CacheEntry) -> int:
+    size = len(entry.value)
+    if entry.data is not None:
+        size += len(entry.value) * PARSED_DATA_FACTOR
+    return size
+
+
+SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+    "fresh_until REAL NOT NULL, stale_until REAL NOT NULL, "
+    "accessed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)",
+    "CREATE INDEX IF NOT EXISTS cache_stale_until ON cache (stale_until)",
+    "CREATE TABLE IF NOT EXISTS cache_size ("
+    "id INTEGER PRIMARY KEY CHECK (id = 0), "
+    "entries INTEGER NOT NULL, bytes INTEGER NOT NULL)",
+    # Databases created before the table was added are sized once.
+    "INSERT OR IGNORE INTO cache_size "
+    "SELECT 0, COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache",
+    "CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN "
+    "UPDATE cache_size SET entries = entries + 1, "
+    "bytes = bytes + LENGTH(new.value); END",
+    "CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF value ON cache BEGIN "
+    "UPDATE cache_size SET bytes = bytes - LENGTH(old.value) + LENGTH(new.value); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN "
+    "UPDATE cache_size SET entries = entries - 1, "
+    "bytes = bytes - LENGTH(old.value); END",
+)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in an SQLite database shared by all worker processes on a host.
+
+    Placing the database on a memory-backed filesystem, such as `/dev/shm`, keeps
+    it in shared memory. The total size of cached response bodies is kept under
+    `max_bytes` by evicting the least recently used entries.
+
+    Hits are plain reads. The time an entry was last used is only updated when
+    it's older than `touch_interval` seconds, so reads rarely take the write lock
+    shared by all workers, and eviction is least recently used to that precision.
+
+    The number and total size of entries are kept in the `cache_size` table,
+    updated by triggers in the same transaction as the entries, so writes don't
+    have to sum up the whole cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 16 * 1024 * 1024,
+        touch_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        with self._lock:
+            connection = self._connection
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Commits don't wait for the disk, at the risk of losing the latest
+            # entries of the cache, but not corrupting it, if the host crashes.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in SQLITE_SCHEMA:
+                    connection.execute(statement)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    async def get(self, key: str) -> CacheEntry | None:
+        return await asyncio.to_thread(self._get, key)
+
+    def _get(self, key: str) -> CacheEntry | None:
+        rows = self._execute(
+            "SELECT value, fresh_until, stale_until, accessed_at FROM cache "
+            "WHERE key = ?",
+            (key,),
+        )
+        if not rows:
+            return None
+        value, fresh_until, stale_until, accessed_at = rows[0]
+        now = self._clock()
+        if now - accessed_at >= self.touch_interval:
+            self._execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return CacheEntry(value=value, fresh_until=fresh_until, stale_until=stale_until)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if len(entry.value) > self.max_bytes:
+            return
+        await asyncio.to_thread(self._set, key, entry)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        now = self._clock()
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Unlike `INSERT OR REPLACE`, an upsert fires the update trigger.
+                connection.execute(
+                    "INSERT INTO cache VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+                    "fresh_until = excluded.fresh_until, "
+                    "stale_until = excluded.stale_until, "
+                    "accessed_at = excluded.accessed_at",
+                    (key, entry.value, entry.fresh_until, entry.stale_until, now),
+                )
+                connection.execute("DELETE FROM cache WHERE stale_until <= ?", (now,))
+                (size,) = connection.execute("SELECT bytes FROM cache_size").fetchone()
+                while size > self.max_bytes:
+                    row = connection.execute(
+                        "DELETE FROM cache WHERE key = "
+                        "(SELECT key FROM cache ORDER BY accessed_at LIMIT 1) "
+                        "RETURNING LENGTH(value)"
+                    ).fetchone()
+                    if row is None:
+                        break
+                    size -= row[0]
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM cache WHERE key = ?", (key,)
+        )
+
+    async def invalidate(self, prefix: str) -> int:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM cache WHERE substr(key, 1, ?) = ? RETURNING key",
+            (len(prefix), prefix),
+        )
+        return len(rows)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM cache")
+
+    def stats(self) -> dict[str, int]:
+        ((entries, size),) = self._execute("SELECT entries, bytes FROM cache_size")
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache in Redis, or any server speaking the Redis protocol.
+
+    Entries expire in Redis once they are past their stale TTL. The memory limit
+    and eviction policy are configured on the server, e.g. with
+    `maxmemory-policy allkeys-lru`.
+    """
+
+    def __init__(self, client: Any, clock: Callable[[], float] = time.time) -> None:
+        self.client = client
+        self._clock = clock
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        if redis_asyncio is None:
+            raise RuntimeError("Redis cache backend requires the 'redis' package.")
+        return cls(redis_asyncio.from_url(url))
+
+    async def get(self, key: str) -> CacheEntry | None:
+        raw = await self.client.get(key)
+        return decode_entry(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ttl_ms = int((entry.stale_until - self._clock()) * 1000)
+        if ttl_ms > 0:
+            await self.client.set(key, encode_entry(entry), px=ttl_ms)
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def invalidate(self, prefix: str) -> int:
+        keys = [key async for key in self.client.scan_iter(match=f"{prefix}*")]
+        if not keys:
+            return 0
+        return await self.client.unlink(*keys)
+
+    async def clear(self) -> None:
+        await self.invalidate(KEY_PREFIX)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def create_cache_backend(url: str, max_bytes: int) -> CacheBackend:
+    """Create a cache backend from a `memory://`, `sqlite://` or `redis://` URL."""
+    scheme, _, rest = url.partition("://")
+    if scheme == "memory":
+        return MemoryCacheBackend(max_bytes=max_bytes)
+    if scheme == "sqlite":
+        return SQLiteCacheBackend(rest.removeprefix("/"), max_bytes=max_bytes)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisCacheBackend.from_url(url)
+    raise ValueError(f"Unsupported cache backend URL: {url}")
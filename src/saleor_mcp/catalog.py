@@ -0,0 +1,614 @@
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastmcp import FastMCP
+from fastmcp.server.lifespan import lifespan
+
+from . import json_codec
+from .client import SaleorClient, hash_token
+from .config import get_env_float, get_env_int
+from .deadline import without_deadline
+from .saleor_client.exceptions import GraphQLClientGraphQLMultiError
+from .sorting import LAST_MODIFIED_ASC
+
+logger = logging.getLogger(__name__)
+
+CURSOR_PREFIX = "catalog:"
+# Number of tokens whose mirror keys are remembered.
+MAX_TOKEN_KEYS = 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    updated_at TEXT,
+    sync_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variants (
+    id TEXT PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    name TEXT,
+    sku TEXT
+);
+CREATE INDEX IF NOT EXISTS variants_product_id ON variants (product_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS products_search USING fts5(
+    name,
+    slug,
+    variants,
+    category,
+    product_type,
+    external_reference,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CatalogMirror:
+    """Local SQLite copy of the products of a Saleor instance.
+
+    Products are stored as returned by `ListProducts` without a channel, with
+    their names, slugs, variant names and SKUs, category and product type indexed
+    for full-text search with FTS5. Methods are blocking and meant to be run in a
+    thread; a lock serializes access to the connection.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+    def upsert(self, products: list[dict[str, Any]], sync_id: int) -> None:
+        """Insert or replace products, marking them as seen by the sync."""
+        with self._lock, self._connection as connection:
+            for product in products:
+                id = product["id"]
+                self._delete(connection, [id])
+                pk = connection.execute(
+                    "INSERT INTO products (id, updated_at, sync_id, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        id,
+                        product.get("updatedAt"),
+                        sync_id,
+                        json_codec.dumps(product).decode(),
+                    ),
+                ).lastrowid
+                variants = [
+                    edge["node"]
+                    for edge in (product.get("productVariants") or {}).get("edges")
+                    or []
+                ]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO variants (id, product_id, name, sku) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (variant["id"], id, variant.get("name"), variant.get("sku"))
+                        for variant in variants
+                    ],
+                )
+                connection.execute(
+                    "INSERT INTO products_search (rowid, name, slug, variants, "
+                    "category, product_type, external_reference) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        pk,
+                        product.get("name"),
+                        product.get("slug"),
+                        " ".join(
+                            value
+                            for variant in variants
+                            for value in (variant.get("name"), variant.get("sku"))
+                            if value
+                        ),
+                        (product.get("category") or {}).get("name"),
+                        (product.get("productType") or {}).get("name"),
+                        product.get("externalReference"),
+                    ),
+                )
+
+    def remove_unsynced(self, sync_id: int) -> int:
+        """Remove products not seen by the sync, returning their number."""
+        with self._lock, self._connection as connection:
+            ids = [
+                row[0]
+                for row in connection.execute(
+                    "SELECT id FROM products WHERE sync_id != ?", (sync_id,)
+                )
+            ]
+            self._delete(connection, ids)
+        return len(ids)
+
+    def search(
+        self, query: str, first: int, offset: int = 0
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Return a page of products matching the query, best matches first.
+
+        Every word of the query has to match the beginning of a word of the
+        product, in order for words of a term like `HOODIE-BLUE`. The total number
+        of matching products is returned too.
+        """
+        match = _match_expression(query)
+        if match is None:
+            return [], 0
+        with self._lock:
+            total = self._connection.execute(
+                "SELECT count(*) FROM products_search WHERE products_search MATCH ?",
+                (match,),
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                "SELECT products.data FROM products_search "
+                "JOIN products ON products.pk = products_search.rowid "
+                "WHERE products_search MATCH ? "
+                "ORDER BY bm25(products_search), products.id LIMIT ? OFFSET ?",
+                (match, first, offset),
+            ).fetchall()
+        return [json_codec.loads(row[0]) for row in rows], total
+
+    def get(self, ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Return products with the given IDs, mapped by ID."""
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, data FROM products WHERE id IN "
+                f"({', '.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        return {id: json_codec.loads(data) for id, data in rows}
+
+    def state(self) -> dict[str, Any]:
+        """Return the state of the last syncs, with numbers of stored objects."""
+        with self._lock:
+            state = dict(self._connection.execute("SELECT key, value FROM sync_state"))
+            state["products"] = self._connection.execute(
+                "SELECT count(*) FROM products"
+            ).fetchone()[0]
+            state["variants"] = self._connection.execute(
+                "SELECT count(*) FROM variants"
+            ).fetchone()[0]
+        return state
+
+    def set_state(self, **values: Any) -> None:
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                list(values.items()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, ids: list[str]) -> None:
+        for id in ids:
+            row = connection.execute(
+                "SELECT pk FROM products WHERE id = ?", (id,)
+            ).fetchone()
+            if row is None:
+                continue
+            # Rows of the search index share primary keys with products.
+            connection.execute("DELETE FROM products_search WHERE rowid = ?", row)
+            connection.execute("DELETE FROM products WHERE pk = ?", row)
+            connection.execute("DELETE FROM variants WHERE product_id = ?", (id,))
+
+
+@dataclass
+class _OpenMirror:
+    mirror: CatalogMirror
+    last_used: float
+
+
+class CatalogMirrors:
+    """Mirrors of catalogs of Saleor instances, kept fresh in the background.
+
+    Mirrors are kept per API URL and permissions of the token, since tokens with
+    other permissions can see different products, while rotated tokens of the same
+    app or user keep using the same mirror. The first full sync has to be started
+    with `start_sync`, and the mirror serves products once it completes. Since
+    then, products updated upstream are synced incrementally, from the
+    `updatedAt` watermark, when the last sync is older than `sync_interval`
+    seconds, and a full sync removing deleted products runs every
+    `full_sync_interval` seconds.
+
+    At most `max_mirrors` mirrors are open at once. When full, the least recently
+    used mirror is evicted, and its database stays on disk, so it's synced
+    incrementally when it's used again. Mirrors unused for `idle_timeout` seconds
+    are evicted and their databases are deleted. The sync of an evicted mirror is
+    cancelled, and its database is closed after `close_grace_period` seconds,
+    giving searches that still hold it time to finish. At most `max_files`
+    databases are kept on disk, deleting the least recently modified ones of
+    closed mirrors.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        sync_interval: float = 300.0,
+        full_sync_interval: float = 86400.0,
+        max_mirrors: int = 20,
+        max_files: int = 100,
+        idle_timeout: float = 3600.0,
+        close_grace_period: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.max_mirrors = max(1, max_mirrors)
+        self.max_files = max(self.max_mirrors, max_files)
+        self.idle_timeout = idle_timeout
+        self.close_grace_period = close_grace_period
+        self._clock = clock
+        self._mirrors: OrderedDict[str, _OpenMirror] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        # Keys of mirrors being closed, by their closing tasks.
+        self._closing: dict[asyncio.Task[None], str] = {}
+        self._opening: set[str] = set()
+        # Mirror keys by API URL and token hash.
+        self._keys: OrderedDict[str, str] = OrderedDict()
+
+    async def ready_mirror(self, client: SaleorClient) -> CatalogMirror | None:
+        """Return the mirror of the client's catalog if it can serve products.
+
+        Syncs due are started in the background, so products are served from the
+        mirror right away, even while it's being updated. Mirrors that haven't
+        completed a full sync yet aren't synced, nor created.
+        """
+        key = await self._key(client)
+        mirror = await self._existing_mirror(key)
+        if mirror is None:
+            return None
+        state = await asyncio.to_thread(mirror.state)
+        full_synced_at = float(state.get("full_synced_at") or 0)
+        if not full_synced_at:
+            return None
+        now = time.time()
+        synced_at = float(state.get("synced_at") or 0)
+        if now - full_synced_at > self.full_sync_interval:
+            self._start_sync(key, client, full=True)
+        elif now - synced_at > self.sync_interval:
+            self._start_sync(key, client)
+        return mirror
+
+    async def start_sync(self, client: SaleorClient, full: bool = False) -> bool:
+        """Start syncing the client's catalog in the background.
+
+        Returns `False` if a sync of the catalog is already running.
+        """
+        return self._start_sync(await self._key(client), client, full)
+
+    async def sync(self, client: SaleorClient, full: bool = False) -> None:
+        """Sync the client's catalog, fully if it has never been synced."""
+        await self._sync(await self._key(client), client, full)
+
+    def _start_sync(self, key: str, client: SaleorClient, full: bool = False) -> bool:
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            return False
+        task = asyncio.create_task(
+            self._sync_in_background(key, client, full), context=without_deadline()
+        )
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._forget_task(key, task))
+        return True
+
+    async def _sync(self, key: str, client: SaleorClient, full: bool) -> None:
+        mirror = await self._mirror(key)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            state = await asyncio.to_thread(mirror.state)
+            watermark = state.get("watermark")
+            full = full or not state.get("full_synced_at")
+            sync_id = int(state.get("sync_id") or 0) + 1
+            started_at = time.time()
+            where = None
+            if not full and watermark:
+                where = {"updatedAt": {"range": {"gte": watermark}}}
+            try:
+                async for connection in client.iter_pages(
+                    "ListProducts", where=where, sortBy=LAST_MODIFIED_ASC
+                ):
+                    products = [edge["node"] for edge in connection.get("edges") or []]
+                    await asyncio.to_thread(mirror.upsert, products, sync_id)
+                    watermark = max(
+                        [watermark or "", *(p.get("updatedAt") or "" for p in products)]
+                    )
+                if full:
+                    await asyncio.to_thread(mirror.remove_unsynced, sync_id)
+            except Exception as e:
+                await asyncio.to_thread(mirror.set_state, error=str(e), sync_id=sync_id)
+                raise
+            state = {"synced_at": started_at, "watermark": watermark or None}
+            if full:
+                state["full_synced_at"] = started_at
+            await asyncio.to_thread(
+                mirror.set_state, error=None, sync_id=sync_id, **state
+            )
+
+    async def search_page(
+        self, client: SaleorClient, search: str, first: int, after: str | None
+    ) -> dict[str, Any] | None:
+        """Return data of a page of products matching the search, like `ListProducts`.
+
+        Returns `None` if the mirror isn't ready, or the cursor comes from Saleor,
+        so the page has to be fetched from Saleor.
+        """
+        offset = decode_cursor(after)
+        if offset is None:
+            return None
+        mirror = await self.ready_mirror(client)
+        if mirror is None:
+            return None
+        products, total = await asyncio.to_thread(mirror.search, search, first, offset)
+        end = offset + len(products)
+        return {
+            "products": {
+                "edges": [{"node": product} for product in products],
+                "pageInfo": {
+                    "hasNextPage": end < total,
+                    "hasPreviousPage": offset > 0,
+                    "startCursor": encode_cursor(offset) if products else None,
+                    "endCursor": encode_cursor(end) if products else None,
+                },
+                "totalCount": total,
+            }
+        }
+
+    async def lookup(self, client: SaleorClient, ids: list[str]) -> dict[str, Any]:
+        """Return edges of products with the given IDs found in the mirror, by ID."""
+        mirror = await self.ready_mirror(client)
+        if mirror is None:
+            return {}
+        products = await asyncio.to_thread(mirror.get, ids)
+        return {id: {"node": product} for id, product in products.items()}
+
+    async def status(self, client: SaleorClient) -> dict[str, Any]:
+        """Return the sync status of the client's catalog."""
+        key = await self._key(client)
+        mirror = await self._existing_mirror(key)
+        state: dict[str, Any] = {"products": 0, "variants": 0}
+        if mirror is not None:
+            state = await asyncio.to_thread(mirror.state)
+        lock = self._locks.get(key)
+        return {
+            "ready": bool(state.get("full_synced_at")),
+            "syncing": lock is not None and lock.locked(),
+            "products": state["products"],
+            "variants": state["variants"],
+            "lastSync": _timestamp(state.get("synced_at")),
+            "lastFullSync": _timestamp(state.get("full_synced_at")),
+            "watermark": state.get("watermark"),
+            "error": state.get("error"),
+        }
+
+    async def aclose(self) -> None:
+        """Cancel syncs running in the background and close the mirrors."""
+        tasks = [*self._tasks.values(), *self._closing]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for entry in self._mirrors.values():
+            entry.mirror.close()
+        self._mirrors.clear()
+
+    def __len__(self) -> int:
+        return len(self._mirrors)
+
+    async def _sync_in_background(
+        self, key: str, client: SaleorClient, full: bool
+    ) -> None:
+        try:
+            await self._sync(key, client, full)
+        except Exception:
+            logger.exception("Syncing catalog of %s failed", client.url)
+
+    async def _existing_mirror(self, key: str) -> CatalogMirror | None:
+        if key not in self._mirrors and not await asyncio.to_thread(
+            self._path(key).exists
+        ):
+            return None
+        return await self._mirror(key)
+
+    async def _mirror(self, key: str) -> CatalogMirror:
+        now = self._clock()
+        self._evict_idle(now)
+        entry = self._mirrors.get(key)
+        if entry is None:
+            path = self._path(key)
+            self._opening.add(key)
+            try:
+                mirror = await asyncio.to_thread(CatalogMirror, path)
+            finally:
+                self._opening.discard(key)
+            # The mirror may have been opened by another call in the meantime.
+            entry = self._mirrors.get(key)
+            if entry is not None:
+                mirror.close()
+            else:
+                while len(self._mirrors) >= self.max_mirrors:
+                    self._evict(next(iter(self._mirrors)))
+                entry = self._mirrors[key] = _OpenMirror(mirror, now)
+                await asyncio.to_thread(self._remove_old_files, self._used_keys())
+        entry.last_used = now
+        self._mirrors.move_to_end(key)
+        return entry.mirror
+
+    def _evict_idle(self, now: float) -> None:
+        while self._mirrors:
+            key, entry = next(iter(self._mirrors.items()))
+            if now - entry.last_used < self.idle_timeout:
+                break
+            self._evict(key, delete=True)
+
+    def _evict(self, key: str, delete: bool = False) -> None:
+        entry = self._mirrors.pop(key)
+        self._locks.pop(key, None)
+        sync = self._tasks.pop(key, None)
+        if sync is not None:
+            sync.cancel()
+        task = asyncio.get_running_loop().create_task(
+            self._close(key, entry.mirror, sync, delete)
+        )
+        self._closing[task] = key
+        task.add_done_callback(lambda _: self._closing.pop(task, None))
+
+    async def _close(
+        self,
+        key: str,
+        mirror: CatalogMirror,
+        sync: asyncio.Task[None] | None,
+        delete: bool,
+    ) -> None:
+        try:
+            if sync is not None:
+                await asyncio.gather(sync, return_exceptions=True)
+            if self.close_grace_period:
+                await asyncio.sleep(self.close_grace_period)
+        finally:
+            mirror.close()
+            # The mirror may have been opened again in the meantime.
+            if delete and key not in self._mirrors and key not in self._opening:
+                _remove_database(mirror.path)
+
+    def _used_keys(self) -> set[str]:
+        return {*self._mirrors, *self._opening, *self._closing.values()}
+
+    def _remove_old_files(self, used_keys: set[str]) -> None:
+        paths = list(self.directory.glob("*.sqlite3"))
+        unused = sorted(
+            (path for path in paths if path.stem not in used_keys),
+            key=lambda path: path.stat().st_mtime,
+        )
+        for path in unused[: len(paths) - self.max_files]:
+            _remove_database(path)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.sqlite3"
+
+    def _forget_task(self, key: str, task: asyncio.Task[None]) -> None:
+        # A sync of an evicted mirror may finish after a new one was started.
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def _key(self, client: SaleorClient) -> str:
+        url = client.url.rstrip("/")
+        token_hash = hash_token((client.headers or {}).get("Authorization", ""))
+        token_key = "\0".join((url, token_hash))
+        key = self._keys.get(token_key)
+        if key is None:
+            permissions = await _permissions(client)
+            key = hashlib.sha256("\0".join((url, *permissions)).encode()).hexdigest()
+            key = self._keys[token_key] = key[:32]
+            while len(self._keys) > MAX_TOKEN_KEYS:
+                self._keys.popitem(last=False)
+        self._keys.move_to_end(token_key)
+        return key
+
+
+async def _permissions(client: SaleorClient) -> list[str]:
+    """Return sorted codes of permissions of the client's staff user or app."""
+    data = await client.query("UserPermissions")
+    if data.get("me") is not None:
+        permissions = data["me"].get("userPermissions") or []
+    else:
+        try:
+            data = await client.query("AppPermissions")
+        except GraphQLClientGraphQLMultiError:
+            # Tokens of neither staff users nor apps have no permissions.
+            return []
+        permissions = (data.get("app") or {}).get("permissions") or []
+    return sorted(permission["code"] for permission in permissions)
+
+
+def _remove_database(path: Path) -> None:
+    for file in (
+        path,
+        path.with_name(f"{path.name}-wal"),
+        path.with_name(f"{path.name}-shm"),
+    ):
+        file.unlink(missing_ok=True)
+
+
+def encode_cursor(offset: int) -> str:
+    """Return a cursor of products served by a mirror, after `offset` of them."""
+    return base64.b64encode(f"{CURSOR_PREFIX}{offset}".encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """Return the offset of a mirror cursor, or `None` if it isn't one.
+
+    Without a cursor, products are served from the start.
+    """
+    if not cursor:
+        return 0
+    try:
+        value = base64.b64decode(cursor, validate=True).decode()
+    except ValueError:
+        return None
+    if not value.startswith(CURSOR_PREFIX):
+        return None
+    offset = value.removeprefix(CURSOR_PREFIX)
+    return int(offset) if offset.isdigit() else None
+
+
+def _match_expression(query: str) -> str | None:
+    # Terms are quoted, so the query is never parsed as FTS5 syntax. Words of a
+    # term, like a SKU, have to follow each other.
+    phrases = [
+        " ".join(words) for term in query.split() if (words := re.findall(r"\w+", term))
+    ]
+    if not phrases:
+        return None
+    return " ".join(f'"{phrase}"*' for phrase in phrases)
+
+
+def _timestamp(value: Any) -> str | None:
+    if not value:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(float(value)))
+
+
+catalog_mirrors = (
+    CatalogMirrors(
+        Path(os.environ["CATALOG_MIRROR_DIR"]),
+        sync_interval=get_env_float("CATALOG_SYNC_INTERVAL", 300.0),
+        full_sync_interval=get_env_float("CATALOG_FULL_SYNC_INTERVAL", 86400.0),
+        max_mirrors=get_env_int("CATALOG_MAX_MIRRORS", 20),
+        max_files=get_env_int("CATALOG_MAX_MIRROR_FILES", 100),
+        idle_timeout=get_env_float("CATALOG_MIRROR_IDLE_TIMEOUT", 3600.0),
+    )
+    if os.getenv("CATALOG_MIRROR_DIR")
+    else None
+)
+
+
+@lifespan
+async def catalog_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Stop syncing catalogs when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        if catalog_mirrors is not None:
+            await catalog_mirrors.aclose()
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+import httpx
+from fastmcp.exceptions import ToolError
+
+from .config import get_env_float, get_env_int
+from .deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ToolError):
+    """Raised instead of calling a Saleor API whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Circuit breaker of a single Saleor API.
+
+    The breaker opens after `failure_threshold` consecutive failed calls. A call
+    fails when it raises a connection error, gets a 5xx response, or takes longer
+    than `slow_call_threshold` seconds, including calls cancelled after that long
+    or by the deadline of the tool call. While open, calls are rejected right away.
+    After `reset_timeout` seconds, the breaker is half-open and lets a single probe
+    call through: the breaker closes if it succeeds and opens again if it fails.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_threshold: float = 10.0,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == OPEN
+            and self._clock() >= self._opened_at + self.reset_timeout
+        ):
+            return HALF_OPEN
+        return self._state
+
+    def retry_in(self) -> float:
+        """Return the number of seconds until the breaker lets a probe call through."""
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Return whether a call can be made, marking it as the probe if half-open."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record(self, duration: float, failed: bool) -> bool:
+        """Record the outcome of an allowed call.
+
+        Returns whether the breaker opened because of it.
+        """
+        self._probing = False
+        if self.slow_call_threshold and duration > self.slow_call_threshold:
+            failed = True
+        if not failed:
+            self._state = CLOSED
+            self._failures = 0
+            return False
+        self._failures += 1
+        if self._state == CLOSED and self._failures < self.failure_threshold:
+            return False
+        self._state = OPEN
+        self._opened_at = self._clock()
+        return True
+
+    def release(self) -> None:
+        """Forget an allowed call that was cancelled before it finished."""
+        self._probing = False
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers of Saleor APIs, one per API URL.
+
+    A degraded Saleor instance then only fails the tool calls made for it, instead
+    of holding request slots of the server that other tenants share. Breakers of
+    at most `max_breakers` API URLs are kept; the least recently used closed ones
+    are forgotten first.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_threshold: float = 10.0,
+        reset_timeout: float = 30.0,
+        max_breakers: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.max_breakers = max_breakers
+        self._clock = clock
+        self._breakers: OrderedDict[str, CircuitBreaker] = OrderedDict()
+        self._counters = {"rejected": 0, "opened": 0}
+
+    def get(self, api_url: str) -> CircuitBreaker:
+        api_url = api_url.rstrip("/")
+        breaker = self._breakers.get(api_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.failure_threshold,
+                slow_call_threshold=self.slow_call_threshold,
+                reset_timeout=self.reset_timeout,
+                clock=self._clock,
+            )
+            self._prune()
+            self._breakers[api_url] = breaker
+        self._breakers.move_to_end(api_url)
+        return breaker
+
+    def _prune(self) -> None:
+        excess = len(self._breakers) + 1 - self.max_breakers
+        if excess <= 0:
+            return
+        closed = [url for url, b in self._breakers.items() if b.state == CLOSED]
+        for api_url in (closed + list(self._breakers))[:excess]:
+            self._breakers.pop(api_url, None)
+
+    async def call(
+        self, api_url: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Make the call through the breaker of the API URL.
+
+        Raises `CircuitOpenError` without calling the API while its breaker is open.
+        """
+        breaker = self.get(api_url)
+        if not breaker.allow():
+            self._counters["rejected"] += 1
+            raise CircuitOpenError(
+                f"Saleor API at {api_url} is failing or responding slowly, so requests "
+                f"to it are paused. Try again in {breaker.retry_in():.0f} seconds."
+            )
+
+        started_at = self._clock()
+        try:
+            response = await send()
+        except httpx.TransportError:
+            self._record(api_url, breaker, started_at, failed=True)
+            raise
+        except asyncio.CancelledError:
+            # An API that didn't respond until the deadline, or for as long as a
+            # slow call takes, is failing. Other cancellations say nothing about it.
+            left = remaining()
+            duration = self._clock() - started_at
+            if (left is not None and left <= 0) or (
+                self.slow_call_threshold and duration > self.slow_call_threshold
+            ):
+                self._record(api_url, breaker, started_at, failed=True)
+            else:
+                breaker.release()
+            raise
+        except BaseException:
+            # Client-side errors say nothing about the API.
+            breaker.release()
+            raise
+        self._record(api_url, breaker, started_at, failed=response.status_code >= 500)
+        return response
+
+    def _record(
+        self, api_url: str, breaker: CircuitBreaker, started_at: float, failed: bool
+    ) -> None:
+        if breaker.record(self._clock() - started_at, failed):
+            self._counters["opened"] += 1
+            logger.warning("Opened circuit breaker of %s", api_url)
+
+    def stats(self) -> dict[str, int]:
+        """Return counters and the number of breakers in each state."""
+        states = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+        for breaker in self._breakers.values():
+            states[breaker.state] += 1
+        return {**self._counters, **states}
+
+
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=get_env_int("UPSTREAM_BREAKER_FAILURE_THRESHOLD", 5),
+    slow_call_threshold=get_env_float("UPSTREAM_BREAKER_SLOW_CALL_THRESHOLD", 10.0),
+    reset_timeout=get_env_float("UPSTREAM_BREAKER_RESET_TIMEOUT", 30.0),
+)
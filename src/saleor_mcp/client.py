@@ -0,0 +1,430 @@
+import hashlib
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from . import json_codec
+from .batch import MAX_PAGE_SIZE, chunked, gather_bounded
+from .cache import CacheEntry, ResponseCache, cache_key
+from .circuit_breaker import CircuitBreakerRegistry
+from .client_registry import ClientRegistry
+from .deadline import check_deadline
+from .documents import aliased_query, load_query, projected_query
+from .retry import RetryPolicy
+from .saleor_client.client import Client
+from .saleor_client.exceptions import (
+    GraphQLClientError,
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientHttpError,
+    GraphQLClientInvalidResponseError,
+)
+from .saleor_client.warehouse_details import WarehouseDetailsWarehouse
+from .single_flight import SingleFlight
+from .trusted_data import TrustedData
+
+# Number of warehouses fetched with a single document.
+WAREHOUSES_PER_QUERY = 20
+# Counts of orders sent in a single request, which keeps the cost of the query
+# within the limits of Saleor.
+COUNTS_PER_QUERY = 25
+
+
+def hash_token(value: str) -> str:
+    """Return a digest identifying a credential without keeping it around."""
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _operation(name: str, operation_name: str) -> Callable[..., Awaitable[Any]]:
+    """Wrap a generated operation method to skip validation when it's disabled.
+
+    The method also takes `fields` to select, for operations fetching a page of
+    a connection. Data of a selection isn't validated.
+    """
+
+    async def method(
+        self: "SaleorClient", fields: list[str] | None = None, **kwargs: Any
+    ) -> Any:
+        if fields:
+            document = await projected_query(operation_name, fields)
+            return await self.query(operation_name, document, **kwargs)
+        if self.validate_responses:
+            return await getattr(super(SaleorClient, self), name)(**kwargs)
+        return await self.query(operation_name, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+class SaleorClient(Client):
+    """Saleor GraphQL client backed by a shared, pooled HTTP client.
+
+    The generated client only applies `headers` when it creates its own HTTP client,
+    so here they are sent with every request instead. This lets tool calls for
+    different tokens share the connection pool of a single Saleor instance.
+
+    The pool is looked up in the registry before every request, so long-running
+    operations keep it marked as used and pick up a new one if it was evicted.
+
+    With `single_flight` set, identical operations running at the same time for the
+    same API URL and token share one upstream request and its parsed response.
+
+    With `retry_policy` set, requests failing with transient errors are retried
+    before their response is shared with coalesced callers or cached.
+
+    With `circuit_breakers` set, requests to a Saleor API that keeps failing or
+    responding slowly are rejected with `CircuitOpenError` without being sent.
+
+    With `validate_responses` disabled, operation methods return `TrustedData`
+    instead of the generated models.
+
+    With `cache` set, successful responses of the operations it has a TTL for are
+    cached per API URL and token. Stale entries are returned right away while they
+    are refreshed in the background.
+    """
+
+    # Operations returning `TrustedData` instead of models when validation is off.
+    count_orders = _operation("count_orders", "CountOrders")
+    list_channels = _operation("list_channels", "ListChannels")
+    list_customers = _operation("list_customers", "ListCustomers")
+    list_orders = _operation("list_orders", "ListOrders")
+    list_products = _operation("list_products", "ListProducts")
+    list_stocks = _operation("list_stocks", "ListStocks")
+    orders_total = _operation("orders_total", "OrdersTotal")
+    report_product_sales = _operation("report_product_sales", "ReportProductSales")
+    warehouse_details = _operation("warehouse_details", "WarehouseDetails")
+
+    # Parsed responses, shared by all callers of a coalesced request.
+    _parsed: "weakref.WeakKeyDictionary[httpx.Response, Any]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str],
+        registry: ClientRegistry,
+        single_flight: SingleFlight | None = None,
+        cache: ResponseCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breakers: CircuitBreakerRegistry | None = None,
+        validate_responses: bool = True,
+    ) -> None:
+        self.registry = registry
+        self.single_flight = single_flight
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.validate_responses = validate_responses
+        super().__init__(url=url, headers=headers, http_client=registry.get(url))
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        headers = {**(self.headers or {}), **kwargs.pop("headers", {})}
+
+        async def send_once() -> httpx.Response:
+            check_deadline()
+            self.http_client = self.registry.get(self.url)
+            return await super(SaleorClient, self).execute(
+                query=query,
+                operation_name=operation_name,
+                variables=variables,
+                headers=headers,
+                **kwargs,
+            )
+
+        async def send_through_breaker() -> httpx.Response:
+            if self.circuit_breakers is None:
+                return await send_once()
+            return await self.circuit_breakers.call(self.url, send_once)
+
+        async def send() -> httpx.Response:
+            if self.retry_policy is None:
+                return await send_through_breaker()
+            return await self.retry_policy.run(operation_name, send_through_breaker)
+
+        key = self._request_key(query, operation_name, variables, headers)
+
+        async def fetch() -> httpx.Response:
+            if self.single_flight is None:
+                return await send()
+            return await self.single_flight.do(key, send)
+
+        if (
+            self.cache is None
+            or not operation_name
+            or not self.cache.ttl_for(operation_name)
+        ):
+            return await fetch()
+
+        entry_key = cache_key(
+            self.url,
+            operation_name,
+            hashlib.sha256("\0".join(key).encode()).hexdigest(),
+        )
+        entry = await self.cache.get(entry_key)
+        if entry is None:
+            return await self._fetch_and_cache(entry_key, operation_name, fetch)
+        if not self.cache.is_fresh(entry):
+            self.cache.refresh(
+                entry_key,
+                lambda: self._fetch_and_cache(entry_key, operation_name, fetch),
+            )
+        return self._cached_response(entry)
+
+    async def query(
+        self, operation_name: str, document: str | None = None, **variables: Any
+    ) -> TrustedData:
+        """Run an operation from the `graphql` directory and return its data.
+
+        `document` replaces the document of the operation, for example with one
+        selecting other fields. The data isn't validated against the generated
+        models, which saves building a model for every object of the response.
+        """
+        response = await self.execute(
+            query=document or load_query(operation_name),
+            operation_name=operation_name,
+            variables=variables,
+        )
+        return TrustedData(self.get_data(response))
+
+    async def iter_pages(
+        self,
+        operation_name: str,
+        fields: list[str] | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        **variables: Any,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the connection of every page an operation returns, one by one.
+
+        Pages select only the given `fields` of nodes, if any, and are fetched one
+        after another, following `endCursor` until there is no next page.
+        """
+        document = await projected_query(operation_name, fields) if fields else None
+        after = None
+        while True:
+            data = await self.query(
+                operation_name, document, first=page_size, after=after, **variables
+            )
+            # Operations fetch a single connection.
+            connection = next(iter(data.values())) or {}
+            yield connection
+            page_info = connection.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                return
+            after = page_info["endCursor"]
+
+    async def count_orders_batch(
+        self, filters: list[dict[str, Any] | None], max_concurrency: int = 4
+    ) -> list[int]:
+        """Return the numbers of orders matching each of the filters.
+
+        Orders are counted for `COUNTS_PER_QUERY` filters at a time, with a document
+        aliasing the `CountOrders` query for each of them.
+        """
+
+        async def fetch(chunk: list[dict[str, Any] | None]) -> list[int]:
+            response = await self.execute(
+                query=aliased_query("CountOrders", len(chunk)),
+                operation_name="CountOrdersBatch",
+                variables={
+                    f"filter{index}": filter for index, filter in enumerate(chunk)
+                },
+            )
+            data = self.get_data(response)
+            return [
+                (data[f"orders{index}"] or {}).get("totalCount") or 0
+                for index in range(len(chunk))
+            ]
+
+        results = await gather_bounded(
+            (
+                lambda chunk=chunk: fetch(list(chunk))
+                for chunk in chunked(filters, COUNTS_PER_QUERY)
+            ),
+            max_concurrency,
+        )
+        return [count for counts in results for count in counts]
+
+    async def warehouses_details(
+        self, ids: list[str], max_concurrency: int = 4
+    ) -> dict[str, Any]:
+        """Return details of warehouses mapped by their IDs.
+
+        Warehouses are fetched `WAREHOUSES_PER_QUERY` at a time, with a document
+        aliasing the `WarehouseDetails` query for each of them, and cached one by
+        one. Warehouses which don't exist are mapped to `None`.
+        """
+        ids = list(dict.fromkeys(ids))
+        cacheable = self.cache is not None and self.cache.ttl_for("WarehouseDetails")
+        warehouses: dict[str, Any] = {}
+        if self.cache is not None and cacheable:
+            for id in ids:
+                entry = await self.cache.get(self._warehouse_key(id))
+                if entry is not None and self.cache.is_fresh(entry):
+                    warehouses[id] = (
+                        entry.data
+                        if entry.data is not None
+                        else json_codec.loads(entry.value)
+                    )
+
+        async def fetch(chunk: list[str]) -> list[Any]:
+            response = await self.execute(
+                query=aliased_query("WarehouseDetails", len(chunk)),
+                operation_name="WarehouseDetailsBatch",
+                variables={f"id{index}": id for index, id in enumerate(chunk)},
+            )
+            data = self.get_data(response)
+            return [data[f"warehouse{index}"] for index in range(len(chunk))]
+
+        missing = [id for id in ids if id not in warehouses]
+        chunks = chunked(missing, WAREHOUSES_PER_QUERY)
+        results = await gather_bounded(
+            (lambda chunk=chunk: fetch(list(chunk)) for chunk in chunks),
+            max_concurrency,
+        )
+        for chunk, chunk_warehouses in zip(chunks, results, strict=True):
+            for id, warehouse in zip(chunk, chunk_warehouses, strict=True):
+                warehouses[id] = warehouse
+                if self.cache is not None and cacheable and warehouse is not None:
+                    await self.cache.set(
+                        self._warehouse_key(id),
+                        json_codec.dumps(warehouse),
+                        "WarehouseDetails",
+                        data=warehouse,
+                    )
+
+        return {id: self._warehouse(warehouses[id]) for id in ids}
+
+    def _warehouse(self, data: dict[str, Any] | None) -> Any:
+        if data is None:
+            return None
+        if self.validate_responses:
+            return WarehouseDetailsWarehouse.model_validate(data)
+        return TrustedData(data)
+
+    def _warehouse_key(self, id: str) -> str:
+        token_hash = hash_token((self.headers or {}).get("Authorization", ""))
+        document_hash = hashlib.sha256(
+            load_query("WarehouseDetails").encode()
+        ).hexdigest()
+        return cache_key(
+            self.url,
+            "WarehouseDetails",
+            hashlib.sha256(
+                "\0".join(("warehouse", token_hash, document_hash, id)).encode()
+            ).hexdigest(),
+        )
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        if response in self._parsed:
+            return self._parsed[response]
+        data = self._decode_data(response)
+        self._parsed[response] = data
+        return data
+
+    def _decode_data(self, response: httpx.Response) -> dict[str, Any]:
+        # Same as the generated `get_data`, but decoding with the JSON codec.
+        if not response.is_success:
+            raise GraphQLClientHttpError(
+                status_code=response.status_code, response=response
+            )
+
+        try:
+            response_json = json_codec.loads(response.content)
+        except ValueError as exc:
+            raise GraphQLClientInvalidResponseError(response=response) from exc
+
+        if (not isinstance(response_json, dict)) or (
+            "data" not in response_json and "errors" not in response_json
+        ):
+            raise GraphQLClientInvalidResponseError(response=response)
+
+        data = response_json.get("data")
+        errors = response_json.get("errors")
+        if errors:
+            raise GraphQLClientGraphQLMultiError.from_errors_dicts(
+                errors_dicts=errors, data=data
+            )
+        return data
+
+    async def _execute_json(
+        self,
+        query: str,
+        operation_name: str | None,
+        variables: dict[str, Any],
+        **kwargs: Any,
+    ) -> httpx.Response:
+        # Same as the generated `_execute_json`, but encoding with the JSON codec.
+        headers = {"Content-Type": "application/json", **kwargs.pop("headers", {})}
+        return await self.http_client.post(
+            url=self.url,
+            content=json_codec.dumps(
+                {
+                    "query": query,
+                    "operationName": operation_name,
+                    "variables": variables,
+                }
+            ),
+            headers=headers,
+            **kwargs,
+        )
+
+    async def _fetch_and_cache(
+        self,
+        key: str,
+        operation_name: str,
+        fetch: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        response = await fetch()
+        if self.cache is None or not response.is_success:
+            return response
+        try:
+            data = self.get_data(response)
+        except GraphQLClientError:
+            return response
+        await self.cache.set(key, response.content, operation_name, data=data)
+        return response
+
+    def _cached_response(self, entry: CacheEntry) -> httpx.Response:
+        if entry.data is None:
+            return httpx.Response(
+                200, content=entry.value, headers={"Content-Type": "application/json"}
+            )
+        # The parsed data is reused, so the body doesn't have to be copied again.
+        response = httpx.Response(200)
+        self._parsed[response] = entry.data
+        return response
+
+    def _request_key(
+        self,
+        query: str,
+        operation_name: str | None,
+        variables: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> tuple[str, ...]:
+        canonical_variables = json_codec.dumps(
+            self._convert_dict_to_json_serializable(variables or {}), sort_keys=True
+        ).decode()
+        return (
+            self.url,
+            hash_token(headers.get("Authorization", "")),
+            operation_name or "",
+            hashlib.sha256(query.encode()).hexdigest(),
+            canonical_variables,
+        )
+
+    async def __aexit__(
+        self,
+        exc_type: object,
+        exc_val: object,
+        exc_tb: object,
+    ) -> None:
+        # The HTTP client is owned by the registry and outlives this client.
+        pass
@@ -0,0 +1,177 @@
+import asyncio
+import importlib.util
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from fastmcp import FastMCP
+from fastmcp.server.lifespan import lifespan
+
+from .config import get_env_bool, get_env_float, get_env_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pool:
+    client: httpx.AsyncClient
+    last_used: float
+
+
+class ClientRegistry:
+    """Registry of long-lived HTTP clients keyed by Saleor API URL.
+
+    Every tool call for the same Saleor instance reuses one `httpx.AsyncClient`, so
+    its connection pool stays warm between calls. The clients carry no credentials;
+    auth headers are sent with each request by `SaleorClient`.
+
+    The registry holds at most `max_pools` pools, and no more than
+    `max_connections // max_connections_per_pool` so that the total number of open
+    sockets stays within `max_connections`. When full, the least recently used pool
+    is evicted. Pools unused for `idle_timeout` seconds are evicted as well. Evicted
+    pools are closed in the background after `close_grace_period` seconds, giving
+    requests that still hold them time to finish.
+
+    With `http2` enabled, clients negotiate HTTP/2 where the server supports it, so
+    concurrent requests to one Saleor instance are multiplexed over a single
+    connection. It requires the `h2` package (`saleor-mcp[http2]` extra); without
+    it the registry falls back to HTTP/1.1.
+    """
+
+    def __init__(
+        self,
+        max_pools: int = 100,
+        max_connections: int = 1000,
+        max_connections_per_pool: int = 20,
+        max_keepalive_per_pool: int = 20,
+        idle_timeout: float = 300.0,
+        close_grace_period: float = 60.0,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_pools = max(
+            1, min(max_pools, max_connections // max_connections_per_pool)
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_pool,
+            max_keepalive_connections=max_keepalive_per_pool,
+        )
+        self.idle_timeout = idle_timeout
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requires the 'h2' package, falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.close_grace_period = close_grace_period
+        self._transport = transport
+        self._clock = clock
+        self._pools: OrderedDict[str, _Pool] = OrderedDict()
+        self._closing: set[asyncio.Task] = set()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "evicted_lru": 0,
+            "evicted_idle": 0,
+            "closed": 0,
+        }
+
+    def get(self, api_url: str) -> httpx.AsyncClient:
+        """Return the pooled HTTP client for the given API URL, creating it if needed."""
+        now = self._clock()
+        self._evict_idle(now)
+
+        pool = self._pools.get(api_url)
+        if pool is not None and not pool.client.is_closed:
+            self._counters["hits"] += 1
+            pool.last_used = now
+            self._pools.move_to_end(api_url)
+            return pool.client
+
+        self._counters["misses"] += 1
+        while len(self._pools) >= self.max_pools:
+            _, evicted = self._pools.popitem(last=False)
+            self._counters["evicted_lru"] += 1
+            self._close_later(evicted.client)
+
+        client = self._create_client()
+        self._pools[api_url] = _Pool(client=client, last_used=now)
+        return client
+
+    def stats(self) -> dict[str, int]:
+        """Return counters describing the registry usage."""
+        return {
+            **self._counters,
+            "open_pools": len(self._pools),
+            "closing_pools": len(self._closing),
+            "max_pools": self.max_pools,
+            "max_connections": self.max_pools * (self.limits.max_connections or 0),
+        }
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self.limits, http2=self.http2, transport=self._transport
+        )
+
+    def _evict_idle(self, now: float) -> None:
+        while self._pools:
+            api_url, pool = next(iter(self._pools.items()))
+            if now - pool.last_used < self.idle_timeout:
+                break
+            del self._pools[api_url]
+            self._counters["evicted_idle"] += 1
+            self._close_later(pool.client)
+
+    def _close_later(self, client: httpx.AsyncClient) -> None:
+        task = asyncio.get_running_loop().create_task(self._close(client, delay=True))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, client: httpx.AsyncClient, delay: bool = False) -> None:
+        try:
+            if delay and self.close_grace_period:
+                await asyncio.sleep(self.close_grace_period)
+        finally:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("Failed to close pooled HTTP client", exc_info=True)
+            self._counters["closed"] += 1
+
+    async def aclose(self) -> None:
+        """Close all pooled clients, including evicted ones still in grace period."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        closing = list(self._closing)
+        for task in closing:
+            task.cancel()
+        await asyncio.gather(*closing, return_exceptions=True)
+        for pool in pools:
+            await self._close(pool.client)
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+
+client_registry = ClientRegistry(
+    max_pools=get_env_int("UPSTREAM_MAX_POOLS", 100),
+    max_connections=get_env_int("UPSTREAM_MAX_CONNECTIONS", 1000, minimum=1),
+    max_connections_per_pool=get_env_int(
+        "UPSTREAM_MAX_CONNECTIONS_PER_POOL", 20, minimum=1
+    ),
+    max_keepalive_per_pool=get_env_int("UPSTREAM_MAX_KEEPALIVE_PER_POOL", 20),
+    idle_timeout=get_env_float("UPSTREAM_POOL_IDLE_TIMEOUT", 300.0),
+    http2=get_env_bool("UPSTREAM_HTTP2"),
+)
+
+
+@lifespan
+async def client_registry_lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Close pooled HTTP clients when the server shuts down."""
+    try:
+        yield {}
+    finally:
+        await client_registry.aclose()
@@ -26,6 +26,32 @@ def validate_api_url(url, pattern):
     return bool(re.match(pattern, url))
 
 
+def get_env_int(name: str, default: int, minimum: int | None = None) -> int:
+    """Read an integer setting from the environment.
+
+    Raises `ValueError` naming the setting when it is lower than `minimum`.
+    """
+    value = os.getenv(name)
+    result = int(value) if value else default
+    if minimum is not None and result < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {result}")
+    return result
+
+
+def get_env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
 @dataclass
 class SaleorConfig:
     api_url: str
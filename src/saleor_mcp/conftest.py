@@ -1,5 +1,12 @@
+import json
+from unittest.mock import patch
+
+import httpx
 import pytest
 
+from saleor_mcp import ctx_utils
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
 from saleor_mcp.config import SaleorConfig
 from saleor_mcp.saleor_client.count_orders import CountOrders
 from saleor_mcp.saleor_client.list_channels import ListChannels
@@ -9,6 +16,53 @@ from saleor_mcp.saleor_client.list_products import ListProducts
 from saleor_mcp.saleor_client.list_stocks import ListStocks
 from saleor_mcp.saleor_client.warehouse_details import WarehouseDetails
 
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+class FakeClock:
+    """Clock which only moves when tests set `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_client():
+    """Fixture making Saleor clients that send requests to a handler."""
+
+    def make_client(handler, token="token", **options):
+        return SaleorClient(
+            url=API_URL,
+            headers={"Authorization": f"Bearer {token}"},
+            registry=ClientRegistry(transport=httpx.MockTransport(handler)),
+            **options,
+        )
+
+    return make_client
+
+
+@pytest.fixture
+def serve_saleor_api(mock_saleor_config, monkeypatch):
+    """Fixture routing requests of tools to a handler of a mock transport."""
+
+    def serve_saleor_api(handler, cache=None):
+        registry = ClientRegistry(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(ctx_utils, "client_registry", registry)
+        monkeypatch.setattr(ctx_utils, "response_cache", cache)
+        return registry
+
+    with patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config:
+        mock_get_config.return_value = mock_saleor_config
+        yield serve_saleor_api
+
 
 @pytest.fixture
 def mock_saleor_config():
@@ -29,6 +83,7 @@ def sample_orders_response():
                             "created": "2023-01-01T00:00:00Z",
                             "updatedAt": "2023-01-02T00:00:00Z",
                             "paymentStatus": "FULLY_CHARGED",
+                            "channel": {"slug": "default-channel"},
                             "total": {"gross": {"amount": 100.50, "currency": "USD"}},
                             "lines": [
                                 {
@@ -433,3 +488,71 @@ def sample_warehouse_response():
 def empty_warehouse_response():
     """Fixture for empty warehouse response (warehouse not found)."""
     return WarehouseDetails(warehouse=None)
+
+
+class OrdersAPI:
+    """Fake Saleor API paginating and counting orders, filtered by their dates."""
+
+    def __init__(self) -> None:
+        self.orders: list[dict] = []
+        self.requests: list[dict] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        variables = body["variables"]
+        if body["operationName"] == "CountOrdersBatch":
+            return httpx.Response(
+                200,
+                json={
+                    "data": {
+                        f"orders{name.removeprefix('filter')}": {
+                            "totalCount": len(self.filter(filter))
+                        }
+                        for name, filter in variables.items()
+                    }
+                },
+            )
+        orders = self.filter(variables.get("filter"))
+        if body["operationName"] == "CountOrders":
+            return httpx.Response(
+                200, json={"data": {"orders": {"totalCount": len(orders)}}}
+            )
+        if (variables.get("sortBy") or {}).get("field") == "LAST_MODIFIED_AT":
+            orders = sorted(orders, key=lambda order: order["updatedAt"])
+        start = int(variables.get("after") or 0)
+        end = start + variables["first"]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "orders": {
+                        "edges": [{"node": node} for node in orders[start:end]],
+                        "pageInfo": {
+                            "hasNextPage": end < len(orders),
+                            "endCursor": str(end),
+                        },
+                    }
+                }
+            },
+        )
+
+    def filter(self, filter: dict | None) -> list[dict]:
+        created = (filter or {}).get("created") or {}
+        updated_at = (filter or {}).get("updatedAt") or {}
+        return [
+            order
+            for order in self.orders
+            if created.get("gte", "")
+            <= order["created"][:10]
+            <= created.get("lte", "9999-12-31")
+            and (not updated_at or order["updatedAt"] >= updated_at["gte"])
+        ]
+
+
+@pytest.fixture
+def orders_api(serve_saleor_api):
+    """Fixture serving `orders_api.orders` to tools through the real client."""
+    api = OrdersAPI()
+    serve_saleor_api(api)
+    return api
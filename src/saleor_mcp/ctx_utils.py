@@ -1,12 +1,30 @@
-from .config import get_config_from_headers
-from .saleor_client.client import Client
+from .cache import response_cache
+from .circuit_breaker import circuit_breakers
+from .client import SaleorClient
+from .client_registry import client_registry
+from .config import get_config_from_headers, get_env_bool
+from .retry import retry_policy
+from .single_flight import single_flight
 
+validate_responses = get_env_bool("UPSTREAM_VALIDATE_RESPONSES", True)
 
-def get_saleor_client() -> Client:
+
+def get_saleor_client() -> SaleorClient:
     """Create and return a Saleor GraphQL client using configuration from headers.
 
+    The client reuses the pooled HTTP client of the requested Saleor instance.
+
     Note: This function works only within a request context.
     """
     saleor_headers = get_config_from_headers()
     headers = {"Authorization": f"Bearer {saleor_headers.auth_token}"}
-    return Client(url=saleor_headers.api_url, headers=headers)
+    return SaleorClient(
+        url=saleor_headers.api_url,
+        headers=headers,
+        registry=client_registry,
+        single_flight=single_flight,
+        cache=response_cache,
+        retry_policy=retry_policy,
+        circuit_breakers=circuit_breakers,
+        validate_responses=validate_responses,
+    )
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import Any
+
+import mcp.types as mt
+from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools import ToolResult
+
+from .config import get_env_float
+
+# Default timeouts of tools expected to take longer than others, like exports
+# streaming the whole history of a shop to disk.
+DEFAULT_TOOL_TIMEOUTS: dict[str, float] = {
+    "export_orders": 3600.0,
+    "export_products": 3600.0,
+}
+
+# Monotonic time by which the current tool call has to finish.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(ToolError):
+    """Raised when a tool call doesn't finish before its deadline."""
+
+
+def remaining() -> float | None:
+    """Return the number of seconds left until the deadline, if there is one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Raise `DeadlineExceededError` if the deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("The deadline of the tool call has passed.")
+
+
+def without_deadline() -> Context:
+    """Return a copy of the current context without the deadline.
+
+    Tasks started in the background by a tool call, which outlive it, run in this
+    context, so the deadline of the call doesn't cut them short.
+    """
+    context = copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+@asynccontextmanager
+async def deadline_scope(seconds: float) -> AsyncIterator[None]:
+    """Run the block with a deadline the given number of seconds from now.
+
+    An earlier deadline set by an outer scope is kept. Work still running when
+    the deadline passes is cancelled and `DeadlineExceededError` is raised.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    timeout_scope = asyncio.timeout(deadline - time.monotonic())
+    try:
+        async with timeout_scope:
+            yield
+    except TimeoutError as e:
+        if not timeout_scope.expired():
+            raise
+        raise DeadlineExceededError(
+            f"The tool call didn't finish within {seconds:g} seconds."
+        ) from e
+    finally:
+        _deadline.reset(token)
+
+
+def parse_timeout(value: Any) -> float | None:
+    """Return a positive number of seconds from a client-provided timeout."""
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return None
+    return timeout if timeout > 0 else None
+
+
+class DeadlineMiddleware(Middleware):
+    """Limit the time tool calls can take.
+
+    Each tool call gets a timeout from the `TOOL_TIMEOUT_<TOOL NAME>` env variable,
+    falling back to the tool's timeout in `tool_timeouts`, and `default_timeout`
+    for other tools. MCP clients can ask for a shorter timeout
+    in seconds with the `timeout` field of the request `_meta`, or with the
+    `X-Request-Timeout` HTTP header. The resulting deadline applies to all upstream
+    requests made by the tool, including retries and further pages.
+    """
+
+    def __init__(
+        self,
+        default_timeout: float = 60.0,
+        tool_timeouts: dict[str, float] | None = None,
+    ) -> None:
+        self.default_timeout = default_timeout
+        self.tool_timeouts = (
+            DEFAULT_TOOL_TIMEOUTS if tool_timeouts is None else tool_timeouts
+        )
+
+    def configured_timeout(self, tool_name: str) -> float:
+        return get_env_float(
+            f"TOOL_TIMEOUT_{tool_name.upper()}",
+            self.tool_timeouts.get(tool_name, self.default_timeout),
+        )
+
+    def requested_timeout(
+        self, context: MiddlewareContext[mt.CallToolRequestParams]
+    ) -> float | None:
+        fastmcp_context = context.fastmcp_context
+        request_context = fastmcp_context.request_context if fastmcp_context else None
+        meta = request_context.meta if request_context else None
+        timeout = parse_timeout(getattr(meta, "timeout", None))
+        if timeout is None:
+            headers = get_http_headers()
+            timeout = parse_timeout(headers.get("x-request-timeout"))
+        return timeout
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[mt.CallToolRequestParams],
+        call_next: CallNext[mt.CallToolRequestParams, ToolResult],
+    ) -> ToolResult:
+        timeouts = [
+            timeout
+            for timeout in (
+                self.configured_timeout(context.message.name),
+                self.requested_timeout(context),
+            )
+            if timeout
+        ]
+        if not timeouts:
+            return await call_next(context)
+        async with deadline_scope(min(timeouts)):
+            return await call_next(context)
+
+
+deadline_middleware = DeadlineMiddleware(
+    default_timeout=get_env_float("TOOL_TIMEOUT", 60.0)
+)
@@ -0,0 +1,237 @@
+import asyncio
+import functools
+from copy import copy
+from pathlib import Path
+from typing import Any
+
+from fastmcp.exceptions import ToolError
+from graphql import (
+    FieldNode,
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    NameNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableNode,
+    Visitor,
+    build_schema,
+    get_named_type,
+    is_leaf_type,
+    parse,
+    print_ast,
+    validate,
+    visit,
+)
+
+GRAPHQL_DIR = Path(__file__).parent / "graphql"
+SCHEMA_PATH = Path(__file__).parent / "schema.graphql"
+
+# Number of query documents with a selection of fields kept for reuse.
+MAX_DOCUMENTS = 256
+
+# Tree of selected fields, mapping names of fields to their selected subfields.
+_Selection = dict[str, "_Selection"]
+
+
+class InvalidFieldsError(ToolError):
+    """Raised when selected fields can't be queried."""
+
+
+@functools.cache
+def load_query(operation_name: str) -> str:
+    """Return the GraphQL document of an operation from the `graphql` directory."""
+    return (GRAPHQL_DIR / f"{operation_name}.graphql").read_text()
+
+
+@functools.cache
+def get_schema() -> GraphQLSchema:
+    """Return the Saleor GraphQL schema."""
+    return build_schema(SCHEMA_PATH.read_text())
+
+
+async def projected_query(operation_name: str, fields: list[str]) -> str:
+    """Return the document of an operation selecting only the given fields of nodes.
+
+    Fields are dotted paths from the nodes of the connection the operation
+    fetches, like `total.gross.amount`. Fields of nodes of nested connections
+    can skip `edges.node`, like `productVariants.sku`. Building the schema for the first time
+    takes a while, so it's done in a thread.
+    """
+    return await asyncio.to_thread(
+        build_projected_query, operation_name, tuple(sorted(set(fields)))
+    )
+
+
+@functools.lru_cache(maxsize=MAX_DOCUMENTS)
+def build_projected_query(operation_name: str, fields: tuple[str, ...]) -> str:
+    """Return the document of an operation selecting the given fields of nodes.
+
+    Only fields the operation selects by default can be selected, so a selection
+    never returns more than the operation does. An object field selected without
+    subfields gets the subfields the operation selects by default, and fields
+    keep the arguments the operation passes to them.
+    """
+    if not fields:
+        raise InvalidFieldsError("Select at least one field.")
+    schema = get_schema()
+    document = parse(load_query(operation_name))
+    operation = document.definitions[0]
+    assert isinstance(operation, OperationDefinitionNode)
+    assert schema.query_type is not None
+
+    # Operations fetch a single connection, like `orders { edges { node { ... } } }`.
+    node = operation.selection_set.selections[0]
+    node_type: GraphQLObjectType | GraphQLInterfaceType = schema.query_type
+    for name in ("edges", "node"):
+        assert isinstance(node, FieldNode)
+        node_type = _object_type(node_type.fields[node.name.value])
+        node = _find_field(node.selection_set, name)
+    assert isinstance(node, FieldNode)
+    node_type = _object_type(node_type.fields[node.name.value])
+
+    selection: _Selection = {}
+    for path in fields:
+        subtree = selection
+        for name in path.split("."):
+            subtree = subtree.setdefault(name, {})
+    node.selection_set = _select(node_type, node.selection_set, selection, "")
+
+    if errors := validate(schema, document):
+        raise InvalidFieldsError(
+            "Selected fields can't be queried: "
+            + " ".join(error.message for error in errors)
+        )
+    return print_ast(document)
+
+
+@functools.lru_cache(maxsize=MAX_DOCUMENTS)
+def aliased_query(operation_name: str, count: int) -> str:
+    """Return a document running the root field of an operation `count` times.
+
+    The copies of the field are aliased with their index, like `warehouse0`, and
+    the operation's variables are suffixed with it, like `$id0`, so every copy
+    gets its own. The operation is named after the original with `Batch` added.
+    """
+    document = parse(load_query(operation_name))
+    operation = document.definitions[0]
+    assert isinstance(operation, OperationDefinitionNode)
+    field = operation.selection_set.selections[0]
+    assert isinstance(field, FieldNode)
+
+    selections = []
+    variable_definitions = []
+    for index in range(count):
+        renamer = _VariableRenamer(str(index))
+        aliased_field = copy(visit(field, renamer))
+        aliased_field.alias = NameNode(value=f"{field.name.value}{index}")
+        selections.append(aliased_field)
+        variable_definitions.extend(
+            visit(definition, renamer) for definition in operation.variable_definitions
+        )
+    operation.name = NameNode(value=f"{operation_name}Batch")
+    operation.variable_definitions = tuple(variable_definitions)
+    operation.selection_set = SelectionSetNode(selections=tuple(selections))
+    return print_ast(document)
+
+
+class _VariableRenamer(Visitor):
+    """Add a suffix to the names of variables."""
+
+    def __init__(self, suffix: str) -> None:
+        super().__init__()
+        self.suffix = suffix
+
+    def enter_variable(self, node: VariableNode, *args: Any) -> VariableNode:
+        return VariableNode(name=NameNode(value=node.name.value + self.suffix))
+
+
+def _find_field(selection_set: SelectionSetNode | None, name: str) -> FieldNode | None:
+    if selection_set is None:
+        return None
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode) and selection.name.value == name:
+            return selection
+    return None
+
+
+def _select(
+    parent_type: GraphQLObjectType | GraphQLInterfaceType,
+    default: SelectionSetNode | None,
+    selection: _Selection,
+    prefix: str,
+) -> SelectionSetNode:
+    """Return a selection set with the selected fields of the parent type.
+
+    Selected fields must be in the `default` selection set.
+    """
+    field_nodes = []
+    for name, subfields in selection.items():
+        path = prefix + name
+        field: GraphQLField | None = parent_type.fields.get(name)
+        if field is None:
+            raise InvalidFieldsError(
+                f"Unknown field `{path}`: `{parent_type.name}` has no field `{name}`."
+            )
+        default_node = _find_field(default, name)
+        if default_node is None:
+            raise InvalidFieldsError(
+                f"Field `{path}` can't be selected: only fields returned by default "
+                "can be."
+            )
+
+        field_type = get_named_type(field.type)
+        selection_set = None
+        if is_leaf_type(field_type):
+            if subfields:
+                raise InvalidFieldsError(f"Field `{path}` has no subfields.")
+        elif not subfields:
+            selection_set = default_node.selection_set
+        elif isinstance(field_type, GraphQLObjectType | GraphQLInterfaceType):
+            selection_set = _select(
+                field_type,
+                default_node.selection_set,
+                _nodes_of_connection(field_type, subfields),
+                path + ".",
+            )
+        else:
+            raise InvalidFieldsError(f"Subfields of `{path}` can't be selected.")
+
+        field_nodes.append(
+            FieldNode(
+                name=NameNode(value=name),
+                arguments=default_node.arguments,
+                directives=(),
+                selection_set=selection_set,
+            )
+        )
+    return SelectionSetNode(selections=tuple(field_nodes))
+
+
+def _nodes_of_connection(
+    field_type: GraphQLObjectType | GraphQLInterfaceType, selection: _Selection
+) -> _Selection:
+    """Move fields selected on a connection, but not its own, to its nodes.
+
+    This lets `productVariants.sku` stand for `productVariants.edges.node.sku`.
+    """
+    if "edges" not in field_type.fields:
+        return selection
+    connection_selection: _Selection = {}
+    node_selection: _Selection = {}
+    for name, subfields in selection.items():
+        if name in field_type.fields:
+            connection_selection[name] = subfields
+        else:
+            node_selection[name] = subfields
+    if node_selection:
+        edges = connection_selection.setdefault("edges", {})
+        edges.setdefault("node", {}).update(node_selection)
+    return connection_selection
+
+
+def _object_type(field: GraphQLField) -> GraphQLObjectType | GraphQLInterfaceType:
+    field_type = get_named_type(field.type)
+    assert isinstance(field_type, GraphQLObjectType | GraphQLInterfaceType)
+    return field_type
@@ -0,0 +1,172 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import secrets
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastmcp.exceptions import ResourceError
+
+from . import json_codec
+from .config import get_env_float
+
+EXPORT_MIME_TYPE = "application/gzip"
+
+
+@dataclass
+class Export:
+    id: str
+    rows: int
+    size: int
+
+    @property
+    def uri(self) -> str:
+        return f"export://{self.id}"
+
+
+def export_owner(api_url: str, authorization: str) -> str:
+    """Return the hash identifying who an export belongs to."""
+    return hashlib.sha256(
+        "\0".join((api_url.rstrip("/"), authorization)).encode()
+    ).hexdigest()
+
+
+async def prefetched(items: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Yield items of an async iterator, fetching the next one in the background.
+
+    The next item is already being fetched while the caller handles the current
+    one, so fetching pages overlaps with encoding them.
+    """
+    next_item = asyncio.ensure_future(_next(items))
+    try:
+        while True:
+            item = await next_item
+            if item is _DONE:
+                return
+            next_item = asyncio.ensure_future(_next(items))
+            yield item
+    finally:
+        next_item.cancel()
+        await asyncio.gather(next_item, return_exceptions=True)
+
+
+_DONE = object()
+
+
+async def _next(items: AsyncIterator[Any]) -> Any:
+    try:
+        return await anext(items)
+    except StopAsyncIteration:
+        return _DONE
+
+
+class ExportStore:
+    """Write exports as gzipped NDJSON files and read them back for their owners.
+
+    Every export is a `<id>.ndjson.gz` file in `directory`, with the hash of its
+    owner in a `<id>.owner` file next to it, so processes sharing the directory
+    can serve each other's exports. Files are written page by page, under a
+    temporary name until the export is complete, and are removed `ttl` seconds
+    after they were written.
+    """
+
+    def __init__(self, directory: Path, ttl: float = 3600.0) -> None:
+        self.directory = directory
+        self.ttl = ttl
+
+    async def write(
+        self,
+        owner: str,
+        pages: AsyncIterator[list[Any]],
+        on_page: Callable[[int], Awaitable[None]] | None = None,
+    ) -> Export:
+        """Write objects from pages into a new export and return it.
+
+        Pages are fetched ahead while the current one is encoded, compressed and
+        written in a thread. `on_page` gets the number of objects written so far
+        after each page.
+        """
+        await asyncio.to_thread(self.remove_expired)
+        export_id = secrets.token_urlsafe(16)
+        partial_path = self.path(export_id).with_name(f"{export_id}.part")
+        rows = 0
+        file = await asyncio.to_thread(_open, partial_path)
+        try:
+            async for page in prefetched(pages):
+                await asyncio.to_thread(_write_page, file, page)
+                rows += len(page)
+                if on_page is not None:
+                    await on_page(rows)
+            await asyncio.to_thread(file.close)
+            size = await asyncio.to_thread(
+                self._complete, export_id, owner, partial_path
+            )
+        except BaseException:
+            _discard(file, partial_path)
+            raise
+        return Export(id=export_id, rows=rows, size=size)
+
+    def open(self, export_id: str, owner: str) -> Path:
+        """Return the path of an export, if it exists and belongs to the owner."""
+        path = self.path(export_id)
+        owner_path = path.with_name(f"{export_id}.owner")
+        try:
+            stored_owner = owner_path.read_text()
+        except FileNotFoundError:
+            stored_owner = None
+        if stored_owner != owner or not path.exists() or self._expired(path):
+            raise ResourceError(f"Export {export_id} not found.")
+        return path
+
+    def path(self, export_id: str) -> Path:
+        if not export_id or not export_id.replace("-", "").replace("_", "").isalnum():
+            raise ResourceError(f"Export {export_id} not found.")
+        return self.directory / f"{export_id}.ndjson.gz"
+
+    def remove_expired(self) -> None:
+        """Remove files of exports written more than `ttl` seconds ago."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if self._expired(path):
+                path.unlink(missing_ok=True)
+
+    def _complete(self, export_id: str, owner: str, partial_path: Path) -> int:
+        path = self.path(export_id)
+        path.with_name(f"{export_id}.owner").write_text(owner)
+        partial_path.rename(path)
+        return path.stat().st_size
+
+    def _expired(self, path: Path) -> bool:
+        try:
+            return path.stat().st_mtime < time.time() - self.ttl
+        except FileNotFoundError:
+            return True
+
+
+def _open(path: Path) -> gzip.GzipFile:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return gzip.open(path, "wb")
+
+
+def _discard(file: gzip.GzipFile, path: Path) -> None:
+    file.close()
+    path.unlink(missing_ok=True)
+
+
+def _write_page(file: gzip.GzipFile, objects: list[Any]) -> None:
+    file.write(b"".join(json_codec.dumps(obj) + b"\n" for obj in objects))
+
+
+export_store = ExportStore(
+    Path(
+        os.getenv("EXPORT_DIR")
+        or os.path.join(tempfile.gettempdir(), "saleor-mcp-exports")
+    ),
+    ttl=get_env_float("EXPORT_TTL", 3600.0),
+)
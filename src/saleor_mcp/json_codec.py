@@ -0,0 +1,37 @@
+import json
+from typing import Any
+
+from pydantic_core import to_jsonable_python
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # ty: ignore[invalid-assignment]
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Encode a value as JSON.
+
+    Uses orjson when it is installed and falls back to the standard library.
+    Values neither of them supports natively, such as pydantic models and
+    decimals, are converted with pydantic.
+    """
+    if orjson is not None:
+        # Datetimes go through pydantic too, so they are formatted the same way.
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(value, default=to_jsonable_python, option=option)
+    return json.dumps(
+        value, default=to_jsonable_python, sort_keys=sort_keys, separators=(",", ":")
+    ).encode()
+
+
+def loads(content: bytes | str) -> Any:
+    """Decode JSON, using orjson when it is installed.
+
+    Raises `ValueError` if the content isn't valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -1,22 +1,38 @@
+import asyncio
+
 from fastmcp import FastMCP
 from fastmcp.server.middleware.timing import DetailedTimingMiddleware
 from starlette.requests import Request
 from starlette.responses import HTMLResponse, JSONResponse
 from starlette.staticfiles import StaticFiles
 
+from saleor_mcp.cache import response_cache, response_cache_lifespan
+from saleor_mcp.catalog import catalog_lifespan
+from saleor_mcp.circuit_breaker import circuit_breakers
+from saleor_mcp.client_registry import client_registry, client_registry_lifespan
+from saleor_mcp.deadline import deadline_middleware
 from saleor_mcp.docs import generate_html
+from saleor_mcp.retry import retry_policy
+from saleor_mcp.single_flight import single_flight
 from saleor_mcp.tools import (
     channels_router,
     customers_router,
+    exports_router,
     orders_router,
     products_router,
     utils_router,
 )
+from saleor_mcp.webhooks import handle_saleor_webhook
 
-mcp = FastMCP("Saleor MCP Server")
+mcp = FastMCP(
+    "Saleor MCP Server",
+    lifespan=client_registry_lifespan | response_cache_lifespan | catalog_lifespan,
+)
 mcp.add_middleware(DetailedTimingMiddleware())
+mcp.add_middleware(deadline_middleware)
 mcp.mount(channels_router)
 mcp.mount(customers_router)
+mcp.mount(exports_router)
 mcp.mount(orders_router)
 mcp.mount(products_router)
 mcp.mount(utils_router)
@@ -24,7 +40,31 @@ mcp.mount(utils_router)
 
 @mcp.custom_route("/health", methods=["GET"])
 async def health_check(request: Request):
-    return JSONResponse({"status": "healthy"})
+    return JSONResponse(
+        {
+            "status": "healthy",
+            "open_circuit_breakers": circuit_breakers.stats()["open"],
+        }
+    )
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request):
+    return JSONResponse(
+        {
+            "client_registry": client_registry.stats(),
+            "single_flight": single_flight.stats(),
+            # Stats of a cache in SQLite are read from the database.
+            "response_cache": await asyncio.to_thread(response_cache.stats),
+            "retries": retry_policy.stats(),
+            "circuit_breakers": circuit_breakers.stats(),
+        }
+    )
+
+
+@mcp.custom_route("/webhooks/saleor", methods=["POST"])
+async def saleor_webhook(request: Request):
+    return await handle_saleor_webhook(request)
 
 
 @mcp.custom_route("/", methods=["GET"])
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from .config import get_env_float, get_env_int
+from .deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """Return the number of seconds to wait from a `Retry-After` header value.
+
+    The header holds either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    now = now or datetime.now(UTC)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+class RetryPolicy:
+    """Retry upstream requests failing with transient errors.
+
+    Requests that fail with a connection error or a 429, 502, 503 or 504 response
+    are sent again, up to `max_attempts` times in total. All operations of the
+    server only read data, so they are safe to repeat.
+
+    Retries wait for an exponential backoff with full jitter, capped at `max_delay`,
+    or for as long as the `Retry-After` header of the response asks. No retry is
+    made if it would end after `budget` seconds from the first attempt, or after the
+    deadline of the tool call; the last response or error is returned instead.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        budget: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._counters: defaultdict[str, dict[str, int]] = defaultdict(
+            lambda: {"requests": 0, "retries": 0, "exhausted": 0}
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the retry following the given attempt."""
+        return self._jitter(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+    async def run(
+        self,
+        operation_name: str | None,
+        send: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        counters = self._counters[operation_name or ""]
+        counters["requests"] += 1
+        # Retries also stop at the deadline of the tool call making the request.
+        left = remaining()
+        budget = self.budget if left is None else min(self.budget, left)
+        deadline = self._clock() + budget
+        attempt = 1
+        while True:
+            try:
+                response = await send()
+            except httpx.TransportError as error:
+                delay = self._retry_delay(attempt, deadline)
+                if delay is None:
+                    counters["exhausted"] += 1
+                    raise
+                reason = repr(error)
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self._retry_delay(attempt, deadline, retry_after)
+                if delay is None:
+                    counters["exhausted"] += 1
+                    return response
+                reason = f"HTTP {response.status_code}"
+                await response.aclose()
+
+            counters["retries"] += 1
+            logger.info(
+                "Retrying %s after %s in %.2fs (attempt %d of %d)",
+                operation_name,
+                reason,
+                delay,
+                attempt + 1,
+                self.max_attempts,
+            )
+            await self._sleep(delay)
+            attempt += 1
+
+    def _retry_delay(
+        self, attempt: int, deadline: float, retry_after: float | None = None
+    ) -> float | None:
+        if attempt >= self.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        if self._clock() + delay >= deadline:
+            return None
+        return delay
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return request, retry and exhausted retry counters per operation."""
+        return {name: dict(counters) for name, counters in self._counters.items()}
+
+
+retry_policy = RetryPolicy(
+    max_attempts=get_env_int("UPSTREAM_RETRY_MAX_ATTEMPTS", 3),
+    base_delay=get_env_float("UPSTREAM_RETRY_BASE_DELAY", 0.2),
+    max_delay=get_env_float("UPSTREAM_RETRY_MAX_DELAY", 5.0),
+    budget=get_env_float("UPSTREAM_RETRY_BUDGET", 10.0),
+)
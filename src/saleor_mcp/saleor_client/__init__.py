@@ -1,5 +1,10 @@
 # Generated by ariadne-codegen
 
+from .app_permissions import (
+    AppPermissions,
+    AppPermissionsApp,
+    AppPermissionsAppPermissions,
+)
 from .async_base_client import AsyncBaseClient
 from .base_model import BaseModel, Upload
 from .client import Client
@@ -502,6 +507,7 @@ from .list_orders import (
     ListOrdersOrdersEdgesNode,
     ListOrdersOrdersEdgesNodeBillingAddress,
     ListOrdersOrdersEdgesNodeBillingAddressCountry,
+    ListOrdersOrdersEdgesNodeChannel,
     ListOrdersOrdersEdgesNodeLines,
     ListOrdersOrdersEdgesNodeLinesUnitPrice,
     ListOrdersOrdersEdgesNodeLinesUnitPriceGross,
@@ -543,6 +549,28 @@ from .list_stocks import (
     ListStocksStocksEdgesNodeWarehouse,
     ListStocksStocksPageInfo,
 )
+from .orders_total import (
+    OrdersTotal,
+    OrdersTotalOrdersTotal,
+    OrdersTotalOrdersTotalGross,
+    OrdersTotalOrdersTotalNet,
+)
+from .report_product_sales import (
+    ReportProductSales,
+    ReportProductSalesReportProductSales,
+    ReportProductSalesReportProductSalesEdges,
+    ReportProductSalesReportProductSalesEdgesNode,
+    ReportProductSalesReportProductSalesEdgesNodeProduct,
+    ReportProductSalesReportProductSalesEdgesNodeRevenue,
+    ReportProductSalesReportProductSalesEdgesNodeRevenueGross,
+    ReportProductSalesReportProductSalesEdgesNodeRevenueNet,
+    ReportProductSalesReportProductSalesPageInfo,
+)
+from .user_permissions import (
+    UserPermissions,
+    UserPermissionsMe,
+    UserPermissionsMeUserPermissions,
+)
 from .warehouse_details import (
     WarehouseDetails,
     WarehouseDetailsWarehouse,
@@ -570,6 +598,9 @@ __all__ = [
     "AppFilterInput",
     "AppInput",
     "AppInstallInput",
+    "AppPermissions",
+    "AppPermissionsApp",
+    "AppPermissionsAppPermissions",
     "AppSortField",
     "AppSortingInput",
     "AppTokenInput",
@@ -742,6 +773,7 @@ __all__ = [
     "ListOrdersOrdersEdgesNode",
     "ListOrdersOrdersEdgesNodeBillingAddress",
     "ListOrdersOrdersEdgesNodeBillingAddressCountry",
+    "ListOrdersOrdersEdgesNodeChannel",
     "ListOrdersOrdersEdgesNodeLines",
     "ListOrdersOrdersEdgesNodeLinesUnitPrice",
     "ListOrdersOrdersEdgesNodeLinesUnitPriceGross",
@@ -859,6 +891,10 @@ __all__ = [
     "OrderStatusFilter",
     "OrderUpdateInput",
     "OrderUpdateShippingInput",
+    "OrdersTotal",
+    "OrdersTotalOrdersTotal",
+    "OrdersTotalOrdersTotalGross",
+    "OrdersTotalOrdersTotalNet",
     "PageCreateInput",
     "PageErrorCode",
     "PageFilterInput",
@@ -967,6 +1003,15 @@ __all__ = [
     "PromotionWhereInput",
     "PublishableChannelListingInput",
     "ReorderInput",
+    "ReportProductSales",
+    "ReportProductSalesReportProductSales",
+    "ReportProductSalesReportProductSalesEdges",
+    "ReportProductSalesReportProductSalesEdgesNode",
+    "ReportProductSalesReportProductSalesEdgesNodeProduct",
+    "ReportProductSalesReportProductSalesEdgesNodeRevenue",
+    "ReportProductSalesReportProductSalesEdgesNodeRevenueGross",
+    "ReportProductSalesReportProductSalesEdgesNodeRevenueNet",
+    "ReportProductSalesReportProductSalesPageInfo",
     "ReportingPeriod",
     "RewardTypeEnum",
     "RewardValueTypeEnum",
@@ -1056,6 +1101,9 @@ __all__ = [
     "Upload",
     "UploadErrorCode",
     "UserCreateInput",
+    "UserPermissions",
+    "UserPermissionsMe",
+    "UserPermissionsMeUserPermissions",
     "UserSortField",
     "UserSortingInput",
     "VariantAttributeScope",
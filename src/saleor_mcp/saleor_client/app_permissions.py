@@ -0,0 +1,23 @@
+# Generated by ariadne-codegen
+# Source: src/saleor_mcp/graphql
+
+from typing import List, Optional
+
+from .base_model import BaseModel
+from .enums import PermissionEnum
+
+
+class AppPermissions(BaseModel):
+    app: Optional["AppPermissionsApp"]
+
+
+class AppPermissionsApp(BaseModel):
+    permissions: Optional[List["AppPermissionsAppPermissions"]]
+
+
+class AppPermissionsAppPermissions(BaseModel):
+    code: PermissionEnum
+
+
+AppPermissions.model_rebuild()
+AppPermissionsApp.model_rebuild()
@@ -3,9 +3,11 @@
 
 from typing import Any, Dict, Optional, Union
 
+from .app_permissions import AppPermissions
 from .async_base_client import AsyncBaseClient
 from .base_model import UNSET, UnsetType
 from .count_orders import CountOrders
+from .enums import ReportingPeriod
 from .input_types import (
     CustomerFilterInput,
     OrderFilterInput,
@@ -20,6 +22,9 @@ from .list_customers import ListCustomers
 from .list_orders import ListOrders
 from .list_products import ListProducts
 from .list_stocks import ListStocks
+from .orders_total import OrdersTotal
+from .report_product_sales import ReportProductSales
+from .user_permissions import UserPermissions
 from .warehouse_details import WarehouseDetails
 
 
@@ -28,6 +33,25 @@ def gql(q: str) -> str:
 
 
 class Client(AsyncBaseClient):
+    async def app_permissions(self, **kwargs: Any) -> AppPermissions:
+        query = gql(
+            """
+            query AppPermissions {
+              app {
+                permissions {
+                  code
+                }
+              }
+            }
+            """
+        )
+        variables: Dict[str, object] = {}
+        response = await self.execute(
+            query=query, operation_name="AppPermissions", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return AppPermissions.model_validate(data)
+
     async def count_orders(
         self,
         filter: Union[Optional[OrderFilterInput], UnsetType] = UNSET,
@@ -83,11 +107,12 @@ class Client(AsyncBaseClient):
         after: Union[Optional[str], UnsetType] = UNSET,
         sortBy: Union[Optional[UserSortingInput], UnsetType] = UNSET,
         filter: Union[Optional[CustomerFilterInput], UnsetType] = UNSET,
+        withTotal: Union[Optional[bool], UnsetType] = UNSET,
         **kwargs: Any
     ) -> ListCustomers:
         query = gql(
             """
-            query ListCustomers($first: Int, $after: String, $sortBy: UserSortingInput, $filter: CustomerFilterInput) {
+            query ListCustomers($first: Int, $after: String, $sortBy: UserSortingInput, $filter: CustomerFilterInput, $withTotal: Boolean = false) {
               customers(first: $first, after: $after, sortBy: $sortBy, filter: $filter) {
                 pageInfo {
                   hasNextPage
@@ -95,7 +120,7 @@ class Client(AsyncBaseClient):
                   startCursor
                   endCursor
                 }
-                totalCount
+                totalCount @include(if: $withTotal)
                 edges {
                   node {
                     id
@@ -124,6 +149,7 @@ class Client(AsyncBaseClient):
             "after": after,
             "sortBy": sortBy,
             "filter": filter,
+            "withTotal": withTotal,
         }
         response = await self.execute(
             query=query, operation_name="ListCustomers", variables=variables, **kwargs
@@ -137,11 +163,12 @@ class Client(AsyncBaseClient):
         after: Union[Optional[str], UnsetType] = UNSET,
         sortBy: Union[Optional[OrderSortingInput], UnsetType] = UNSET,
         filter: Union[Optional[OrderFilterInput], UnsetType] = UNSET,
+        withTotal: Union[Optional[bool], UnsetType] = UNSET,
         **kwargs: Any
     ) -> ListOrders:
         query = gql(
             """
-            query ListOrders($first: Int, $after: String, $sortBy: OrderSortingInput, $filter: OrderFilterInput) {
+            query ListOrders($first: Int, $after: String, $sortBy: OrderSortingInput, $filter: OrderFilterInput, $withTotal: Boolean = false) {
               orders(first: $first, after: $after, sortBy: $sortBy, filter: $filter) {
                 pageInfo {
                   hasNextPage
@@ -149,7 +176,7 @@ class Client(AsyncBaseClient):
                   startCursor
                   endCursor
                 }
-                totalCount
+                totalCount @include(if: $withTotal)
                 edges {
                   node {
                     id
@@ -158,6 +185,9 @@ class Client(AsyncBaseClient):
                     created
                     updatedAt
                     paymentStatus
+                    channel {
+                      slug
+                    }
                     total {
                       gross {
                         amount
@@ -202,6 +232,7 @@ class Client(AsyncBaseClient):
             "after": after,
             "sortBy": sortBy,
             "filter": filter,
+            "withTotal": withTotal,
         }
         response = await self.execute(
             query=query, operation_name="ListOrders", variables=variables, **kwargs
@@ -217,11 +248,12 @@ class Client(AsyncBaseClient):
         where: Union[Optional[ProductWhereInput], UnsetType] = UNSET,
         sortBy: Union[Optional[ProductOrder], UnsetType] = UNSET,
         search: Union[Optional[str], UnsetType] = UNSET,
+        withTotal: Union[Optional[bool], UnsetType] = UNSET,
         **kwargs: Any
     ) -> ListProducts:
         query = gql(
             """
-            query ListProducts($first: Int, $after: String, $channel: String, $where: ProductWhereInput, $sortBy: ProductOrder, $search: String) {
+            query ListProducts($first: Int, $after: String, $channel: String, $where: ProductWhereInput, $sortBy: ProductOrder, $search: String, $withTotal: Boolean = false) {
               products(
                 first: $first
                 after: $after
@@ -236,7 +268,7 @@ class Client(AsyncBaseClient):
                   startCursor
                   endCursor
                 }
-                totalCount
+                totalCount @include(if: $withTotal)
                 edges {
                   node {
                     id
@@ -297,6 +329,7 @@ class Client(AsyncBaseClient):
             "where": where,
             "sortBy": sortBy,
             "search": search,
+            "withTotal": withTotal,
         }
         response = await self.execute(
             query=query, operation_name="ListProducts", variables=variables, **kwargs
@@ -309,11 +342,12 @@ class Client(AsyncBaseClient):
         first: Union[Optional[int], UnsetType] = UNSET,
         after: Union[Optional[str], UnsetType] = UNSET,
         filter: Union[Optional[StockFilterInput], UnsetType] = UNSET,
+        withTotal: Union[Optional[bool], UnsetType] = UNSET,
         **kwargs: Any
     ) -> ListStocks:
         query = gql(
             """
-            query ListStocks($first: Int, $after: String, $filter: StockFilterInput) {
+            query ListStocks($first: Int, $after: String, $filter: StockFilterInput, $withTotal: Boolean = false) {
               stocks(first: $first, after: $after, filter: $filter) {
                 pageInfo {
                   hasNextPage
@@ -321,7 +355,7 @@ class Client(AsyncBaseClient):
                   startCursor
                   endCursor
                 }
-                totalCount
+                totalCount @include(if: $withTotal)
                 edges {
                   node {
                     id
@@ -348,6 +382,7 @@ class Client(AsyncBaseClient):
             "first": first,
             "after": after,
             "filter": filter,
+            "withTotal": withTotal,
         }
         response = await self.execute(
             query=query, operation_name="ListStocks", variables=variables, **kwargs
@@ -355,6 +390,119 @@ class Client(AsyncBaseClient):
         data = self.get_data(response)
         return ListStocks.model_validate(data)
 
+    async def orders_total(
+        self,
+        period: Union[Optional[ReportingPeriod], UnsetType] = UNSET,
+        channel: Union[Optional[str], UnsetType] = UNSET,
+        **kwargs: Any
+    ) -> OrdersTotal:
+        query = gql(
+            """
+            query OrdersTotal($period: ReportingPeriod, $channel: String) {
+              ordersTotal(period: $period, channel: $channel) {
+                currency
+                gross {
+                  amount
+                  currency
+                }
+                net {
+                  amount
+                  currency
+                }
+              }
+            }
+            """
+        )
+        variables: Dict[str, object] = {"period": period, "channel": channel}
+        response = await self.execute(
+            query=query, operation_name="OrdersTotal", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return OrdersTotal.model_validate(data)
+
+    async def report_product_sales(
+        self,
+        period: ReportingPeriod,
+        channel: str,
+        first: Union[Optional[int], UnsetType] = UNSET,
+        after: Union[Optional[str], UnsetType] = UNSET,
+        **kwargs: Any
+    ) -> ReportProductSales:
+        query = gql(
+            """
+            query ReportProductSales($period: ReportingPeriod!, $channel: String!, $first: Int, $after: String) {
+              reportProductSales(
+                period: $period
+                channel: $channel
+                first: $first
+                after: $after
+              ) {
+                pageInfo {
+                  hasNextPage
+                  hasPreviousPage
+                  startCursor
+                  endCursor
+                }
+                edges {
+                  node {
+                    id
+                    name
+                    sku
+                    product {
+                      id
+                      name
+                    }
+                    quantityOrdered
+                    revenue(period: $period) {
+                      gross {
+                        amount
+                        currency
+                      }
+                      net {
+                        amount
+                        currency
+                      }
+                    }
+                  }
+                }
+              }
+            }
+            """
+        )
+        variables: Dict[str, object] = {
+            "period": period,
+            "channel": channel,
+            "first": first,
+            "after": after,
+        }
+        response = await self.execute(
+            query=query,
+            operation_name="ReportProductSales",
+            variables=variables,
+            **kwargs
+        )
+        data = self.get_data(response)
+        return ReportProductSales.model_validate(data)
+
+    async def user_permissions(self, **kwargs: Any) -> UserPermissions:
+        query = gql(
+            """
+            query UserPermissions {
+              me {
+                userPermissions {
+                  code
+                }
+              }
+            }
+            """
+        )
+        variables: Dict[str, object] = {}
+        response = await self.execute(
+            query=query, operation_name="UserPermissions", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return UserPermissions.model_validate(data)
+
     async def warehouse_details(
         self, id: Union[Optional[str], UnsetType] = UNSET, **kwargs: Any
     ) -> WarehouseDetails:
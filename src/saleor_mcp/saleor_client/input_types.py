@@ -1,5 +1,5 @@
 # Generated by ariadne-codegen
-# Source: ./schema.graphql
+# Source: src/saleor_mcp/schema.graphql
 
 from typing import Any, List, Optional
 
@@ -13,7 +13,7 @@ class ListCustomers(BaseModel):
 
 class ListCustomersCustomers(BaseModel):
     pageInfo: "ListCustomersCustomersPageInfo"
-    totalCount: Optional[int]
+    totalCount: Optional[int] = None
     edges: List["ListCustomersCustomersEdges"]
 
 
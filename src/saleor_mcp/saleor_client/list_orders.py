@@ -13,7 +13,7 @@ class ListOrders(BaseModel):
 
 class ListOrdersOrders(BaseModel):
     pageInfo: "ListOrdersOrdersPageInfo"
-    totalCount: Optional[int]
+    totalCount: Optional[int] = None
     edges: List["ListOrdersOrdersEdges"]
 
 
@@ -35,12 +35,17 @@ class ListOrdersOrdersEdgesNode(BaseModel):
     created: Any
     updatedAt: Any
     paymentStatus: PaymentChargeStatusEnum
+    channel: "ListOrdersOrdersEdgesNodeChannel"
     total: "ListOrdersOrdersEdgesNodeTotal"
     lines: List["ListOrdersOrdersEdgesNodeLines"]
     shippingAddress: Optional["ListOrdersOrdersEdgesNodeShippingAddress"]
     billingAddress: Optional["ListOrdersOrdersEdgesNodeBillingAddress"]
 
 
+class ListOrdersOrdersEdgesNodeChannel(BaseModel):
+    slug: str
+
+
 class ListOrdersOrdersEdgesNodeTotal(BaseModel):
     gross: "ListOrdersOrdersEdgesNodeTotalGross"
 
@@ -12,7 +12,7 @@ class ListProducts(BaseModel):
 
 class ListProductsProducts(BaseModel):
     pageInfo: "ListProductsProductsPageInfo"
-    totalCount: Optional[int]
+    totalCount: Optional[int] = None
     edges: List["ListProductsProductsEdges"]
 
 
@@ -12,7 +12,7 @@ class ListStocks(BaseModel):
 
 class ListStocksStocks(BaseModel):
     pageInfo: "ListStocksStocksPageInfo"
-    totalCount: Optional[int]
+    totalCount: Optional[int] = None
     edges: List["ListStocksStocksEdges"]
 
 
@@ -0,0 +1,30 @@
+# Generated by ariadne-codegen
+# Source: src/saleor_mcp/graphql
+
+from typing import Optional
+
+from .base_model import BaseModel
+
+
+class OrdersTotal(BaseModel):
+    ordersTotal: Optional["OrdersTotalOrdersTotal"]
+
+
+class OrdersTotalOrdersTotal(BaseModel):
+    currency: str
+    gross: "OrdersTotalOrdersTotalGross"
+    net: "OrdersTotalOrdersTotalNet"
+
+
+class OrdersTotalOrdersTotalGross(BaseModel):
+    amount: float
+    currency: str
+
+
+class OrdersTotalOrdersTotalNet(BaseModel):
+    amount: float
+    currency: str
+
+
+OrdersTotal.model_rebuild()
+OrdersTotalOrdersTotal.model_rebuild()
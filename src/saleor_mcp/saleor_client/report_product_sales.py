@@ -0,0 +1,62 @@
+# Generated by ariadne-codegen
+# Source: src/saleor_mcp/graphql
+
+from typing import List, Optional
+
+from .base_model import BaseModel
+
+
+class ReportProductSales(BaseModel):
+    reportProductSales: Optional["ReportProductSalesReportProductSales"]
+
+
+class ReportProductSalesReportProductSales(BaseModel):
+    pageInfo: "ReportProductSalesReportProductSalesPageInfo"
+    edges: List["ReportProductSalesReportProductSalesEdges"]
+
+
+class ReportProductSalesReportProductSalesPageInfo(BaseModel):
+    hasNextPage: bool
+    hasPreviousPage: bool
+    startCursor: Optional[str]
+    endCursor: Optional[str]
+
+
+class ReportProductSalesReportProductSalesEdges(BaseModel):
+    node: "ReportProductSalesReportProductSalesEdgesNode"
+
+
+class ReportProductSalesReportProductSalesEdgesNode(BaseModel):
+    id: str
+    name: str
+    sku: Optional[str]
+    product: "ReportProductSalesReportProductSalesEdgesNodeProduct"
+    quantityOrdered: Optional[int]
+    revenue: Optional["ReportProductSalesReportProductSalesEdgesNodeRevenue"]
+
+
+class ReportProductSalesReportProductSalesEdgesNodeProduct(BaseModel):
+    id: str
+    name: str
+
+
+class ReportProductSalesReportProductSalesEdgesNodeRevenue(BaseModel):
+    gross: "ReportProductSalesReportProductSalesEdgesNodeRevenueGross"
+    net: "ReportProductSalesReportProductSalesEdgesNodeRevenueNet"
+
+
+class ReportProductSalesReportProductSalesEdgesNodeRevenueGross(BaseModel):
+    amount: float
+    currency: str
+
+
+class ReportProductSalesReportProductSalesEdgesNodeRevenueNet(BaseModel):
+    amount: float
+    currency: str
+
+
+ReportProductSales.model_rebuild()
+ReportProductSalesReportProductSales.model_rebuild()
+ReportProductSalesReportProductSalesEdges.model_rebuild()
+ReportProductSalesReportProductSalesEdgesNode.model_rebuild()
+ReportProductSalesReportProductSalesEdgesNodeRevenue.model_rebuild()
@@ -0,0 +1,23 @@
+# Generated by ariadne-codegen
+# Source: src/saleor_mcp/graphql
+
+from typing import List, Optional
+
+from .base_model import BaseModel
+from .enums import PermissionEnum
+
+
+class UserPermissions(BaseModel):
+    me: Optional["UserPermissionsMe"]
+
+
+class UserPermissionsMe(BaseModel):
+    userPermissions: Optional[List["UserPermissionsMeUserPermissions"]]
+
+
+class UserPermissionsMeUserPermissions(BaseModel):
+    code: PermissionEnum
+
+
+UserPermissions.model_rebuild()
+UserPermissionsMe.model_rebuild()
@@ -0,0 +1,221 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
+
+from .batch import MAX_PAGE_SIZE
+from .client import SaleorClient
+from .config import get_env_int
+from .sorting import CREATED_ASC
+
+
+@dataclass(frozen=True, order=True)
+class Shard:
+    """Range of days of order creation, with the number of orders created in it."""
+
+    gte: date
+    lte: date
+    count: int = 0
+
+    def filter(self, filter: dict[str, Any] | None) -> dict[str, Any]:
+        """Return the filter limited to orders created in the shard."""
+        return created_between(filter, self.gte, self.lte)
+
+
+def created_between(
+    filter: dict[str, Any] | None, gte: date, lte: date
+) -> dict[str, Any]:
+    """Return the filter limited to orders created between the days."""
+    return {
+        **(filter or {}),
+        "created": {"gte": gte.isoformat(), "lte": lte.isoformat()},
+    }
+
+
+def split_range(gte: date, lte: date, parts: int) -> list[tuple[date, date]]:
+    """Split a range of days into at most `parts` consecutive, non-empty ranges."""
+    days = (lte - gte).days + 1
+    parts = max(1, min(parts, days))
+    bounds = [gte + timedelta(days=days * part // parts) for part in range(parts + 1)]
+    return [
+        (start, end - timedelta(days=1))
+        for start, end in zip(bounds, bounds[1:], strict=False)
+    ]
+
+
+class OrderScanner:
+    """Go through all orders matching a filter in concurrently fetched shards.
+
+    Cursor pagination of a single query is sequential, so orders are split into
+    shards by the day they were created on. The range of days is split until every
+    shard has at most `shard_size` orders, counted with `CountOrders` aliased for
+    all ranges of days at once, and up to `max_concurrency` shards are paginated
+    at the same time.
+
+    Shards are returned in order of their days, with orders of a shard sorted by
+    creation date, so results don't depend on which shard is fetched first. Orders
+    returned by more than one page are only returned once.
+    """
+
+    def __init__(
+        self, shard_size: int = 5000, max_concurrency: int = 4, max_shards: int = 1000
+    ) -> None:
+        self.shard_size = shard_size
+        self.max_concurrency = max_concurrency
+        self.max_shards = max_shards
+
+    async def shards(
+        self, client: SaleorClient, filter: dict[str, Any] | None
+    ) -> list[Shard]:
+        """Return the shards of orders matching the filter, skipping empty ones."""
+        bounds = await self._bounds(client, filter)
+        if bounds is None:
+            return []
+        ranges = split_range(*bounds, self.max_concurrency * 2)
+        shards: list[Shard] = []
+        while ranges:
+            counts = await client.count_orders_batch(
+                [created_between(filter, gte, lte) for gte, lte in ranges],
+                self.max_concurrency,
+            )
+            to_split = []
+            for (gte, lte), count in zip(ranges, counts, strict=True):
+                if count > self.shard_size and gte < lte:
+                    to_split.append(Shard(gte, lte, count))
+                elif count:
+                    shards.append(Shard(gte, lte, count))
+            if len(shards) + 2 * len(to_split) > self.max_shards:
+                # Shards are still big, but there are enough of them already.
+                shards.extend(to_split)
+                to_split = []
+            ranges = [
+                part
+                for shard in to_split
+                for part in split_range(shard.gte, shard.lte, 2)
+            ]
+        return sorted(shards)
+
+    async def scan(
+        self,
+        client: SaleorClient,
+        filter: dict[str, Any] | None,
+        fields: list[str] | None = None,
+        shards: list[Shard] | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Yield pages of orders matching the filter, selecting the given fields.
+
+        Shards are fetched ahead, while the caller goes through orders of earlier
+        ones, but never more than `max_concurrency` of them at once, and a shard
+        fetched ahead waits for the caller once it has a page ready. Memory taken
+        by a scan doesn't grow with the number of orders, except for the IDs of
+        orders of the current shard, used to skip orders returned by more than
+        one page. Shards cover separate days, so their orders never overlap.
+        """
+        if shards is None:
+            shards = await self.shards(client, filter)
+        # IDs are needed to skip orders seen before.
+        fields = [*fields, "id"] if fields else None
+        pending = iter(shards)
+        fetching: deque[tuple[asyncio.Queue[Any], asyncio.Future[None]]] = deque()
+
+        def fetch_next() -> None:
+            shard = next(pending, None)
+            if shard is not None:
+                queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=1)
+                task = asyncio.ensure_future(
+                    self._fetch(client, shard.filter(filter), fields, page_size, queue)
+                )
+                fetching.append((queue, task))
+
+        for _ in range(self.max_concurrency):
+            fetch_next()
+        try:
+            while fetching:
+                queue, _ = fetching[0]
+                seen: set[str] = set()
+                while (orders := await queue.get()) is not _DONE:
+                    if isinstance(orders, Exception):
+                        raise orders
+                    new_orders = []
+                    for order in orders:
+                        if order["id"] not in seen:
+                            seen.add(order["id"])
+                            new_orders.append(order)
+                    if new_orders:
+                        yield new_orders
+                fetching.popleft()
+                fetch_next()
+        finally:
+            tasks = [task for _, task in fetching]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _bounds(
+        self, client: SaleorClient, filter: dict[str, Any] | None
+    ) -> tuple[date, date] | None:
+        created = (filter or {}).get("created") or {}
+        gte = created.get("gte")
+        lte = created.get("lte")
+        if gte is None:
+            # Start at the day the oldest matching order was created.
+            data = await client.list_orders(
+                first=1, filter=filter, sortBy=CREATED_ASC, fields=["created"]
+            )
+            edges = data.orders.edges if data.orders else []
+            if not edges:
+                return None
+            gte = edges[0].node.created[:10]
+        if lte is None:
+            # A day later, in case the time zone of Saleor is ahead of UTC.
+            lte = datetime.now(UTC).date() + timedelta(days=1)
+        gte, lte = _to_date(gte), _to_date(lte)
+        return (gte, lte) if gte <= lte else None
+
+    async def _fetch(
+        self,
+        client: SaleorClient,
+        filter: dict[str, Any],
+        fields: list[str] | None,
+        page_size: int,
+        queue: asyncio.Queue[Any],
+    ) -> None:
+        # Errors are passed to the caller with the pages, in order.
+        try:
+            async for connection in client.iter_pages(
+                "ListOrders", fields, page_size, filter=filter, sortBy=CREATED_ASC
+            ):
+                await queue.put(
+                    [edge["node"] for edge in connection.get("edges") or []]
+                )
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_DONE)
+
+
+def limit_shards(shards: list[Shard], count: int) -> list[Shard]:
+    """Return the first shards, enough to have at least `count` orders."""
+    limited = []
+    for shard in shards:
+        if count <= 0:
+            break
+        limited.append(shard)
+        count -= shard.count
+    return limited
+
+
+_DONE = object()
+
+
+def _to_date(value: Any) -> date:
+    return date.fromisoformat(str(value)[:10])
+
+
+order_scanner = OrderScanner(
+    shard_size=get_env_int("SCAN_SHARD_SIZE", 5000),
+    max_concurrency=get_env_int("SCAN_MAX_CONCURRENCY", 4),
+)
@@ -0,0 +1,44 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class SingleFlight:
+    """Share a single in-flight call between concurrent callers with the same key.
+
+    The first caller for a key starts the call; callers arriving before it finishes
+    await the same task and get its result or exception. Cancelling a waiting
+    caller doesn't cancel the shared call, so the other callers are not affected.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self._counters = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self._counters["calls"] += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self._counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        """Return counters describing how many calls were shared."""
+        return {**self._counters, "in_flight": len(self._calls)}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,8 @@
+# Sorting inputs shared by operations walking through all pages of a connection.
+
+# Oldest objects first, e.g. for scans of orders going through them in order.
+CREATED_ASC = {"field": "CREATED_AT", "direction": "ASC"}
+
+# Least recently updated objects first, so the time of the last update of the
+# objects fetched so far is a watermark of changes, e.g. for syncs and polls.
+LAST_MODIFIED_ASC = {"field": "LAST_MODIFIED_AT", "direction": "ASC"}
@@ -0,0 +1,157 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from fastmcp import Client as MCPClient
+from fastmcp.exceptions import ToolError
+
+from saleor_mcp.aggregates import OrderAggregator, date_buckets
+from saleor_mcp.main import mcp
+
+
+def make_order(created, amount, currency="USD", status="UNFULFILLED", country="US"):
+    return {
+        "created": created,
+        "status": status,
+        "channel": {"slug": "default-channel"},
+        "shippingAddress": {"country": {"code": country}} if country else None,
+        "billingAddress": None,
+        "total": {"gross": {"amount": amount, "currency": currency}},
+    }
+
+
+def test_aggregator_groups_orders_by_currency_too():
+    """Test that orders in different currencies are never summed up together."""
+    aggregator = OrderAggregator(["day"])
+    aggregator.add(make_order("2025-01-02T10:00:00+00:00", 10.1))
+    aggregator.add(make_order("2025-01-02T12:00:00+00:00", 0.2))
+    aggregator.add(make_order("2025-01-02T12:00:00+00:00", 5, currency="EUR"))
+    aggregator.add(make_order("2025-01-01T12:00:00+00:00", 7))
+
+    assert aggregator.orders == 4
+    assert aggregator.groups() == [
+        {"day": "2025-01-01", "currency": "USD", "count": 1, "total": 7.0},
+        {"day": "2025-01-02", "currency": "EUR", "count": 1, "total": 5.0},
+        {"day": "2025-01-02", "currency": "USD", "count": 2, "total": 10.3},
+    ]
+
+
+def test_aggregator_puts_orders_without_value_last():
+    """Test that groups of orders without a value of a key come last."""
+    aggregator = OrderAggregator(["country", "status"])
+    aggregator.add(make_order("2025-01-01T10:00:00+00:00", 1, country=None))
+    aggregator.add(make_order("2025-01-01T10:00:00+00:00", 2, country="PL"))
+    aggregator.add(make_order("2025-01-01T10:00:00+00:00", 3, status="FULFILLED"))
+
+    assert [(group["country"], group["status"]) for group in aggregator.groups()] == [
+        ("PL", "UNFULFILLED"),
+        ("US", "FULFILLED"),
+        (None, "UNFULFILLED"),
+    ]
+
+
+def test_aggregator_fields():
+    """Test that only fields needed by the grouping keys are fetched."""
+    assert OrderAggregator(["month", "channel"]).fields == [
+        "total.gross.amount",
+        "total.gross.currency",
+        "created",
+        "channel.slug",
+    ]
+
+
+def test_date_buckets_follow_calendar():
+    """Test that date buckets follow calendar days and months."""
+    gte, lte = date(2025, 1, 30), date(2025, 3, 4)
+
+    assert date_buckets(gte, gte + timedelta(days=2), "day") == [
+        (date(2025, 1, 30), date(2025, 1, 30)),
+        (date(2025, 1, 31), date(2025, 1, 31)),
+        (date(2025, 2, 1), date(2025, 2, 1)),
+    ]
+    assert date_buckets(gte, date(2025, 2, 10), "week") == [
+        (date(2025, 1, 30), date(2025, 2, 2)),
+        (date(2025, 2, 3), date(2025, 2, 9)),
+        (date(2025, 2, 10), date(2025, 2, 10)),
+    ]
+    assert date_buckets(gte, lte, "month") == [
+        (date(2025, 1, 30), date(2025, 1, 31)),
+        (date(2025, 2, 1), date(2025, 2, 28)),
+        (date(2025, 3, 1), date(2025, 3, 4)),
+    ]
+
+
+def test_date_buckets_are_limited():
+    """Test that too many date buckets are rejected."""
+    with pytest.raises(ToolError):
+        date_buckets(date(2020, 1, 1), date(2025, 1, 1), "day")
+
+
+ORDERS = [
+    {
+        **make_order(f"2025-01-0{day}T10:00:00+00:00", 10, status=status),
+        "id": f"T3JkZXI6{number}",
+    }
+    for number, (day, status) in enumerate(
+        ((1, "FULFILLED"), (1, "UNFULFILLED"), (2, "FULFILLED"))
+    )
+]
+
+
+@pytest.mark.asyncio
+async def test_order_aggregates_walks_all_pages(orders_api):
+    """Test order aggregates over all pages of matching orders."""
+    orders_api.orders = ORDERS
+    with patch("saleor_mcp.tools.orders.MAX_PAGE_SIZE", 2):
+        async with MCPClient(mcp) as client:
+            result = await client.call_tool(
+                "order_aggregates",
+                {"group_by": ["status"], "filter": {"search": "hoodie"}},
+            )
+
+    assert result.structured_content == {
+        "data": {
+            "groups": [
+                {"status": "FULFILLED", "currency": "USD", "count": 2, "total": 20.0},
+                {"status": "UNFULFILLED", "currency": "USD", "count": 1, "total": 10.0},
+            ],
+            "totalOrders": 3,
+            "truncated": False,
+        }
+    }
+    pages = [
+        request for request in orders_api.requests if request["variables"].get("after")
+    ]
+    assert len(pages) == 1
+    assert all(
+        filter["search"] == "hoodie"
+        for request in orders_api.requests
+        for name, filter in request["variables"].items()
+        if name.startswith("filter")
+    )
+    assert "lines" not in pages[0]["query"]
+
+
+@pytest.mark.asyncio
+async def test_order_aggregates_stops_at_max_orders(orders_api):
+    """Test order aggregates truncated at `max_orders`."""
+    orders_api.orders = ORDERS
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool("order_aggregates", {"max_orders": 2})
+
+    assert result.structured_content["data"] == {
+        "groups": [{"day": "2025-01-01", "currency": "USD", "count": 2, "total": 20.0}],
+        "totalOrders": 2,
+        "truncated": True,
+    }
+    assert orders_api.requests[-1]["variables"]["first"] == 2
+
+
+@pytest.mark.asyncio
+async def test_order_aggregates_rejects_max_orders_below_one(orders_api):
+    """Test that at least one order has to be aggregated."""
+    async with MCPClient(mcp) as client:
+        with pytest.raises(ToolError):
+            await client.call_tool("order_aggregates", {"max_orders": 0})
+
+    assert not orders_api.requests
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from saleor_mcp.batch import BatchFetcher, chunked, gather_bounded
+
+
+def test_chunked():
+    """Test splitting items into chunks of a size."""
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    assert chunked([], 2) == []
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_limits_concurrency_and_keeps_order():
+    """Test bounded gathering limits concurrency and keeps the order of results."""
+    running = 0
+    max_running = 0
+
+    async def call(value):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (5 - value))
+        running -= 1
+        return value
+
+    results = await gather_bounded(
+        (lambda value=value: call(value) for value in range(5)), limit=2
+    )
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_cancels_other_calls_on_failure():
+    """Test bounded gathering cancels other calls when one fails."""
+    cancelled = []
+
+    async def fail():
+        raise ValueError("Upstream failed")
+
+    async def wait():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(ValueError, match="Upstream failed"):
+        await gather_bounded([wait, fail, wait], limit=3)
+
+    assert cancelled == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_batch_fetcher_fetches_unique_ids_in_chunks():
+    """Test batch fetcher fetches unique IDs in chunks."""
+    chunks = []
+
+    async def fetch_page(ids):
+        chunks.append(ids)
+        # Saleor returns objects in its own order and skips unknown IDs.
+        return [{"node": {"id": id}} for id in reversed(ids) if id != "missing"]
+
+    fetcher = BatchFetcher(max_ids=10, chunk_size=2, max_concurrency=2)
+    edges = await fetcher.fetch(["a", "b", "a", "missing", "c"], fetch_page)
+
+    assert chunks == [["a", "b"], ["missing", "c"]]
+    assert edges == {id: {"node": {"id": id}} for id in ("b", "a", "c")}
+
+
+@pytest.mark.asyncio
+async def test_batch_fetcher_limits_number_of_ids():
+    """Test batch fetcher rejects too many IDs."""
+
+    async def fetch_page(ids):
+        return []
+
+    fetcher = BatchFetcher(max_ids=2)
+
+    with pytest.raises(ToolError, match="Up to 2 IDs"):
+        await fetcher.fetch(["a", "b", "c"], fetch_page)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from saleor_mcp.cache import ResponseCache, cache_key, cache_key_prefix
+from saleor_mcp.cache_backends import MemoryCacheBackend
+from saleor_mcp.deadline import deadline_scope, remaining
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+class BrokenBackend(MemoryCacheBackend):
+    async def get(self, key):
+        raise ConnectionError("Cache is down")
+
+    async def set(self, key, entry):
+        raise ConnectionError("Cache is down")
+
+
+def test_keys_of_an_operation_share_a_prefix():
+    """Test cache keys of an operation and API URL share a prefix."""
+    key = cache_key(API_URL, "ListChannels", "abc")
+
+    assert key.startswith(cache_key_prefix(API_URL, "ListChannels"))
+    assert key.startswith(cache_key_prefix(API_URL.rstrip("/"), "ListChannels"))
+    assert not key.startswith(cache_key_prefix(API_URL, "ListChannel"))
+    assert not key.startswith(cache_key_prefix("https://b.saleor.cloud/", "List"))
+
+
+@pytest.mark.asyncio
+async def test_entry_is_fresh_then_stale_then_expired(clock):
+    """Test cache entries go from fresh to stale to expired."""
+    cache = ResponseCache(ttls={"ListChannels": 10}, stale_ttl=5, clock=clock)
+    await cache.set("key", b"{}", "ListChannels")
+
+    clock.now = 9
+    entry = await cache.get("key")
+    assert entry is not None
+    assert cache.is_fresh(entry)
+
+    clock.now = 12
+    entry = await cache.get("key")
+    assert entry is not None
+    assert not cache.is_fresh(entry)
+
+    clock.now = 15
+    assert await cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_operations_without_ttl_are_not_cached():
+    """Test responses of operations without a TTL aren't cached."""
+    cache = ResponseCache(ttls={"ListChannels": 10, "WarehouseDetails": 0})
+
+    await cache.set("a", b"{}", "WarehouseDetails")
+    await cache.set("b", b"{}", "ListOrders")
+
+    assert cache.ttl_for("WarehouseDetails") == 0
+    assert cache.ttl_for("ListChannels") == 10
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate_evicts_operations_of_api_url():
+    """Test invalidation only evicts the given operations of an API URL."""
+    cache = ResponseCache(ttls={"ListChannels": 10, "ListOrders": 10})
+    await cache.set(cache_key(API_URL, "ListChannels", "a"), b"{}", "ListChannels")
+    await cache.set(cache_key(API_URL, "ListChannels", "b"), b"{}", "ListChannels")
+    await cache.set(cache_key(API_URL, "ListOrders", "a"), b"{}", "ListOrders")
+    other_url = "https://b.saleor.cloud/graphql/"
+    await cache.set(cache_key(other_url, "ListChannels", "a"), b"{}", "ListChannels")
+
+    invalidated = await cache.invalidate(API_URL, ["ListChannels"])
+
+    assert invalidated == 2
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_treated_as_misses():
+    """Test errors of the cache backend are treated as misses."""
+    cache = ResponseCache(ttls={"ListChannels": 10}, backend=BrokenBackend())
+
+    await cache.set("key", b"{}", "ListChannels")
+
+    assert await cache.get("key") is None
+    assert cache.stats()["errors"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_once_per_key():
+    """Test a stale entry is refreshed once at a time."""
+    cache = ResponseCache(ttls={"ListChannels": 10})
+    release = asyncio.Event()
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    cache.refresh("key", refresh)
+    cache.refresh("key", refresh)
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.sleep(0)
+
+    assert calls == 1
+    assert cache.stats()["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_outlives_deadline_of_tool_call():
+    """Test refreshes in the background aren't cancelled by the deadline."""
+    cache = ResponseCache(ttls={"ListChannels": 10})
+    deadlines = []
+
+    async def refresh():
+        deadlines.append(remaining())
+
+    async with deadline_scope(0):
+        cache.refresh("key", refresh)
+    await asyncio.sleep(0)
+
+    assert deadlines == [None]
@@ -0,0 +1,278 @@
+import fnmatch
+import sqlite3
+
+import pytest
+import pytest_asyncio
+
+from saleor_mcp.cache import ResponseCache, cache_key
+from saleor_mcp.cache_backends import (
+    PARSED_DATA_FACTOR,
+    CacheEntry,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    create_cache_backend,
+    decode_entry,
+    encode_entry,
+)
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+class FakeRedis:
+    """In-memory stand-in for the subset of the Redis client used by the backend."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values = {}
+
+    async def get(self, key):
+        value, expires_at = self.values.get(key, (None, 0))
+        if value is None or self.clock() >= expires_at:
+            self.values.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key, value, px):
+        self.values[key] = (value, self.clock() + px / 1000)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.values):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def unlink(self, *keys):
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = 1000.0
+    return clock
+
+
+@pytest_asyncio.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, clock, tmp_path):
+    if request.param == "memory":
+        backend = MemoryCacheBackend()
+    elif request.param == "sqlite":
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), clock=clock)
+    else:
+        backend = RedisCacheBackend(FakeRedis(clock), clock=clock)
+    yield backend
+    await backend.aclose()
+
+
+def test_entry_encoding_round_trips():
+    """Test cache entries are decoded as they were encoded."""
+    entry = CacheEntry(value=b'{"data": {}}', fresh_until=10.5, stale_until=20.25)
+
+    assert decode_entry(encode_entry(entry)) == entry
+
+
+@pytest.mark.asyncio
+async def test_backends_share_ttl_semantics(backend, clock):
+    """Test all backends expire entries the same way."""
+    cache = ResponseCache(
+        ttls={"ListChannels": 10}, stale_ttl=5, backend=backend, clock=clock
+    )
+    key = cache_key(API_URL, "ListChannels", "request")
+    await cache.set(key, b'{"data": {}}', "ListChannels")
+
+    clock.now += 9
+    entry = await cache.get(key)
+    assert entry is not None
+    assert entry.value == b'{"data": {}}'
+    assert cache.is_fresh(entry)
+
+    clock.now += 3
+    entry = await cache.get(key)
+    assert entry is not None
+    assert not cache.is_fresh(entry)
+
+    clock.now += 3
+    assert await cache.get(key) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backends_invalidate_by_operation_and_api_url(backend, clock):
+    """Test all backends invalidate entries by operation and API URL."""
+    cache = ResponseCache(
+        ttls={"ListChannels": 10, "ListOrders": 10}, backend=backend, clock=clock
+    )
+    other_url = "https://b.saleor.cloud/graphql/"
+    keys = {
+        "channels-1": cache_key(API_URL, "ListChannels", "token-1"),
+        "channels-2": cache_key(API_URL, "ListChannels", "token-2"),
+        "orders": cache_key(API_URL, "ListOrders", "token-1"),
+        "other": cache_key(other_url, "ListChannels", "token-1"),
+    }
+    for name, key in keys.items():
+        await cache.set(
+            key, b"{}", "ListOrders" if name == "orders" else "ListChannels"
+        )
+
+    assert await cache.invalidate(API_URL.rstrip("/"), ["ListChannels"]) == 2
+
+    assert await cache.get(keys["channels-1"]) is None
+    assert await cache.get(keys["channels-2"]) is None
+    assert await cache.get(keys["orders"]) is not None
+    assert await cache.get(keys["other"]) is not None
+
+
+@pytest.mark.asyncio
+async def test_backends_replace_and_clear_entries(backend, clock):
+    """Test all backends replace and clear entries."""
+    cache = ResponseCache(ttls={"ListChannels": 10}, backend=backend, clock=clock)
+    key = cache_key(API_URL, "ListChannels", "request")
+
+    await cache.set(key, b"1", "ListChannels")
+    await cache.set(key, b"2", "ListChannels")
+    entry = await cache.get(key)
+    assert entry is not None
+    assert entry.value == b"2"
+
+    await cache.clear()
+    assert await cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_is_shared_between_processes(tmp_path, clock):
+    """Test workers share entries of an SQLite cache."""
+    path = str(tmp_path / "cache.db")
+    worker_1 = ResponseCache(
+        ttls={"ListChannels": 10},
+        backend=SQLiteCacheBackend(path, clock=clock),
+        clock=clock,
+    )
+    worker_2 = ResponseCache(
+        ttls={"ListChannels": 10},
+        backend=SQLiteCacheBackend(path, clock=clock),
+        clock=clock,
+    )
+    key = cache_key(API_URL, "ListChannels", "request")
+
+    await worker_1.set(key, b"{}", "ListChannels")
+    assert await worker_2.get(key) is not None
+
+    await worker_2.invalidate(API_URL, ["ListChannels"])
+    assert await worker_1.get(key) is None
+
+    await worker_1.aclose()
+    await worker_2.aclose()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_are_evicted_over_max_bytes(tmp_path, clock):
+    """Test least recently used entries are evicted over `max_bytes`."""
+    for backend in [
+        MemoryCacheBackend(max_bytes=10),
+        SQLiteCacheBackend(str(tmp_path / "cache.db"), max_bytes=10, clock=clock),
+    ]:
+        entry = CacheEntry(value=b"1234", fresh_until=2000, stale_until=2000)
+        await backend.set("a", entry)
+        clock.now += 100
+        await backend.set("b", entry)
+        clock.now += 100
+        await backend.get("a")
+        clock.now += 100
+
+        await backend.set("c", entry)
+        await backend.set("too-large", CacheEntry(b"12345678901", 2000, 2000))
+
+        assert await backend.get("b") is None
+        assert await backend.get("a") is not None
+        assert await backend.get("c") is not None
+        assert await backend.get("too-large") is None
+        assert backend.stats()["bytes"] == 8
+        await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_counts_parsed_data():
+    """Test the memory backend counts parsed data in its size."""
+    backend = MemoryCacheBackend(max_bytes=100)
+    entry = CacheEntry(value=b"[1, 2]", fresh_until=2000, stale_until=2000)
+
+    await backend.set("body", entry)
+    await backend.set(
+        "parsed",
+        CacheEntry(value=b"[1, 2]", fresh_until=2000, stale_until=2000, data=[1, 2]),
+    )
+    assert backend.stats()["bytes"] == 6 + 6 * (1 + PARSED_DATA_FACTOR)
+
+    # Entries whose parsed data wouldn't fit aren't kept.
+    await backend.set(
+        "too-large",
+        CacheEntry(value=b"x" * 20, fresh_until=2000, stale_until=2000, data="x"),
+    )
+    assert await backend.get("too-large") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_hits_only_update_access_time_once_a_minute(tmp_path, clock):
+    """Test SQLite cache hits rarely write to the database."""
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), clock=clock)
+    await backend.set("a", CacheEntry(b"1234", 5000, 5000))
+
+    def accessed_at():
+        return backend._execute("SELECT accessed_at FROM cache")[0][0]
+
+    set_at = accessed_at()
+    clock.now += 30
+    assert await backend.get("a") is not None
+    assert accessed_at() == set_at
+    clock.now += 30
+    assert await backend.get("a") is not None
+    assert accessed_at() == clock.now
+    await backend.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_size_is_kept_up_to_date(tmp_path, clock):
+    """Test that the stored size of the cache follows writes, deletes and expiry."""
+    path = tmp_path / "cache.db"
+    backend = SQLiteCacheBackend(str(path), clock=clock)
+    await backend.set("a:1", CacheEntry(b"1234", 2000, 2000))
+    await backend.set("a:1", CacheEntry(b"12", 2000, 2000))
+    await backend.set("a:2", CacheEntry(b"123", 2000, 1100))
+    await backend.set("b:1", CacheEntry(b"1", 2000, 2000))
+    assert backend.stats() == {"entries": 3, "bytes": 6, "max_bytes": 16777216}
+
+    clock.now += 200
+    await backend.set("b:2", CacheEntry(b"12345", 2000, 2000))
+    await backend.invalidate("b:")
+    assert backend.stats()["entries"] == 1
+    assert backend.stats()["bytes"] == 2
+    await backend.aclose()
+
+    # Databases without the size table are sized when they are opened.
+    connection = sqlite3.connect(path)
+    connection.execute("DROP TABLE cache_size")
+    connection.close()
+    backend = SQLiteCacheBackend(str(path), clock=clock)
+    assert backend.stats()["bytes"] == 2
+    await backend.delete("a:1")
+    assert backend.stats()["entries"] == 0
+    await backend.aclose()
+
+
+def test_backend_is_created_from_url(tmp_path):
+    """Test cache backends are created from URLs."""
+    assert isinstance(create_cache_backend("memory://", 10), MemoryCacheBackend)
+
+    backend = create_cache_backend(f"sqlite:///{tmp_path}/cache.db", 10)
+    assert isinstance(backend, SQLiteCacheBackend)
+    assert backend.path == f"{tmp_path}/cache.db"
+
+    with pytest.raises(ValueError, match="Unsupported cache backend"):
+        create_cache_backend("memcached://localhost", 10)
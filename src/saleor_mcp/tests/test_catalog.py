@@ -0,0 +1,356 @@
+import asyncio
+import json
+import sqlite3
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastmcp import Client as MCPClient
+
+from saleor_mcp import ctx_utils
+from saleor_mcp.catalog import (
+    CatalogMirror,
+    CatalogMirrors,
+    decode_cursor,
+    encode_cursor,
+)
+from saleor_mcp.client import SaleorClient as SaleorMCPClient
+from saleor_mcp.deadline import deadline_scope
+from saleor_mcp.main import mcp
+from saleor_mcp.tools import products as products_tools
+
+
+def make_product(number, name, updated_at="2025-01-01T10:00:00+00:00", skus=()):
+    id = f"UHJvZHVjdDo{number}"
+    return {
+        "id": id,
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "externalReference": None,
+        "productType": {"id": "UHJvZHVjdFR5cGU6MQ==", "name": "Apparel"},
+        "category": {"id": "Q2F0ZWdvcnk6MQ==", "name": "Sweaters"},
+        "productVariants": {
+            "edges": [
+                {"node": {"id": f"{id}-{sku}", "name": sku[-1], "sku": sku}}
+                for sku in skus
+            ]
+        },
+        "defaultVariant": None,
+        "created": "2025-01-01T09:00:00+00:00",
+        "updatedAt": updated_at,
+        "thumbnail": None,
+        "pricing": None,
+    }
+
+
+PRODUCTS = [
+    make_product(1, "Blue Hoodie", skus=("HOODIE-BLUE-S", "HOODIE-BLUE-M")),
+    make_product(2, "Crème Brûlée Candle", "2025-01-02T10:00:00+00:00"),
+    make_product(3, "Red Hoodie", "2025-01-03T10:00:00+00:00"),
+]
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = CatalogMirror(tmp_path / "catalog.sqlite3")
+    yield mirror
+    mirror.close()
+
+
+def test_mirror_searches_products_by_word_prefixes(mirror):
+    """Test mirror search matches beginnings of words."""
+    mirror.upsert(PRODUCTS, sync_id=1)
+
+    def search(query):
+        products, total = mirror.search(query, first=10)
+        assert total == len(products)
+        return [product["name"] for product in products]
+
+    assert sorted(search("hood")) == ["Blue Hoodie", "Red Hoodie"]
+    assert search("blue hood") == ["Blue Hoodie"]
+    assert search("HOODIE-BLUE-M") == ["Blue Hoodie"]
+    assert search("creme brulee") == ["Crème Brûlée Candle"]
+    assert search('sweat" OR *') == []
+    assert search("***") == []
+
+
+def test_mirror_replaces_products(mirror):
+    """Test products synced again replace their old versions."""
+    mirror.upsert(PRODUCTS, sync_id=1)
+    mirror.upsert([make_product(1, "Green Hoodie")], sync_id=2)
+
+    assert mirror.search("blue", first=10) == ([], 0)
+    assert mirror.get(["UHJvZHVjdDo1", "UHJvZHVjdDo1"]) == {
+        "UHJvZHVjdDo1": make_product(1, "Green Hoodie")
+    }
+    assert mirror.state()["variants"] == 0
+
+    assert mirror.remove_unsynced(sync_id=2) == 2
+    assert mirror.state()["products"] == 1
+    assert mirror.search("candle", first=10) == ([], 0)
+
+
+def test_mirror_pages_search_results(mirror):
+    """Test mirror search results are paginated."""
+    mirror.upsert(PRODUCTS, sync_id=1)
+
+    first_page, total = mirror.search("hoodie", first=1)
+    second_page, _ = mirror.search("hoodie", first=1, offset=1)
+
+    assert total == 2
+    assert {first_page[0]["id"], second_page[0]["id"]} == {
+        "UHJvZHVjdDo1",
+        "UHJvZHVjdDo3",
+    }
+
+
+def test_cursors():
+    """Test mirror cursors are told apart from Saleor cursors."""
+    assert decode_cursor(encode_cursor(200)) == 200
+    assert decode_cursor(None) == 0
+    # Cursors returned by Saleor aren't served from the mirror.
+    assert decode_cursor("WyJibHVlLWhvb2RpZSJd") is None
+    assert decode_cursor("not base64!") is None
+
+
+class ProductsAPI:
+    def __init__(self):
+        self.products = list(PRODUCTS)
+        self.requests = []
+        self.user = {"userPermissions": [{"code": "MANAGE_PRODUCTS"}]}
+        self.app = None
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        if body["operationName"] == "UserPermissions":
+            return httpx.Response(200, json={"data": {"me": self.user}})
+        if body["operationName"] == "AppPermissions":
+            return httpx.Response(200, json={"data": {"app": self.app}})
+        self.requests.append(body)
+        variables = body["variables"]
+        gte = ((variables.get("where") or {}).get("updatedAt") or {}).get("range", {})
+        products = [
+            product
+            for product in self.products
+            if product["updatedAt"] >= gte.get("gte", "")
+        ]
+        start = int(variables.get("after") or 0)
+        end = start + variables["first"]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "products": {
+                        "edges": [{"node": node} for node in products[start:end]],
+                        "pageInfo": {
+                            "hasNextPage": end < len(products),
+                            "hasPreviousPage": start > 0,
+                            "startCursor": str(start),
+                            "endCursor": str(end),
+                        },
+                    }
+                }
+            },
+        )
+
+
+@pytest.fixture
+def products_api(serve_saleor_api):
+    api = ProductsAPI()
+    serve_saleor_api(api)
+    return api
+
+
+@pytest_asyncio.fixture
+async def mirrors(tmp_path, monkeypatch):
+    mirrors = CatalogMirrors(tmp_path)
+    monkeypatch.setattr(products_tools, "catalog_mirrors", mirrors)
+    yield mirrors
+    await mirrors.aclose()
+
+
+@pytest.mark.asyncio
+async def test_syncs_are_incremental_after_full_sync(products_api, mirrors):
+    """Test syncs after a full one only fetch updated products."""
+    client = ctx_utils.get_saleor_client()
+    assert (await mirrors.status(client))["ready"] is False
+    await mirrors.sync(client)
+
+    products_api.products[1:] = [
+        make_product(3, "Red Hoodie", "2025-01-04T10:00:00+00:00"),
+        make_product(4, "Yellow Hoodie", "2025-01-05T10:00:00+00:00"),
+    ]
+    await mirrors.sync(client)
+
+    status = await mirrors.status(client)
+    assert status["ready"] is True
+    assert status["products"] == 4
+    assert status["variants"] == 2
+    assert status["watermark"] == "2025-01-05T10:00:00+00:00"
+    full_sync, incremental_sync = products_api.requests
+    assert full_sync["variables"]["where"] is None
+    assert incremental_sync["variables"]["where"] == {
+        "updatedAt": {"range": {"gte": "2025-01-03T10:00:00+00:00"}}
+    }
+    assert full_sync["variables"]["sortBy"] == {
+        "field": "LAST_MODIFIED_AT",
+        "direction": "ASC",
+    }
+
+    # Full syncs remove products deleted in Saleor.
+    await mirrors.sync(client, full=True)
+    assert (await mirrors.status(client))["products"] == 3
+
+
+@pytest.mark.asyncio
+async def test_products_search_is_served_from_mirror(products_api, mirrors):
+    """Test product searches and lookups are served from a synced mirror."""
+    await mirrors.sync(ctx_utils.get_saleor_client())
+    products_api.requests.clear()
+
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool(
+            "products", {"search": "hoodie", "first": 1, "include_total": True}
+        )
+        data = result.structured_content["data"]
+        next_page = await client.call_tool(
+            "products",
+            {"search": "hoodie", "first": 1, "after": data["pageInfo"]["endCursor"]},
+        )
+        by_ids = await client.call_tool(
+            "products_by_ids", {"ids": ["UHJvZHVjdDo3", "UHJvZHVjdDo5"]}
+        )
+
+    assert data["totalCount"] == 2
+    assert data["pageInfo"]["hasNextPage"] is True
+    next_data = next_page.structured_content["data"]
+    assert next_data["pageInfo"]["hasNextPage"] is False
+    assert {
+        data["products"][0]["node"]["name"],
+        next_data["products"][0]["node"]["name"],
+    } == {"Blue Hoodie", "Red Hoodie"}
+    by_ids_data = by_ids.structured_content["data"]
+    assert by_ids_data["products"][0]["node"]["name"] == "Red Hoodie"
+    assert by_ids_data["notFound"] == ["UHJvZHVjdDo5"]
+    # Only the product missing from the mirror is fetched from Saleor.
+    (request,) = products_api.requests
+    assert request["variables"]["where"] == {"ids": ["UHJvZHVjdDo5"]}
+
+
+@pytest.mark.asyncio
+async def test_catalog_sync_status_tool(products_api, mirrors):
+    """Test catalog sync status tool starts a sync and reports its status."""
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool("catalog_sync_status", {"start_sync": "full"})
+        data = result.structured_content["data"]
+        assert data["enabled"] is True
+        assert data["syncStarted"] is True
+
+        for task in list(mirrors._tasks.values()):
+            await task
+        result = await client.call_tool("catalog_sync_status", {})
+
+    data = result.structured_content["data"]
+    assert data["ready"] is True
+    assert data["syncing"] is False
+    assert data["products"] == 3
+    assert data["error"] is None
+    assert data["lastFullSync"] is not None
+
+
+@pytest.mark.asyncio
+async def test_background_sync_outlives_deadline_of_tool_call(products_api, mirrors):
+    """Test syncs in the background aren't cancelled by the deadline."""
+    client = ctx_utils.get_saleor_client()
+    # The key of the mirror is looked up once per token.
+    await mirrors.status(client)
+    async with deadline_scope(0):
+        assert await mirrors.start_sync(client, full=True) is True
+
+    for task in list(mirrors._tasks.values()):
+        await task
+
+    status = await mirrors.status(client)
+    assert status["ready"] is True
+    assert status["error"] is None
+
+
+@pytest.mark.asyncio
+async def test_products_search_does_not_start_first_sync(
+    products_api, mirrors, tmp_path
+):
+    """Test that only an explicit sync creates a mirror, not a product search."""
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool("products", {"search": "hoodie"})
+
+    assert result.structured_content["data"]["products"]
+    (request,) = products_api.requests
+    assert request["operationName"] == "ListProducts"
+    assert not mirrors._tasks
+    assert not list(tmp_path.glob("*.sqlite3"))
+
+
+@pytest.mark.asyncio
+async def test_mirrors_are_shared_by_tokens_with_same_permissions(
+    products_api, mirrors
+):
+    """Test that mirrors are kept per API URL and permissions, not per token."""
+
+    def client(token):
+        return SaleorMCPClient(
+            url="http://example.com/graphql",
+            headers={"Authorization": f"Bearer {token}"},
+            registry=ctx_utils.client_registry,
+        )
+
+    await mirrors.sync(client("old"))
+    assert (await mirrors.status(client("rotated")))["ready"] is True
+
+    products_api.user = None
+    products_api.app = {"permissions": [{"code": "MANAGE_ORDERS"}]}
+    assert (await mirrors.status(client("app")))["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_and_idle_mirrors_are_closed(tmp_path, clock):
+    """Test that mirrors are closed when full or idle, deleting idle databases."""
+    mirrors = CatalogMirrors(
+        tmp_path, max_mirrors=2, idle_timeout=60, close_grace_period=0, clock=clock
+    )
+    try:
+        first = await mirrors._mirror("a")
+        await mirrors._mirror("b")
+        await mirrors._mirror("a")
+        await mirrors._mirror("c")
+        assert len(mirrors) == 2
+        # The mirror of the second key was used least recently.
+        assert "b" not in mirrors._mirrors
+        await asyncio.gather(*mirrors._closing)
+        # Its database stays on disk, so it's reopened with its data.
+        assert (tmp_path / "b.sqlite3").exists()
+
+        clock.now += 61
+        await mirrors._mirror("b")
+        assert len(mirrors) == 1
+        await asyncio.gather(*mirrors._closing)
+        with pytest.raises(sqlite3.ProgrammingError):
+            first.state()
+        assert [path.name for path in tmp_path.glob("*.sqlite3")] == ["b.sqlite3"]
+    finally:
+        await mirrors.aclose()
+
+
+@pytest.mark.asyncio
+async def test_number_of_mirror_databases_is_limited(tmp_path):
+    """Test that databases of closed mirrors are deleted beyond `max_files`."""
+    mirrors = CatalogMirrors(tmp_path, max_mirrors=1, max_files=2, close_grace_period=0)
+    try:
+        for key in ("a", "b", "c"):
+            await mirrors._mirror(key)
+            await asyncio.gather(*mirrors._closing)
+        assert sorted(path.name for path in tmp_path.glob("*.sqlite3")) == [
+            "b.sqlite3",
+            "c.sqlite3",
+        ]
+    finally:
+        await mirrors.aclose()
@@ -0,0 +1,226 @@
+import asyncio
+
+import httpx
+import pytest
+from fastmcp.exceptions import ToolError
+
+from saleor_mcp.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from saleor_mcp.deadline import DeadlineExceededError, deadline_scope
+from saleor_mcp.saleor_client.exceptions import GraphQLClientHttpError
+
+API_URL = "https://a.saleor.cloud/graphql/"
+OTHER_API_URL = "https://b.saleor.cloud/graphql/"
+
+
+def respond(status_code, clock=None, duration=0.0):
+    async def send():
+        if clock is not None:
+            clock.now += duration
+        return httpx.Response(status_code)
+
+    return send
+
+
+async def fail(breakers, api_url=API_URL, times=1):
+    for _ in range(times):
+        await breakers.call(api_url, respond(503))
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_consecutive_failures(clock):
+    """Test the breaker opens after consecutive failures only."""
+    breakers = CircuitBreakerRegistry(failure_threshold=3, clock=clock)
+
+    await fail(breakers, times=2)
+    await breakers.call(API_URL, respond(200))
+    await fail(breakers, times=2)
+    assert breakers.get(API_URL).state == CLOSED
+
+    await fail(breakers)
+    assert breakers.get(API_URL).state == OPEN
+    with pytest.raises(CircuitOpenError, match="Try again in 30 seconds"):
+        await breakers.call(API_URL, respond(200))
+    assert breakers.stats() == {
+        "rejected": 1,
+        "opened": 1,
+        CLOSED: 0,
+        OPEN: 1,
+        HALF_OPEN: 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_and_slow_calls_count_as_failures(clock):
+    """Test connection errors and slow calls count as failures."""
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=2, slow_call_threshold=5, clock=clock
+    )
+
+    async def refuse():
+        raise httpx.ConnectError("Connection refused")
+
+    with pytest.raises(httpx.ConnectError):
+        await breakers.call(API_URL, refuse)
+    await breakers.call(API_URL, respond(200, clock, duration=6))
+
+    assert breakers.get(API_URL).state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_client_errors_dont_count_as_failures(clock):
+    """Test 4xx responses don't count as failures."""
+    breakers = CircuitBreakerRegistry(failure_threshold=1, clock=clock)
+
+    await breakers.call(API_URL, respond(400))
+    await breakers.call(API_URL, respond(429))
+
+    assert breakers.get(API_URL).state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_breaker_lets_one_probe_through(clock):
+    """Test a half-open breaker lets a single probe call through."""
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=1, reset_timeout=10, clock=clock
+    )
+    await fail(breakers)
+
+    clock.now = 10
+    assert breakers.get(API_URL).state == HALF_OPEN
+    release = asyncio.Event()
+
+    async def probe():
+        await release.wait()
+        return httpx.Response(200)
+
+    probe_task = asyncio.create_task(breakers.call(API_URL, probe))
+    await asyncio.sleep(0)
+    with pytest.raises(CircuitOpenError):
+        await breakers.call(API_URL, respond(200))
+
+    release.set()
+    await probe_task
+    assert breakers.get(API_URL).state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_opens_breaker_again(clock):
+    """Test a failed probe opens the breaker again."""
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=3, reset_timeout=10, clock=clock
+    )
+    await fail(breakers, times=3)
+
+    clock.now = 10
+    await fail(breakers)
+
+    assert breakers.get(API_URL).state == OPEN
+    assert breakers.get(API_URL).retry_in() == 10
+    assert breakers.stats()["opened"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_lets_another_probe_through(clock):
+    """Test a cancelled probe lets another probe through."""
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=1, reset_timeout=10, clock=clock
+    )
+    await fail(breakers)
+    clock.now = 10
+
+    probe_task = asyncio.create_task(breakers.call(API_URL, asyncio.Event().wait))
+    await asyncio.sleep(0)
+    probe_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe_task
+
+    await breakers.call(API_URL, respond(200))
+    assert breakers.get(API_URL).state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_calls_cancelled_after_slow_call_threshold_count_as_failures(clock):
+    """Test that a call cancelled once it's slow counts as a failed one."""
+    breakers = CircuitBreakerRegistry(
+        failure_threshold=1, slow_call_threshold=5, clock=clock
+    )
+
+    async def hang():
+        clock.now += 6
+        await asyncio.Event().wait()
+
+    task = asyncio.create_task(breakers.call(API_URL, hang))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert breakers.get(API_URL).state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_calls_cancelled_by_deadline_count_as_failures(make_client):
+    """Test that a Saleor API hanging until the deadline opens its breaker."""
+
+    async def handler(request):
+        await asyncio.Event().wait()
+
+    breakers = CircuitBreakerRegistry(failure_threshold=1)
+    client = make_client(handler, circuit_breakers=breakers)
+    with pytest.raises(DeadlineExceededError):
+        async with deadline_scope(0.05):
+            await client.count_orders()
+
+    assert breakers.get(API_URL).state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_breakers_are_kept_per_api_url(clock):
+    """Test failures of an API don't open breakers of others."""
+    breakers = CircuitBreakerRegistry(failure_threshold=1, clock=clock)
+
+    await fail(breakers, API_URL)
+
+    await breakers.call(OTHER_API_URL, respond(200))
+    assert breakers.get(API_URL.rstrip("/")).state == OPEN
+    assert breakers.get(OTHER_API_URL).state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_closed_breakers_are_forgotten_first(clock):
+    """Test closed breakers are forgotten before open ones."""
+    breakers = CircuitBreakerRegistry(failure_threshold=1, max_breakers=2, clock=clock)
+    await fail(breakers, API_URL)
+    breakers.get(OTHER_API_URL)
+
+    breakers.get("https://c.saleor.cloud/graphql/")
+
+    assert breakers.get(API_URL).state == OPEN
+    assert breakers.stats()[CLOSED] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_while_breaker_is_open(make_client):
+    """Test the client doesn't call an API while its breaker is open."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(502, json={})
+
+    client = make_client(
+        handler, circuit_breakers=CircuitBreakerRegistry(failure_threshold=2)
+    )
+    for _ in range(2):
+        with pytest.raises(GraphQLClientHttpError):
+            await client.count_orders()
+
+    with pytest.raises(ToolError, match="requests to it are paused"):
+        await client.count_orders()
+    assert len(requests) == 2
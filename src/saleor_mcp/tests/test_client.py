@@ -0,0 +1,222 @@
+import asyncio
+
+import httpx
+import pytest
+
+from saleor_mcp.cache import ResponseCache
+from saleor_mcp.saleor_client.exceptions import (
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientHttpError,
+)
+from saleor_mcp.single_flight import SingleFlight
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+@pytest.fixture
+def upstream():
+    """Fake Saleor API which holds requests until released."""
+
+    class Upstream:
+        def __init__(self):
+            self.requests = []
+            self.release = asyncio.Event()
+
+        async def handler(self, request):
+            self.requests.append(request)
+            await self.release.wait()
+            return httpx.Response(
+                200, json={"data": {"orders": {"totalCount": len(self.requests)}}}
+            )
+
+    return Upstream()
+
+
+async def run_concurrently(*coroutines, upstream):
+    tasks = [asyncio.create_task(coroutine) for coroutine in coroutines]
+    await asyncio.sleep(0.01)
+    upstream.release.set()
+    return await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_operations_share_one_request(upstream, make_client):
+    """Test identical concurrent operations share one upstream request."""
+    single_flight = SingleFlight()
+    clients = [
+        make_client(upstream.handler, single_flight=single_flight) for _ in range(3)
+    ]
+
+    results = await run_concurrently(
+        *(
+            client.count_orders(filter={"search": "hoodie", "created": None})
+            for client in clients
+        ),
+        upstream=upstream,
+    )
+
+    assert len(upstream.requests) == 1
+    assert [result.orders.totalCount for result in results] == [1, 1, 1]
+    assert single_flight.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_variables_are_canonicalized_for_coalescing(upstream, make_client):
+    """Test operations with variables in another order are coalesced."""
+    single_flight = SingleFlight()
+    client = make_client(upstream.handler, single_flight=single_flight)
+
+    await run_concurrently(
+        client.count_orders(filter={"search": "a", "updatedAt": {"gte": "2024"}}),
+        client.count_orders(filter={"updatedAt": {"gte": "2024"}, "search": "a"}),
+        upstream=upstream,
+    )
+
+    assert len(upstream.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_different_variables_are_not_coalesced(upstream, make_client):
+    """Test operations with different variables aren't coalesced."""
+    single_flight = SingleFlight()
+    client = make_client(upstream.handler, single_flight=single_flight)
+
+    await run_concurrently(
+        client.count_orders(filter={"search": "a"}),
+        client.count_orders(filter={"search": "b"}),
+        upstream=upstream,
+    )
+
+    assert len(upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_different_tokens_are_not_coalesced(upstream, make_client):
+    """Test operations of different tokens aren't coalesced."""
+    single_flight = SingleFlight()
+
+    await run_concurrently(
+        make_client(
+            upstream.handler, "token-1", single_flight=single_flight
+        ).count_orders(),
+        make_client(
+            upstream.handler, "token-2", single_flight=single_flight
+        ).count_orders(),
+        upstream=upstream,
+    )
+
+    assert len(upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_are_not_coalesced_without_single_flight(upstream, make_client):
+    """Test operations aren't coalesced without single flight."""
+    client = make_client(upstream.handler)
+
+    await run_concurrently(
+        client.count_orders(), client.count_orders(), upstream=upstream
+    )
+
+    assert len(upstream.requests) == 2
+
+
+@pytest.fixture
+def channels_upstream():
+    class Upstream:
+        def __init__(self):
+            self.requests = []
+            self.status_code = 200
+            self.errors = None
+
+        def handler(self, request):
+            self.requests.append(request)
+            channel = {
+                "id": str(len(self.requests)),
+                "slug": "default-channel",
+                "name": "Default Channel",
+                "isActive": True,
+                "currencyCode": "USD",
+                "defaultCountry": {"code": "US"},
+                "warehouses": [],
+            }
+            body = {"data": {"channels": [channel]}}
+            if self.errors:
+                body["errors"] = self.errors
+            return httpx.Response(self.status_code, json=body)
+
+    return Upstream()
+
+
+@pytest.mark.asyncio
+async def test_cached_operation_is_fetched_once(channels_upstream, make_client):
+    """Test a cached operation is fetched once."""
+    cache = ResponseCache(ttls={"ListChannels": 60})
+    client = make_client(channels_upstream.handler, cache=cache)
+
+    first = await client.list_channels()
+    second = await client.list_channels()
+
+    assert len(channels_upstream.requests) == 1
+    assert first == second
+    assert second.channels[0].id == "1"
+
+
+@pytest.mark.asyncio
+async def test_cache_is_namespaced_by_token(channels_upstream, make_client):
+    """Test cached responses aren't shared between tokens."""
+    cache = ResponseCache(ttls={"ListChannels": 60})
+
+    await make_client(channels_upstream.handler, "token-1", cache=cache).list_channels()
+    await make_client(channels_upstream.handler, "token-2", cache=cache).list_channels()
+
+    assert len(channels_upstream.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_operations_without_ttl_bypass_cache(channels_upstream, make_client):
+    """Test operations without a TTL are always fetched."""
+    cache = ResponseCache(ttls={"WarehouseDetails": 60})
+    client = make_client(channels_upstream.handler, cache=cache)
+
+    await client.list_channels()
+    await client.list_channels()
+
+    assert len(channels_upstream.requests) == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_error_responses_are_not_cached(channels_upstream, make_client):
+    """Test error responses aren't cached."""
+    cache = ResponseCache(ttls={"ListChannels": 60})
+    client = make_client(channels_upstream.handler, cache=cache)
+    channels_upstream.errors = [{"message": "Permission denied"}]
+
+    with pytest.raises(GraphQLClientGraphQLMultiError):
+        await client.list_channels()
+
+    channels_upstream.errors = None
+    channels_upstream.status_code = 502
+    with pytest.raises(GraphQLClientHttpError):
+        await client.list_channels()
+
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_refreshed(
+    channels_upstream, clock, make_client
+):
+    """Test a stale response is served while it's refreshed."""
+    cache = ResponseCache(ttls={"ListChannels": 60}, stale_ttl=30, clock=clock)
+    client = make_client(channels_upstream.handler, cache=cache)
+    await client.list_channels()
+
+    clock.now = 70
+    stale = await client.list_channels()
+    await asyncio.sleep(0.01)
+    refreshed = await client.list_channels()
+
+    assert stale.channels[0].id == "1"
+    assert refreshed.channels[0].id == "2"
+    assert len(channels_upstream.requests) == 2
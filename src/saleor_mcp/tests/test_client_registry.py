@@ -0,0 +1,213 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+from saleor_mcp.ctx_utils import get_saleor_client
+from saleor_mcp.main import app
+
+
+async def wait_for_closing(registry):
+    await asyncio.gather(*registry._closing)
+
+
+def test_registry_reuses_client_per_api_url():
+    """Test the registry keeps one HTTP client per API URL."""
+    registry = ClientRegistry()
+
+    client = registry.get("https://a.saleor.cloud/graphql/")
+
+    assert registry.get("https://a.saleor.cloud/graphql/") is client
+    assert registry.get("https://b.saleor.cloud/graphql/") is not client
+    assert len(registry) == 2
+    assert registry.stats()["hits"] == 1
+    assert registry.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_aclose_closes_clients():
+    """Test closing the registry closes its HTTP clients."""
+    registry = ClientRegistry()
+    client = registry.get("https://a.saleor.cloud/graphql/")
+
+    await registry.aclose()
+
+    assert client.is_closed
+    assert len(registry) == 0
+    assert registry.get("https://a.saleor.cloud/graphql/") is not client
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_least_recently_used_pool():
+    """Test the least recently used pool is evicted when full."""
+    registry = ClientRegistry(max_pools=2, close_grace_period=0)
+    client_a = registry.get("https://a.saleor.cloud/graphql/")
+    client_b = registry.get("https://b.saleor.cloud/graphql/")
+    registry.get("https://a.saleor.cloud/graphql/")
+
+    registry.get("https://c.saleor.cloud/graphql/")
+    await wait_for_closing(registry)
+
+    assert len(registry) == 2
+    assert client_b.is_closed
+    assert not client_a.is_closed
+    assert registry.stats()["evicted_lru"] == 1
+    assert registry.stats()["closed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_limits_pools_by_total_connections():
+    """Test the number of pools is limited by the total connections."""
+    registry = ClientRegistry(
+        max_pools=100, max_connections=40, max_connections_per_pool=20
+    )
+
+    for tenant in "abc":
+        registry.get(f"https://{tenant}.saleor.cloud/graphql/")
+
+    assert len(registry) == 2
+    assert registry.stats()["max_connections"] == 40
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_idle_pools(clock):
+    """Test idle pools are evicted."""
+    registry = ClientRegistry(idle_timeout=60, close_grace_period=0, clock=clock)
+    client_a = registry.get("https://a.saleor.cloud/graphql/")
+    clock.now = 30
+    client_b = registry.get("https://b.saleor.cloud/graphql/")
+
+    clock.now = 70
+    registry.get("https://b.saleor.cloud/graphql/")
+    await wait_for_closing(registry)
+
+    assert client_a.is_closed
+    assert not client_b.is_closed
+    assert len(registry) == 1
+    assert registry.stats()["evicted_idle"] == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_aclose_closes_evicted_pools_in_grace_period():
+    """Test closing the registry closes pools still in their grace period."""
+    registry = ClientRegistry(max_pools=1, close_grace_period=3600)
+    client_a = registry.get("https://a.saleor.cloud/graphql/")
+    registry.get("https://b.saleor.cloud/graphql/")
+    await asyncio.sleep(0)
+
+    assert not client_a.is_closed
+    assert registry.stats()["closing_pools"] == 1
+
+    await registry.aclose()
+
+    assert client_a.is_closed
+    assert registry.stats()["closing_pools"] == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_creates_http2_clients():
+    """Test the registry creates HTTP/2 clients."""
+    pytest.importorskip("h2")
+    registry = ClientRegistry(http2=True)
+
+    client = registry.get("https://a.saleor.cloud/graphql/")
+
+    assert registry.http2 is True
+    assert getattr(client._transport, "_pool")._http2 is True
+    await registry.aclose()
+
+
+def test_registry_falls_back_to_http1_without_h2(monkeypatch):
+    """Test the registry falls back to HTTP/1.1 without `h2`."""
+    monkeypatch.setattr(
+        "saleor_mcp.client_registry.importlib.util.find_spec", lambda name: None
+    )
+
+    registry = ClientRegistry(http2=True)
+
+    assert registry.http2 is False
+    client = registry.get("https://a.saleor.cloud/graphql/")
+    assert getattr(client._transport, "_pool")._http2 is False
+
+
+@pytest.mark.asyncio
+async def test_saleor_client_sends_auth_header_per_request():
+    """Test tokens sharing a pool send their own auth headers."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": {"channels": []}})
+
+    registry = ClientRegistry(transport=httpx.MockTransport(handler))
+    for token in ("token-1", "token-2"):
+        client = SaleorClient(
+            url="https://a.saleor.cloud/graphql/",
+            headers={"Authorization": f"Bearer {token}"},
+            registry=registry,
+        )
+        await client.list_channels()
+
+    assert [r.headers["Authorization"] for r in requests] == [
+        "Bearer token-1",
+        "Bearer token-2",
+    ]
+    http_client = registry.get("https://a.saleor.cloud/graphql/")
+    assert "Authorization" not in http_client.headers
+    assert not http_client.is_closed
+    assert len(registry) == 1
+
+
+@pytest.mark.asyncio
+async def test_saleor_client_picks_up_new_pool_after_eviction():
+    """Test the client uses a new pool once its pool is evicted."""
+
+    def handler(request):
+        return httpx.Response(200, json={"data": {"channels": []}})
+
+    registry = ClientRegistry(
+        max_pools=1, close_grace_period=0, transport=httpx.MockTransport(handler)
+    )
+    client = SaleorClient(
+        url="https://a.saleor.cloud/graphql/",
+        headers={"Authorization": "Bearer token"},
+        registry=registry,
+    )
+    evicted = client.http_client
+    registry.get("https://b.saleor.cloud/graphql/")
+    await wait_for_closing(registry)
+
+    await client.list_channels()
+
+    assert evicted.is_closed
+    assert client.http_client is not evicted
+    assert not client.http_client.is_closed
+
+
+def test_get_saleor_client_uses_pooled_http_client(mock_saleor_config):
+    """Test clients of tool calls use the pooled HTTP client."""
+    with patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config:
+        mock_get_config.return_value = mock_saleor_config
+        first = get_saleor_client()
+        second = get_saleor_client()
+
+    assert first is not second
+    assert first.http_client is second.http_client
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_reports_client_registry_stats():
+    """Test the metrics route reports stats of the registry."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://testserver",
+    ) as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "open_pools" in response.json()["client_registry"]
@@ -1,7 +1,7 @@
 import pytest
 from fastmcp.exceptions import ToolError
 
-from saleor_mcp.config import get_config_from_headers, validate_api_url
+from saleor_mcp.config import get_config_from_headers, get_env_int, validate_api_url
 
 
 @pytest.mark.parametrize(
@@ -96,3 +96,16 @@ def test_get_config_from_headers_invalid_domain_pattern(monkeypatch):
         ToolError, match="API URL 'https://notallowed.com' is not allowed"
     ):
         get_config_from_headers()
+
+
+def test_get_env_int_rejects_values_below_minimum(monkeypatch):
+    """Test integer settings lower than their minimum are rejected."""
+    monkeypatch.setenv("UPSTREAM_MAX_CONNECTIONS_PER_POOL", "0")
+
+    with pytest.raises(
+        ValueError, match="UPSTREAM_MAX_CONNECTIONS_PER_POOL must be at least 1, got 0"
+    ):
+        get_env_int("UPSTREAM_MAX_CONNECTIONS_PER_POOL", 20, minimum=1)
+
+    monkeypatch.setenv("UPSTREAM_MAX_CONNECTIONS_PER_POOL", "1")
+    assert get_env_int("UPSTREAM_MAX_CONNECTIONS_PER_POOL", 20, minimum=1) == 1
@@ -0,0 +1,145 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastmcp import Client as MCPClient
+from fastmcp.exceptions import ToolError
+
+from saleor_mcp.deadline import (
+    DeadlineExceededError,
+    DeadlineMiddleware,
+    check_deadline,
+    deadline_scope,
+    remaining,
+)
+from saleor_mcp.main import mcp
+from saleor_mcp.retry import RetryPolicy
+from saleor_mcp.saleor_client.client import Client as SaleorClient
+
+
+@pytest.mark.asyncio
+async def test_work_past_deadline_is_cancelled():
+    """Test work still running at the deadline is cancelled."""
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    with pytest.raises(DeadlineExceededError, match="within 0.01 seconds"):
+        async with deadline_scope(0.01):
+            await slow()
+
+    assert cancelled
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_inner_scope_keeps_earlier_deadline():
+    """Test an inner scope keeps the earlier deadline of an outer one."""
+    async with deadline_scope(1):
+        async with deadline_scope(100):
+            left = remaining()
+            assert left is not None
+            assert left <= 1
+
+
+@pytest.mark.asyncio
+async def test_check_deadline_raises_once_deadline_passes():
+    """Test checking the deadline raises once it passes."""
+    check_deadline()
+
+    async with deadline_scope(10):
+        check_deadline()
+        with patch("saleor_mcp.deadline.time.monotonic", return_value=1e12):
+            with pytest.raises(DeadlineExceededError):
+                check_deadline()
+
+
+@pytest.mark.asyncio
+async def test_timeout_errors_of_the_block_are_not_replaced():
+    """Test timeout errors raised by the block itself are kept."""
+    with pytest.raises(TimeoutError):
+        async with deadline_scope(10):
+            raise TimeoutError
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_deadline():
+    """Test retries stop once the deadline would pass."""
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    async def send():
+        return httpx.Response(503, headers={"Retry-After": "1"})
+
+    policy = RetryPolicy(max_attempts=5, budget=30, sleep=sleep)
+    async with deadline_scope(0.5):
+        response = await policy.run("ListOrders", send)
+
+    assert response.status_code == 503
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_limited_by_configured_timeout(
+    monkeypatch, mock_saleor_config
+):
+    """Test a tool call fails once its configured timeout passes."""
+    monkeypatch.setenv("TOOL_TIMEOUT_CHANNELS", "0.05")
+
+    async def list_channels(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_channels", side_effect=list_channels),
+    ):
+        mock_get_config.return_value = mock_saleor_config
+
+        async with MCPClient(mcp) as mcp_client:
+            with pytest.raises(ToolError, match="didn't finish within 0.05 seconds"):
+                await mcp_client.call_tool("channels", {})
+
+
+@pytest.mark.asyncio
+async def test_client_can_request_shorter_timeout(
+    sample_channels_response, mock_saleor_config
+):
+    """Test MCP clients can ask for a shorter timeout."""
+    deadlines = []
+
+    async def list_channels(*args, **kwargs):
+        deadlines.append(remaining())
+        return sample_channels_response
+
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_channels", side_effect=list_channels),
+    ):
+        mock_get_config.return_value = mock_saleor_config
+
+        async with MCPClient(mcp) as mcp_client:
+            await mcp_client.call_tool("channels", {}, meta={"timeout": 5})
+            await mcp_client.call_tool("channels", {}, meta={"timeout": 500})
+
+    assert 0 < deadlines[0] <= 5
+    assert 5 < deadlines[1] <= 60
+
+
+def test_export_tools_have_longer_default_timeout(monkeypatch):
+    """Test that exports get an hour by default, unless configured otherwise."""
+    monkeypatch.delenv("TOOL_TIMEOUT_EXPORT_ORDERS", raising=False)
+    monkeypatch.setenv("TOOL_TIMEOUT_EXPORT_PRODUCTS", "120")
+    middleware = DeadlineMiddleware(default_timeout=60)
+
+    assert middleware.configured_timeout("export_orders") == 3600
+    assert middleware.configured_timeout("export_products") == 120
+    assert middleware.configured_timeout("orders") == 60
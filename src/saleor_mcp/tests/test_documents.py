@@ -0,0 +1,173 @@
+import json
+
+import httpx
+import pytest
+from fastmcp import Client as MCPClient
+from fastmcp.exceptions import ToolError
+from graphql import parse, print_ast
+
+from saleor_mcp.documents import (
+    InvalidFieldsError,
+    build_projected_query,
+    projected_query,
+)
+from saleor_mcp.main import mcp
+
+
+def normalized(document):
+    return print_ast(parse(document))
+
+
+@pytest.mark.asyncio
+async def test_projected_query_selects_only_given_fields():
+    """Test projected queries select only the given fields."""
+    document = await projected_query(
+        "ListOrders", ["number", "total.gross.amount", "lines.quantity"]
+    )
+
+    assert document == normalized("""
+        query ListOrders(
+          $first: Int
+          $after: String
+          $sortBy: OrderSortingInput
+          $filter: OrderFilterInput
+          $withTotal: Boolean = false
+        ) {
+          orders(first: $first, after: $after, sortBy: $sortBy, filter: $filter) {
+            pageInfo {
+              hasNextPage
+              hasPreviousPage
+              startCursor
+              endCursor
+            }
+            totalCount @include(if: $withTotal)
+            edges {
+              node {
+                lines {
+                  quantity
+                }
+                number
+                total {
+                  gross {
+                    amount
+                  }
+                }
+              }
+            }
+          }
+        }
+    """)
+
+
+def test_projected_query_keeps_default_subfields_and_arguments():
+    """Test projected queries keep default subfields and arguments."""
+    document = build_projected_query("ListProducts", ("productVariants", "slug"))
+
+    assert "productVariants(first: 20) {" in document
+    assert "sku" in document
+    assert "slug" in document
+    assert "pricing" not in document
+
+
+def test_projected_query_selects_fields_of_nodes_of_nested_connections():
+    """Test that `edges.node` can be skipped in paths of nested connections."""
+    document = build_projected_query("ListProducts", ("productVariants.sku",))
+
+    assert document == build_projected_query(
+        "ListProducts", ("productVariants.edges.node.sku",)
+    )
+    assert "productVariants(first: 20) { edges { node { sku } } }" in " ".join(
+        document.split()
+    )
+
+
+@pytest.mark.asyncio
+async def test_projected_query_is_cached():
+    """Test projected queries of the same fields are built once."""
+    first = await projected_query("ListStocks", ["quantity", "id", "quantity"])
+    second = await projected_query("ListStocks", ["id", "quantity"])
+
+    assert first is second
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        (["sku"], "`Order` has no field `sku`"),
+        (["lines.quantity.x"], "Field `lines.quantity` has no subfields"),
+        (["lines.variant.product.media"], "`lines.variant.product.media` can't be"),
+    ],
+)
+def test_projected_query_rejects_invalid_fields(fields, message):
+    """Test projected queries reject fields that don't exist."""
+    with pytest.raises(InvalidFieldsError, match=message):
+        build_projected_query("ListOrders", tuple(fields))
+
+
+@pytest.mark.parametrize(
+    ("operation_name", "field"),
+    [
+        ("ListCustomers", "email"),
+        ("ListCustomers", "firstName"),
+        ("ListCustomers", "defaultShippingAddress.streetAddress1"),
+        ("ListCustomers", "defaultShippingAddress.phone"),
+        ("ListOrders", "userEmail"),
+        ("ListOrders", "user.email"),
+        ("ListOrders", "privateMetadata.value"),
+    ],
+)
+def test_projected_query_rejects_fields_not_returned_by_default(operation_name, field):
+    """Test projected queries reject fields not returned by default."""
+    with pytest.raises(InvalidFieldsError, match="only fields returned by default"):
+        build_projected_query(operation_name, ("id", field))
+
+
+@pytest.mark.asyncio
+async def test_tool_fetches_selected_fields(serve_saleor_api):
+    """Test tools fetch only the selected fields."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "products": {
+                        "pageInfo": {
+                            "hasNextPage": False,
+                            "hasPreviousPage": False,
+                            "startCursor": None,
+                            "endCursor": None,
+                        },
+                        "totalCount": 1,
+                        "edges": [{"node": {"name": "Blue Hoodie"}}],
+                    }
+                }
+            },
+        )
+
+    serve_saleor_api(handler)
+
+    async with MCPClient(mcp) as mcp_client:
+        result = await mcp_client.call_tool(
+            "products", {"first": 5, "fields": ["name"]}
+        )
+        with pytest.raises(ToolError, match="has no field `nam`"):
+            await mcp_client.call_tool("products", {"fields": ["nam"]})
+
+    assert result.structured_content == {
+        "data": {
+            "products": [{"node": {"name": "Blue Hoodie"}}],
+            "pageInfo": {
+                "hasNextPage": False,
+                "hasPreviousPage": False,
+                "startCursor": None,
+                "endCursor": None,
+            },
+            "totalFetched": 1,
+        }
+    }
+    assert len(requests) == 1
+    assert requests[0]["variables"]["first"] == 5
+    assert requests[0]["query"] == build_projected_query("ListProducts", ("name",))
@@ -0,0 +1,152 @@
+import asyncio
+import base64
+import gzip
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from fastmcp import Client as MCPClient
+from fastmcp.exceptions import ResourceError
+
+from saleor_mcp.config import SaleorConfig
+from saleor_mcp.exports import ExportStore, prefetched
+from saleor_mcp.main import mcp
+from saleor_mcp.tools import exports
+
+
+async def pages(count, events):
+    for number in range(count):
+        events.append(f"fetched {number}")
+        yield [{"id": f"{number}-{row}"} for row in range(2)]
+
+
+@pytest.mark.asyncio
+async def test_prefetched_fetches_next_item_while_current_is_handled():
+    """Test the next page is fetched while the current one is written."""
+    events = []
+    async for page in prefetched(pages(3, events)):
+        await asyncio.sleep(0)
+        events.append(f"handled {page[0]['id'][0]}")
+
+    assert events == [
+        "fetched 0",
+        "fetched 1",
+        "handled 0",
+        "fetched 2",
+        "handled 1",
+        "handled 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_store_writes_gzipped_ndjson(tmp_path):
+    """Test exports are written as gzipped NDJSON."""
+    store = ExportStore(tmp_path)
+    progress = []
+
+    async def on_page(rows):
+        progress.append(rows)
+
+    export = await store.write("owner", pages(2, []), on_page)
+
+    path = store.open(export.id, "owner")
+    assert export.uri == f"export://{export.id}"
+    assert export.rows == 4
+    assert export.size == path.stat().st_size
+    assert progress == [2, 4]
+    with gzip.open(path) as file:
+        assert [json.loads(line)["id"] for line in file] == ["0-0", "0-1", "1-0", "1-1"]
+
+
+@pytest.mark.asyncio
+async def test_export_store_only_opens_exports_of_their_owner(tmp_path):
+    """Test exports are only opened for their owner."""
+    store = ExportStore(tmp_path)
+    export = await store.write("owner", pages(1, []))
+
+    with pytest.raises(ResourceError):
+        store.open(export.id, "other-owner")
+    with pytest.raises(ResourceError):
+        store.open("../" + export.id, "owner")
+
+
+@pytest.mark.asyncio
+async def test_export_store_removes_expired_exports(tmp_path):
+    """Test expired exports are removed."""
+    store = ExportStore(tmp_path, ttl=60)
+    export = await store.write("owner", pages(1, []))
+    path = store.open(export.id, "owner")
+    os.utime(path, (0, 0))
+
+    with pytest.raises(ResourceError):
+        store.open(export.id, "owner")
+    store.remove_expired()
+    assert path.exists() is False
+
+
+@pytest.mark.asyncio
+async def test_export_store_removes_failed_export(tmp_path):
+    """Test files of failed exports are removed."""
+
+    async def failing_pages():
+        yield [{"id": "1"}]
+        raise RuntimeError("Upstream error")
+
+    store = ExportStore(tmp_path)
+    with pytest.raises(RuntimeError):
+        await store.write("owner", failing_pages())
+
+    assert list(tmp_path.iterdir()) == []
+
+
+ORDERS = [
+    {"id": f"T3JkZXI6{number}", "number": str(number), "created": f"2025-01-0{number}"}
+    for number in range(1, 4)
+]
+
+
+@pytest.fixture
+def export_store(orders_api, monkeypatch, tmp_path):
+    orders_api.orders = ORDERS
+    store = ExportStore(tmp_path)
+    monkeypatch.setattr(exports, "export_store", store)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_export_orders_tool_exports_all_pages(orders_api, export_store):
+    """Test export orders tool exports all pages of orders."""
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool(
+            "export_orders",
+            {"filter": {"search": "hoodie"}, "fields": ["number"]},
+        )
+        data = result.structured_content["data"]
+        contents = await client.read_resource(data["uri"])
+
+    assert data["rows"] == 3
+    assert data["mimeType"] == "application/gzip"
+    lines = gzip.decompress(base64.b64decode(contents[0].blob)).splitlines()
+    assert [json.loads(line) for line in lines] == ORDERS
+    page = orders_api.requests[-1]
+    assert "lines" not in page["query"]
+    assert page["variables"]["filter"]["search"] == "hoodie"
+
+
+@pytest.mark.asyncio
+async def test_export_resource_is_not_readable_with_other_token(
+    export_store, mock_saleor_config
+):
+    """Test export resources can't be read with another token."""
+    async with MCPClient(mcp) as client:
+        result = await client.call_tool("export_orders", {})
+        uri = result.structured_content["data"]["uri"]
+
+        with patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config:
+            mock_get_config.return_value = SaleorConfig(
+                api_url=mock_saleor_config.api_url,
+                auth_token="other-token",
+            )
+            with pytest.raises(Exception, match="not found"):
+                await client.read_resource(uri)
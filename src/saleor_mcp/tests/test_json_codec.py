@@ -0,0 +1,94 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from saleor_mcp import json_codec
+from saleor_mcp.saleor_client.enums import OrderDirection, OrderSortField
+from saleor_mcp.saleor_client.exceptions import (
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientInvalidResponseError,
+)
+from saleor_mcp.saleor_client.input_types import OrderSortingInput
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+@pytest.fixture(params=["orjson", "json"])
+def codec(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def test_dumps_matches_standard_library(codec):
+    """Test encoded JSON matches the standard library."""
+    value = {
+        "b": [1, 2.5, None, True],
+        "a": "Zażółć",
+        "created": datetime(2024, 5, 7, 10, 12, 41, tzinfo=UTC),
+        "amount": Decimal("19.99"),
+        "sortBy": OrderSortingInput(
+            field=OrderSortField.CREATED_AT, direction=OrderDirection.DESC
+        ),
+    }
+
+    encoded = json_codec.dumps(value, sort_keys=True)
+
+    assert json.loads(encoded) == {
+        "a": "Zażółć",
+        "amount": "19.99",
+        "b": [1, 2.5, None, True],
+        "created": "2024-05-07T10:12:41Z",
+        "sortBy": {"direction": "DESC", "field": "CREATED_AT"},
+    }
+    assert encoded.startswith(b'{"a":')
+
+
+def test_loads_rejects_invalid_json(codec):
+    """Test invalid JSON is rejected."""
+    assert json_codec.loads(b'{"data": {"a": [1]}}') == {"data": {"a": [1]}}
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        json_codec.loads(b"<html>Bad gateway</html>")
+
+
+@pytest.mark.asyncio
+async def test_client_sends_and_parses_json(codec, make_client):
+    """Test the client sends and parses JSON with the codec."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"data": {"orders": {"totalCount": 3}}})
+
+    result = await make_client(handler).count_orders(filter={"search": "hoodie"})
+
+    assert result.orders is not None
+    assert result.orders.totalCount == 3
+    assert requests[0]["operationName"] == "CountOrders"
+    assert requests[0]["variables"] == {"filter": {"search": "hoodie"}}
+
+
+@pytest.mark.asyncio
+async def test_client_raises_same_errors(codec, make_client):
+    """Test the client raises the same errors with the codec."""
+    client = make_client(lambda request: httpx.Response(200, content=b"not json"))
+    with pytest.raises(GraphQLClientInvalidResponseError):
+        await client.count_orders()
+
+    client = make_client(lambda request: httpx.Response(200, json={"other": 1}))
+    with pytest.raises(GraphQLClientInvalidResponseError):
+        await client.count_orders()
+
+    client = make_client(
+        lambda request: httpx.Response(
+            200, json={"data": None, "errors": [{"message": "Denied"}]}
+        )
+    )
+    with pytest.raises(GraphQLClientGraphQLMultiError, match="Denied"):
+        await client.count_orders()
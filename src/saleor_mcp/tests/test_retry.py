@@ -0,0 +1,204 @@
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+from saleor_mcp.retry import RetryPolicy, parse_retry_after
+from saleor_mcp.saleor_client.exceptions import GraphQLClientHttpError
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+class FakeTime:
+    """Clock and sleep advancing together, so retries don't wait for real."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def make_policy(fake_time, **kwargs):
+    return RetryPolicy(
+        clock=fake_time.clock,
+        sleep=fake_time.sleep,
+        jitter=lambda low, high: high,
+        **kwargs,
+    )
+
+
+def make_send(*results):
+    calls = []
+
+    async def send():
+        result = results[len(calls)]
+        calls.append(result)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return send, calls
+
+
+def test_parse_retry_after():
+    """Test parsing `Retry-After` headers."""
+    now = datetime(2024, 5, 7, 10, 0, 0, tzinfo=UTC)
+
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Tue, 07 May 2024 10:00:05 GMT", now) == 5
+    assert parse_retry_after("Tue, 07 May 2024 09:00:00 GMT", now) == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_with_exponential_backoff():
+    """Test transient errors are retried with exponential backoff."""
+    fake_time = FakeTime()
+    policy = make_policy(fake_time, max_attempts=4, base_delay=0.5)
+    send, calls = make_send(
+        httpx.Response(502),
+        httpx.ConnectError("Connection refused"),
+        httpx.Response(503),
+        httpx.Response(200),
+    )
+
+    response = await policy.run("ListOrders", send)
+
+    assert response.status_code == 200
+    assert len(calls) == 4
+    assert fake_time.sleeps == [0.5, 1.0, 2.0]
+    assert policy.stats() == {
+        "ListOrders": {"requests": 1, "retries": 3, "exhausted": 0}
+    }
+
+
+@pytest.mark.asyncio
+async def test_backoff_is_capped_at_max_delay():
+    """Test backoff delays are capped at `max_delay`."""
+    fake_time = FakeTime()
+    policy = make_policy(fake_time, max_attempts=4, base_delay=1, max_delay=1.5)
+    send, _ = make_send(*[httpx.Response(502)] * 3, httpx.Response(200))
+
+    await policy.run("ListOrders", send)
+
+    assert fake_time.sleeps == [1, 1.5, 1.5]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_header_is_honored():
+    """Test `Retry-After` headers are honored."""
+    fake_time = FakeTime()
+    policy = make_policy(fake_time)
+    send, _ = make_send(
+        httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)
+    )
+
+    response = await policy.run("ListProducts", send)
+
+    assert response.status_code == 200
+    assert fake_time.sleeps == [2]
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_retried():
+    """Test other errors aren't retried."""
+    policy = make_policy(FakeTime())
+    send, calls = make_send(httpx.Response(400), httpx.Response(200))
+
+    response = await policy.run("ListOrders", send)
+
+    assert response.status_code == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_last_response_is_returned_when_attempts_run_out():
+    """Test the last response is returned when attempts run out."""
+    fake_time = FakeTime()
+    policy = make_policy(fake_time, max_attempts=2)
+    send, calls = make_send(httpx.Response(503), httpx.Response(502))
+
+    response = await policy.run("ListOrders", send)
+
+    assert response.status_code == 502
+    assert len(calls) == 2
+    assert policy.stats()["ListOrders"]["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_past_budget_is_not_made():
+    """Test retries are stopped by the retry budget."""
+    fake_time = FakeTime()
+    policy = make_policy(fake_time, max_attempts=5, budget=3)
+    send, calls = make_send(
+        httpx.Response(503),
+        httpx.Response(429, headers={"Retry-After": "10"}),
+        httpx.Response(200),
+    )
+
+    response = await policy.run("ListOrders", send)
+
+    assert response.status_code == 429
+    assert len(calls) == 2
+    assert fake_time.sleeps == [0.2]
+
+
+@pytest.mark.asyncio
+async def test_connection_error_is_raised_when_attempts_run_out():
+    """Test the connection error is raised when attempts run out."""
+    policy = make_policy(FakeTime(), max_attempts=2)
+    send, _ = make_send(httpx.ConnectError("down"), httpx.ConnectError("down"))
+
+    with pytest.raises(httpx.ConnectError):
+        await policy.run("ListOrders", send)
+
+
+@pytest.mark.asyncio
+async def test_client_retries_transient_upstream_errors():
+    """Test the client retries transient upstream errors."""
+    responses = [
+        httpx.Response(503, json={}),
+        httpx.Response(200, json={"data": {"orders": {"totalCount": 7}}}),
+    ]
+    registry = ClientRegistry(
+        transport=httpx.MockTransport(lambda request: responses.pop(0))
+    )
+    fake_time = FakeTime()
+    client = SaleorClient(
+        url=API_URL,
+        headers={"Authorization": "Bearer token"},
+        registry=registry,
+        retry_policy=make_policy(fake_time),
+    )
+
+    result = await client.count_orders()
+
+    assert result.orders is not None
+    assert result.orders.totalCount == 7
+    assert fake_time.sleeps == [0.2]
+
+
+@pytest.mark.asyncio
+async def test_client_raises_http_error_when_retries_run_out():
+    """Test the client raises an HTTP error when retries run out."""
+    registry = ClientRegistry(
+        transport=httpx.MockTransport(lambda request: httpx.Response(502, json={}))
+    )
+    client = SaleorClient(
+        url=API_URL,
+        headers={"Authorization": "Bearer token"},
+        registry=registry,
+        retry_policy=make_policy(FakeTime(), max_attempts=2),
+    )
+
+    with pytest.raises(GraphQLClientHttpError):
+        await client.count_orders()
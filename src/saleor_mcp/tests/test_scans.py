@@ -0,0 +1,116 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from saleor_mcp.ctx_utils import get_saleor_client
+from saleor_mcp.scans import OrderScanner, Shard, limit_shards, split_range
+
+ORDERS = [
+    {"id": f"T3JkZXI6{number}", "created": f"2025-01-{day:02}T10:00:00+00:00"}
+    for number, day in enumerate((1, 1, 2, 5, 5, 5, 9, 10))
+]
+
+
+def test_split_range_covers_all_days_once():
+    """Test split ranges cover every day once."""
+    assert split_range(date(2025, 1, 1), date(2025, 1, 10), 3) == [
+        (date(2025, 1, 1), date(2025, 1, 3)),
+        (date(2025, 1, 4), date(2025, 1, 6)),
+        (date(2025, 1, 7), date(2025, 1, 10)),
+    ]
+    assert split_range(date(2025, 1, 1), date(2025, 1, 2), 4) == [
+        (date(2025, 1, 1), date(2025, 1, 1)),
+        (date(2025, 1, 2), date(2025, 1, 2)),
+    ]
+
+
+def test_limit_shards():
+    """Test shards are limited to a number of orders."""
+    shards = [
+        Shard(date(2025, 1, day), date(2025, 1, day), count)
+        for day, count in enumerate((3, 2, 4), 1)
+    ]
+
+    assert limit_shards(shards, 4) == shards[:2]
+    assert limit_shards(shards, 3) == shards[:1]
+    assert limit_shards(shards, 0) == []
+
+
+@pytest.mark.asyncio
+async def test_shards_are_split_until_small_enough(orders_api):
+    """Test shards are split until they are small enough."""
+    orders_api.orders = ORDERS
+    scanner = OrderScanner(shard_size=2, max_concurrency=1)
+
+    shards = await scanner.shards(
+        get_saleor_client(), {"created": {"lte": "2025-01-10"}}
+    )
+
+    assert sum(shard.count for shard in shards) == len(ORDERS)
+    assert shards == sorted(shards)
+    assert shards[0].gte == date(2025, 1, 1)
+    assert shards[-1].lte == date(2025, 1, 10)
+    # A day with more orders than `shard_size` can't be split further.
+    assert Shard(date(2025, 1, 5), date(2025, 1, 5), 3) in shards
+    assert all(shard.count <= 2 for shard in shards if shard.gte < shard.lte)
+
+
+@pytest.mark.asyncio
+async def test_shards_of_no_orders(orders_api):
+    """Test there are no shards without orders."""
+    assert await OrderScanner().shards(get_saleor_client(), None) == []
+
+
+@pytest.mark.asyncio
+async def test_scan_returns_orders_in_order_once(orders_api):
+    # An order returned by two pages of a shard is only returned once.
+    """Test scans return every order once, oldest first."""
+    orders_api.orders = [*ORDERS[:5], ORDERS[4], *ORDERS[5:]]
+    scanner = OrderScanner(max_concurrency=2)
+    shards = [
+        Shard(date(2025, 1, 6), date(2025, 1, 10), 2),
+        Shard(date(2025, 1, 1), date(2025, 1, 5), 7),
+    ]
+
+    pages = [
+        page
+        async for page in scanner.scan(
+            get_saleor_client(), None, ["created"], sorted(shards), page_size=2
+        )
+    ]
+
+    assert [order["id"] for page in pages for order in page] == [
+        order["id"] for order in ORDERS
+    ]
+    assert all(len(page) <= 2 for page in pages)
+    page_requests = [
+        request
+        for request in orders_api.requests
+        if request["operationName"] == "ListOrders"
+    ]
+    assert all(
+        request["variables"]["sortBy"] == {"field": "CREATED_AT", "direction": "ASC"}
+        for request in page_requests
+    )
+
+
+@pytest.mark.asyncio
+async def test_scan_fetches_ahead_only_a_page_of_each_shard(orders_api):
+    """Test scans fetch at most a page ahead for each shard."""
+    orders_api.orders = [
+        {"id": f"T3JkZXI6{number}", "created": f"2025-01-{day:02}T10:00:00+00:00"}
+        for number, day in enumerate(day for day in range(1, 11) for _ in range(10))
+    ]
+    scanner = OrderScanner(max_concurrency=2)
+    shards = [Shard(date(2025, 1, day), date(2025, 1, day), 10) for day in range(1, 11)]
+
+    pages = scanner.scan(get_saleor_client(), None, ["created"], shards, page_size=1)
+    first_page = await anext(pages)
+    await asyncio.sleep(0.01)
+    await pages.aclose()
+
+    assert first_page == [orders_api.orders[0]]
+    # Besides the page returned, each of the two shards fetched at once has at
+    # most a page waiting in its queue and another one waiting to be put there.
+    assert len(orders_api.requests) <= 5
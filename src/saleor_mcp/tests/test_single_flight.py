@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from saleor_mcp.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_same_key_share_result():
+    """Test concurrent calls with the same key share the result."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"value": calls}
+
+    tasks = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_calls_with_different_keys_are_not_shared():
+    """Test calls with different keys aren't shared."""
+    single_flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: fetch("a")),
+        single_flight.do("b", lambda: fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert single_flight.stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_is_propagated_to_all_callers():
+    """Test an exception is raised to all callers."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise ValueError("upstream failed")
+
+    tasks = [asyncio.create_task(single_flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    """Test a cancelled caller doesn't cancel the shared call."""
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_new_call_is_made_after_previous_one_finished():
+    """Test a new call is made once the previous one finished."""
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await single_flight.do("key", fetch) == 1
+    assert await single_flight.do("key", fetch) == 2
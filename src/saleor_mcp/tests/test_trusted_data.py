@@ -0,0 +1,102 @@
+import json
+
+import httpx
+import pytest
+from fastmcp import Client as MCPClient
+
+from saleor_mcp import ctx_utils
+from saleor_mcp.documents import load_query
+from saleor_mcp.main import mcp
+from saleor_mcp.saleor_client.exceptions import GraphQLClientGraphQLMultiError
+from saleor_mcp.trusted_data import TrustedData
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+def test_trusted_data_reads_fields_as_attributes():
+    """Test fields of trusted data are read as attributes."""
+    data = TrustedData(
+        {"orders": {"edges": [{"node": {"id": "T3JkZXI6MQ=="}}], "pageInfo": None}}
+    )
+
+    assert isinstance(data.orders, TrustedData)
+    assert data.orders.edges[0].node.id == "T3JkZXI6MQ=="
+    assert data.orders.pageInfo is None
+    assert data.orders == {
+        "edges": [{"node": {"id": "T3JkZXI6MQ=="}}],
+        "pageInfo": None,
+    }
+    with pytest.raises(AttributeError):
+        _ = data.products
+
+
+def test_load_query_reads_operation_document():
+    """Test documents of operations are read from files."""
+    assert load_query("CountOrders").lstrip().startswith("query CountOrders")
+
+
+@pytest.mark.asyncio
+async def test_client_sends_same_request_without_validation(make_client):
+    """Test the same request is sent without validation."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"data": {"orders": {"totalCount": 3}}})
+
+    for validate_responses in (True, False):
+        client = make_client(handler, validate_responses=validate_responses)
+        result = await client.count_orders(filter={"search": "hoodie"})
+        assert result.orders is not None
+        assert result.orders.totalCount == 3
+
+    validated, trusted = requests
+    assert trusted["query"].split() == validated["query"].split()
+    assert trusted["operationName"] == validated["operationName"]
+    assert trusted["variables"] == validated["variables"]
+    assert isinstance(result, TrustedData)
+
+
+@pytest.mark.asyncio
+async def test_client_raises_graphql_errors_without_validation(make_client):
+    """Test GraphQL errors are raised without validation."""
+    client = make_client(
+        lambda request: httpx.Response(
+            200, json={"data": None, "errors": [{"message": "Denied"}]}
+        ),
+        validate_responses=False,
+    )
+
+    with pytest.raises(GraphQLClientGraphQLMultiError, match="Denied"):
+        await client.list_channels()
+
+
+TOOL_CALLS = [
+    ("orders", {"first": 10}, "sample_orders_response"),
+    ("order_count", {}, "sample_count_orders_response"),
+    ("channels", {}, "sample_channels_response"),
+    ("customers", {"first": 10}, "sample_customers_response"),
+    ("products", {"first": 10}, "sample_products_response"),
+    ("stocks", {"first": 10}, "sample_stocks_response"),
+    ("warehouse_details", {"id": "V2FyZWhvdXNlOjE="}, "sample_warehouse_response"),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("tool", "arguments", "response_fixture"), TOOL_CALLS)
+async def test_tool_output_is_the_same_without_validation(
+    request, serve_saleor_api, monkeypatch, tool, arguments, response_fixture
+):
+    """Test tools return the same output without validation."""
+    response = request.getfixturevalue(response_fixture)
+    body = {"data": response.model_dump(mode="json", by_alias=True)}
+    serve_saleor_api(lambda request: httpx.Response(200, json=body))
+
+    results = {}
+    for validate_responses in (True, False):
+        monkeypatch.setattr(ctx_utils, "validate_responses", validate_responses)
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool(tool, arguments)
+        results[validate_responses] = result.structured_content
+
+    assert results[False] == results[True]
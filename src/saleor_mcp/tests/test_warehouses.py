@@ -0,0 +1,116 @@
+import json
+
+import httpx
+import pytest
+
+from saleor_mcp.cache import ResponseCache
+from saleor_mcp.documents import aliased_query
+from saleor_mcp.saleor_client.warehouse_details import WarehouseDetailsWarehouse
+from saleor_mcp.trusted_data import TrustedData
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+WAREHOUSES = {
+    id: {
+        "id": id,
+        "name": f"Warehouse {id}",
+        "slug": f"warehouse-{id.lower()}",
+        "address": {"city": "Berlin", "postalCode": "10115", "country": {"code": "DE"}},
+        "clickAndCollectOption": "DISABLED",
+        "shippingZones": {"edges": []},
+        "metadata": [],
+    }
+    for id in ("V2FyZWhvdXNlOjE=", "V2FyZWhvdXNlOjI=", "V2FyZWhvdXNlOjM=")
+}
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def warehouses_api(requests):
+    """Fake Saleor API serving warehouses and recording request bodies."""
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    f"warehouse{name.removeprefix('id')}": WAREHOUSES.get(id)
+                    for name, id in body["variables"].items()
+                }
+            },
+        )
+
+    return handler
+
+
+def test_aliased_query_gives_every_copy_its_variables():
+    """Test every aliased copy of a field gets its own variables."""
+    document = aliased_query("WarehouseDetails", 2)
+
+    assert document.startswith("query WarehouseDetailsBatch($id0: ID, $id1: ID) {")
+    assert "  warehouse0: warehouse(id: $id0) {" in document
+    assert "  warehouse1: warehouse(id: $id1) {" in document
+    assert "shippingZones(first: 100)" in document
+
+
+@pytest.mark.asyncio
+async def test_warehouses_are_fetched_in_one_request(
+    make_client, warehouses_api, requests
+):
+    """Test warehouses are fetched in one request."""
+    ids = [*WAREHOUSES, "V2FyZWhvdXNlOjk5"]
+
+    warehouses = await make_client(warehouses_api).warehouses_details(ids)
+
+    assert len(requests) == 1
+    assert requests[0]["operationName"] == "WarehouseDetailsBatch"
+    assert list(requests[0]["variables"].values()) == ids
+    assert list(warehouses) == ids
+    assert warehouses["V2FyZWhvdXNlOjk5"] is None
+    first = warehouses["V2FyZWhvdXNlOjE="]
+    assert isinstance(first, WarehouseDetailsWarehouse)
+    assert first.name == "Warehouse V2FyZWhvdXNlOjE="
+
+
+@pytest.mark.asyncio
+async def test_warehouses_are_fetched_in_chunks(
+    make_client, warehouses_api, requests, monkeypatch
+):
+    """Test many warehouses are fetched in chunks."""
+    monkeypatch.setattr("saleor_mcp.client.WAREHOUSES_PER_QUERY", 2)
+
+    warehouses = await make_client(
+        warehouses_api, validate_responses=False
+    ).warehouses_details(list(WAREHOUSES))
+
+    assert [len(request["variables"]) for request in requests] == [2, 1]
+    assert all(isinstance(warehouse, TrustedData) for warehouse in warehouses.values())
+    assert list(warehouses.values()) == list(WAREHOUSES.values())
+
+
+@pytest.mark.asyncio
+async def test_warehouses_are_cached_one_by_one(make_client, warehouses_api, requests):
+    """Test warehouses are cached one by one."""
+    cache = ResponseCache(ttls={"WarehouseDetails": 300})
+    client = make_client(warehouses_api, cache=cache)
+    first, second, third = WAREHOUSES
+
+    await client.warehouses_details([first, second, "V2FyZWhvdXNlOjk5"])
+    warehouses = await client.warehouses_details(
+        [second, third, "V2FyZWhvdXNlOjk5", first]
+    )
+
+    assert len(requests) == 2
+    # Missing warehouses are not cached, so they are asked for again.
+    assert list(requests[1]["variables"].values()) == [third, "V2FyZWhvdXNlOjk5"]
+    assert list(warehouses) == [second, third, "V2FyZWhvdXNlOjk5", first]
+    assert warehouses[third].id == third
+
+    await client.warehouses_details([first, second, third])
+    assert len(requests) == 2
@@ -0,0 +1,147 @@
+import pytest
+
+from saleor_mcp.cache import response_cache
+from saleor_mcp.cache_backends import MemoryCacheBackend
+from saleor_mcp.client import SaleorClient
+from saleor_mcp.client_registry import ClientRegistry
+from saleor_mcp.watermarks import (
+    Changes,
+    Watermark,
+    WatermarkStore,
+    fetch_changes,
+    watermark_key,
+    watermark_store,
+)
+
+API_URL = "https://a.saleor.cloud/graphql/"
+
+
+class FakePages:
+    """Serve pages of objects updated since a time, sorted by update time."""
+
+    def __init__(self, objects, page_size=2):
+        self.objects = objects
+        self.page_size = page_size
+        self.calls = []
+
+    async def __call__(self, updated_gte, after):
+        self.calls.append((updated_gte, after))
+        objects = sorted(
+            (obj for obj in self.objects if obj["updatedAt"] >= updated_gte),
+            key=lambda obj: obj["updatedAt"],
+        )
+        start = int(after or 0)
+        end = start + self.page_size
+        page_info = {"hasNextPage": end < len(objects), "endCursor": str(end)}
+        return [{"node": obj} for obj in objects[start:end]], page_info
+
+
+def updated(id, minute):
+    return {"id": id, "updatedAt": f"2025-01-01T10:{minute:02}:00+00:00"}
+
+
+@pytest.fixture
+def store(clock):
+    # 2025-01-01T00:00:00+00:00
+    clock.now = 1735689600.0
+    return WatermarkStore(MemoryCacheBackend(), ttl=60.0, clock=clock)
+
+
+def ids(edges):
+    return [edge["node"]["id"] for edge in edges]
+
+
+@pytest.mark.asyncio
+async def test_first_poll_starts_at_current_time(store):
+    """Test the first poll starts at the current time."""
+    pages = FakePages([updated("1", 0)])
+
+    changes = await fetch_changes(store, "key", None, pages)
+
+    assert changes == Changes(
+        edges=[], watermark="2025-01-01T00:00:00+00:00", has_more=False, reset=True
+    )
+    assert pages.calls == []
+    assert await store.get("key") == Watermark(updated_at=changes.watermark)
+
+
+@pytest.mark.asyncio
+async def test_polls_return_changes_since_the_watermark(store):
+    """Test polls return changes since the watermark."""
+    pages = FakePages([updated("1", 0), updated("2", 1), updated("3", 2)])
+    since = "2025-01-01T10:00:00+00:00"
+
+    changes = await fetch_changes(store, "key", since, pages)
+    assert ids(changes.edges) == ["1", "2"]
+    assert changes.watermark == "2025-01-01T10:01:00+00:00"
+    assert changes.has_more
+    assert not changes.reset
+
+    changes = await fetch_changes(store, "key", None, pages)
+    # The object updated at the watermark isn't returned again.
+    assert ids(changes.edges) == ["3"]
+    assert changes.watermark == "2025-01-01T10:02:00+00:00"
+    assert not changes.has_more
+
+    pages.objects.append(updated("1", 3))
+    changes = await fetch_changes(store, "key", None, pages)
+    assert ids(changes.edges) == ["1"]
+
+    changes = await fetch_changes(store, "key", None, pages)
+    assert (changes.edges, changes.has_more, changes.reset) == ([], False, False)
+
+
+@pytest.mark.asyncio
+async def test_objects_updated_at_the_same_time_are_returned_once(store):
+    """Test objects updated at the same time are returned once."""
+    pages = FakePages([updated(str(id), 0) for id in range(5)])
+    since = "2025-01-01T10:00:00+00:00"
+
+    returned = []
+    changes = await fetch_changes(store, "key", since, pages)
+    returned += ids(changes.edges)
+    while changes.has_more:
+        changes = await fetch_changes(store, "key", None, pages)
+        returned += ids(changes.edges)
+
+    assert returned == ["0", "1", "2", "3", "4"]
+    assert (await store.get("key")).ids == returned
+    # Pages of objects returned before are passed over.
+    assert pages.calls[-1] == (since, "4")
+
+
+@pytest.mark.asyncio
+async def test_expired_watermarks_are_reset(store):
+    """Test expired watermarks are reset."""
+    pages = FakePages([updated("1", 0)])
+    await store.set("key", Watermark(updated_at="2025-01-01T09:00:00+00:00"))
+
+    store.clock.now += 61
+
+    assert await store.get("key") is None
+    changes = await fetch_changes(store, "key", None, pages)
+    assert changes.reset
+    assert changes.edges == []
+
+
+def test_watermark_keys_are_per_token_poller_and_filter():
+    """Test watermarks are kept per token, poller and filter."""
+    registry = ClientRegistry()
+    client = SaleorClient(
+        url=API_URL, headers={"Authorization": "Bearer a"}, registry=registry
+    )
+    other_client = SaleorClient(
+        url=API_URL, headers={"Authorization": "Bearer b"}, registry=registry
+    )
+    key = watermark_key(client, "job", "orders", {"search": "a"})
+
+    assert key == watermark_key(client, "job", "orders", {"search": "a"})
+    assert key != watermark_key(other_client, "job", "orders", {"search": "a"})
+    assert key != watermark_key(client, "other-job", "orders", {"search": "a"})
+    assert key != watermark_key(client, "job", "products", {"search": "a"})
+    assert key != watermark_key(client, "job", "orders", {"search": "b"})
+
+
+def test_watermarks_are_not_stored_with_cached_responses():
+    """Test watermarks aren't stored with cached responses."""
+    assert watermark_store.backend is not response_cache.backend
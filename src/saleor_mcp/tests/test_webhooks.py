@@ -0,0 +1,196 @@
+import hashlib
+import hmac
+import json
+
+import httpx
+import pytest
+
+from saleor_mcp.cache import ResponseCache, cache_key
+from saleor_mcp.main import app
+from saleor_mcp.webhooks import webhook_secret
+
+API_URL = "https://example.saleor.cloud/graphql/"
+SECRET = "webhook-secret"
+
+PRODUCT_UPDATED_PAYLOAD = [
+    {
+        "type": "Product",
+        "id": "UHJvZHVjdDo3Mg==",
+        "name": "Apple Juice",
+        "slug": "apple-juice",
+        "product_type": "UHJvZHVjdFR5cGU6OQ==",
+        "category": "Q2F0ZWdvcnk6Mzk=",
+        "updated_at": "2024-05-07T10:12:41.112Z",
+        "meta": {
+            "issued_at": "2024-05-07T10:12:41.180Z",
+            "version": "3.21.0",
+            "issuing_principal": {"id": "VXNlcjox", "type": "user"},
+        },
+    }
+]
+
+WAREHOUSE_UPDATED_PAYLOAD = {
+    "warehouse": {
+        "id": "V2FyZWhvdXNlOjE=",
+        "name": "US East Warehouse",
+        "slug": "us-east",
+    }
+}
+
+
+def sign(body: bytes, api_url: str = API_URL) -> str:
+    secret = webhook_secret(SECRET, api_url)
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ResponseCache(
+        ttls={
+            "ListChannels": 60,
+            "WarehouseDetails": 60,
+            "ListProducts": 60,
+            "ListStocks": 60,
+            "ListOrders": 60,
+        }
+    )
+    monkeypatch.setattr("saleor_mcp.webhooks.response_cache", cache)
+    monkeypatch.setenv("WEBHOOK_SECRET_KEY", SECRET)
+    monkeypatch.delenv("ALLOWED_DOMAIN_PATTERN", raising=False)
+    return cache
+
+
+async def store(cache, name, operation_name, api_url=API_URL):
+    key = cache_key(api_url, operation_name, name)
+    await cache.set(key, b"{}", operation_name)
+    return key
+
+
+async def post_webhook(payload, event, api_url=API_URL, signature=None):
+    body = json.dumps(payload).encode()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        return await client.post(
+            "/webhooks/saleor",
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "Saleor-Event": event,
+                "Saleor-Api-Url": api_url,
+                "Saleor-Signature": signature or sign(body, api_url),
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_product_updated_evicts_products_and_stocks(cache):
+    """Test product updates evict cached products and stocks."""
+    await store(cache, "token-1", "ListProducts")
+    await store(cache, "token-2", "ListProducts")
+    await store(cache, "stocks", "ListStocks")
+    orders = await store(cache, "orders", "ListOrders")
+    channels = await store(cache, "channels", "ListChannels")
+
+    response = await post_webhook(PRODUCT_UPDATED_PAYLOAD, "product_updated")
+
+    assert response.status_code == 200
+    assert response.json() == {"event": "PRODUCT_UPDATED", "invalidated": 3}
+    assert await cache.get(orders) is not None
+    assert await cache.get(channels) is not None
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_warehouse_updated_evicts_warehouses_and_channels(cache):
+    """Test warehouse updates evict cached warehouses and channels."""
+    await store(cache, "warehouse", "WarehouseDetails")
+    await store(cache, "channels", "ListChannels")
+    products = await store(cache, "products", "ListProducts")
+
+    response = await post_webhook(WAREHOUSE_UPDATED_PAYLOAD, "WAREHOUSE_UPDATED")
+
+    assert response.json()["invalidated"] == 2
+    assert await cache.get(products) is not None
+
+
+@pytest.mark.asyncio
+async def test_only_entries_of_sending_instance_are_evicted(cache):
+    """Test only entries of the sending Saleor instance are evicted."""
+    await store(cache, "a", "ListProducts")
+    b = await store(
+        cache, "b", "ListProducts", api_url="https://other.saleor.cloud/graphql/"
+    )
+
+    response = await post_webhook(
+        PRODUCT_UPDATED_PAYLOAD, "PRODUCT_UPDATED", api_url=API_URL.rstrip("/")
+    )
+
+    assert response.json()["invalidated"] == 1
+    assert await cache.get(b) is not None
+
+
+@pytest.mark.asyncio
+async def test_unknown_event_is_acknowledged(cache):
+    """Test unknown events are acknowledged."""
+    await store(cache, "products", "ListProducts")
+
+    response = await post_webhook({}, "APP_INSTALLED")
+
+    assert response.status_code == 200
+    assert response.json()["invalidated"] == 0
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_signature_is_rejected(cache):
+    """Test webhooks with an invalid signature are rejected."""
+    await store(cache, "products", "ListProducts")
+
+    response = await post_webhook(
+        PRODUCT_UPDATED_PAYLOAD, "PRODUCT_UPDATED", signature=sign(b"other")
+    )
+
+    assert response.status_code == 401
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_signatures_are_only_valid_for_their_api_url(cache):
+    """Test signatures are only valid for their API URL."""
+    await store(cache, "products", "ListProducts")
+    body = json.dumps(PRODUCT_UPDATED_PAYLOAD).encode()
+
+    for signature in (
+        sign(body, "https://other.saleor.cloud/graphql/"),
+        hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest(),
+    ):
+        response = await post_webhook(
+            PRODUCT_UPDATED_PAYLOAD, "PRODUCT_UPDATED", signature=signature
+        )
+        assert response.status_code == 401
+
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_not_allowed_api_url_is_rejected(cache, monkeypatch):
+    """Test webhooks of API URLs that aren't allowed are rejected."""
+    monkeypatch.setenv("ALLOWED_DOMAIN_PATTERN", r"https://.*\.saleor\.cloud/graphql/")
+
+    response = await post_webhook(
+        PRODUCT_UPDATED_PAYLOAD, "PRODUCT_UPDATED", api_url="https://evil.com/"
+    )
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_webhooks_are_disabled_without_secret_key(cache, monkeypatch):
+    """Test webhooks are disabled without a secret key."""
+    monkeypatch.delenv("WEBHOOK_SECRET_KEY")
+
+    response = await post_webhook(PRODUCT_UPDATED_PAYLOAD, "PRODUCT_UPDATED")
+
+    assert response.status_code == 404
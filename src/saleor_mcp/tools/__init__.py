@@ -1,5 +1,6 @@
 from .channels import channels_router
 from .customers import customers_router
+from .exports import exports_router
 from .orders import orders_router
 from .products import products_router
 from .utils import utils_router
@@ -7,6 +8,7 @@ from .utils import utils_router
 __all__ = [
     "channels_router",
     "customers_router",
+    "exports_router",
     "orders_router",
     "products_router",
     "utils_router",
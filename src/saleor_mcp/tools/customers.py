@@ -2,6 +2,7 @@ from typing import Annotated, Any, Optional
 
 from fastmcp import Context, FastMCP
 
+from ..batch import batch_fetcher
 from ..ctx_utils import get_saleor_client
 from ..saleor_client.base_model import BaseModel
 from ..saleor_client.input_types import (
@@ -9,6 +10,7 @@ from ..saleor_client.input_types import (
     DateTimeRangeInput,
     UserSortingInput,
 )
+from .results import IncludeTotal, ResultFormat, SelectedFields, ids_result, page_result
 
 customers_router = FastMCP("Customers MCP")
 
@@ -40,6 +42,9 @@ async def customers(
     filter: Annotated[
         CustomerFilterInput | None, "Filter customers by specific criteria"
     ] = None,
+    fields: SelectedFields = None,
+    include_total: IncludeTotal = False,
+    format: ResultFormat = "json",
 ) -> dict[str, Any]:
     """Fetch list of customers from Saleor GraphQL API.
 
@@ -59,6 +64,8 @@ async def customers(
             after=after,
             sortBy=sort_by,
             filter=filter,
+            withTotal=include_total,
+            fields=fields,
         )
     except Exception as e:
         error_msg = str(e)
@@ -68,13 +75,52 @@ async def customers(
         await ctx.error(str(e))
         raise
 
-    customers_data = data.customers
-    edges = customers_data.edges if customers_data and customers_data.edges else []
-    page_info = customers_data.pageInfo if customers_data else None
-    return {
-        "data": {
-            "customers": edges,
-            "pageInfo": page_info,
-            "totalFetched": len(edges),
-        },
+    return page_result(data, "customers", format, include_total)
+
+
+@customers_router.tool(
+    annotations={
+        "title": "Fetch customers by IDs",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
     }
+)
+async def customers_by_ids(
+    ctx: Context,
+    ids: Annotated[list[str], "IDs of customers to fetch"],
+    fields: SelectedFields = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch customers with the given IDs from Saleor GraphQL API.
+
+    This tool retrieves the same information as the `customers` tool for a list of
+    customer IDs, like the ones found in results of other tools. Customers are
+    returned in the order of the IDs, and IDs of customers which weren't found are
+    listed in `notFound`.
+
+    Args:
+        ctx (Context): The tool execution context.
+        ids (list[str]): IDs of customers to fetch.
+        fields (list[str] | None): Fields of the customers to fetch.
+        format (str): Format of the returned customers, `json` or `table`.
+
+    """
+
+    client = get_saleor_client()
+    # IDs are needed to put the customers in order.
+    fields = [*fields, "id"] if fields else None
+
+    async def fetch_page(ids: list[str]) -> list[Any]:
+        data = await client.list_customers(
+            first=len(ids), filter={"ids": ids}, fields=fields
+        )
+        return data.customers.edges if data.customers else []
+
+    try:
+        edges_by_id = await batch_fetcher.fetch(ids, fetch_page)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return ids_result(edges_by_id, ids, "customers", format)
@@ -0,0 +1,151 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
+
+from fastmcp import Context, FastMCP
+
+from ..client import SaleorClient
+from ..ctx_utils import get_saleor_client
+from ..exports import EXPORT_MIME_TYPE, export_owner, export_store
+from ..saleor_client.input_types import OrderFilterInput
+from ..scans import order_scanner
+from .results import SelectedFields
+
+exports_router = FastMCP("Exports MCP")
+
+
+def client_owner(client: SaleorClient) -> str:
+    return export_owner(client.url, (client.headers or {}).get("Authorization", ""))
+
+
+async def nodes(
+    client: SaleorClient,
+    operation_name: str,
+    fields: list[str] | None,
+    **variables: Any,
+) -> AsyncIterator[list[Any]]:
+    async for connection in client.iter_pages(operation_name, fields, **variables):
+        yield [edge["node"] for edge in connection.get("edges") or []]
+
+
+async def export(
+    ctx: Context,
+    client: SaleorClient,
+    pages: AsyncIterator[list[Any]],
+    total: int | None = None,
+) -> dict[str, Any]:
+    async def on_page(rows: int) -> None:
+        await ctx.report_progress(rows, total, message=f"Exported {rows} objects")
+
+    try:
+        result = await export_store.write(client_owner(client), pages, on_page)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return {
+        "data": {
+            "uri": result.uri,
+            "mimeType": EXPORT_MIME_TYPE,
+            "rows": result.rows,
+            "size": result.size,
+        }
+    }
+
+
+@exports_router.tool(
+    annotations={
+        "title": "Export orders",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    }
+)
+async def export_orders(
+    ctx: Context,
+    filter: Annotated[
+        OrderFilterInput | None, "Filter and search orders by specific criteria"
+    ] = None,
+    fields: SelectedFields = None,
+) -> dict[str, Any]:
+    """Export all orders matching the filter to a file.
+
+    This tool goes through all orders, in ranges of days fetched concurrently, and
+    writes them, oldest first and one JSON object per line, into a gzipped NDJSON
+    file. Orders have the same fields as in the `orders` tool, unless only some
+    `fields` are selected. The file is returned as a `export://` resource URI, which
+    can be read by the MCP client, instead of the orders, so exporting doesn't fill
+    the context. Exports are removed after an hour by default.
+
+    Args:
+        ctx (Context): The tool execution context.
+        filter (OrderFilterInput | None): Filter and search orders by specific criteria.
+        fields (list[str] | None): Fields of the orders to export.
+
+    """
+
+    order_filter = filter.model_dump(exclude_unset=True) if filter else None
+
+    client = get_saleor_client()
+    try:
+        shards = await order_scanner.shards(client, order_filter)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return await export(
+        ctx,
+        client,
+        order_scanner.scan(client, order_filter, fields, shards),
+        total=sum(shard.count for shard in shards),
+    )
+
+
+@exports_router.tool(
+    annotations={
+        "title": "Export products",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    }
+)
+async def export_products(
+    ctx: Context,
+    channel: Annotated[
+        str | None,
+        "Slug of a channel for which the data should be returned. If not provided, "
+        "general product data is returned.",
+    ] = None,
+    search: Annotated[str | None, "Search products with full-text search"] = None,
+    fields: SelectedFields = None,
+) -> dict[str, Any]:
+    """Export all products to a file.
+
+    This tool goes through all pages of products and writes them, one JSON object
+    per line, into a gzipped NDJSON file. Products have the same fields as in the
+    `products` tool, unless only some `fields` are selected. The file is returned
+    as a `export://` resource URI, which can be read by the MCP client, instead of
+    the products, so exporting doesn't fill the context. Exports are removed after
+    an hour by default.
+
+    Args:
+        ctx (Context): The tool execution context.
+        channel (str | None): Slug of a channel for which the data should be returned.
+        search (str | None): Search products with full-text search.
+        fields (list[str] | None): Fields of the products to export.
+
+    """
+
+    client = get_saleor_client()
+    return await export(
+        ctx,
+        client,
+        nodes(client, "ListProducts", fields, channel=channel, search=search),
+    )
+
+
+@exports_router.resource("export://{export_id}", mime_type=EXPORT_MIME_TYPE)
+async def export_file(export_id: str) -> bytes:
+    """Gzipped NDJSON file of an export, with one exported object per line."""
+
+    owner = client_owner(get_saleor_client())
+    path = await asyncio.to_thread(export_store.open, export_id, owner)
+    return await asyncio.to_thread(path.read_bytes)
@@ -1,14 +1,39 @@
+from contextlib import aclosing
+from datetime import UTC, date, datetime
 from typing import Annotated, Any, Optional
 
 from fastmcp import Context, FastMCP
+from pydantic import Field
 
+from ..aggregates import (
+    DEFAULT_GROUP_BY,
+    Bucket,
+    GroupBy,
+    OrderAggregator,
+    date_buckets,
+)
+from ..batch import MAX_PAGE_SIZE, batch_fetcher
 from ..ctx_utils import get_saleor_client
 from ..saleor_client.base_model import BaseModel
+from ..saleor_client.enums import ReportingPeriod
 from ..saleor_client.input_types import (
     DateRangeInput,
     DateTimeRangeInput,
     OrderSortingInput,
 )
+from ..scans import created_between, limit_shards, order_scanner
+from ..sorting import LAST_MODIFIED_ASC
+from ..watermarks import fetch_changes, watermark_key, watermark_store
+from .results import (
+    IncludeTotal,
+    Poller,
+    ResultFormat,
+    SelectedFields,
+    changes_result,
+    connection_page,
+    ids_result,
+    page_result,
+)
 
 orders_router = FastMCP("Orders MCP")
 
@@ -41,6 +66,9 @@ async def orders(
     filter: Annotated[
         OrderFilterInput | None, "Filter and search orders by specific criteria"
     ] = None,
+    fields: SelectedFields = None,
+    include_total: IncludeTotal = False,
+    format: ResultFormat = "json",
 ) -> dict[str, Any]:
     """Fetch list of orders from Saleor GraphQL API.
 
@@ -55,6 +83,9 @@ async def orders(
         after (str | None): Cursor for pagination - fetch orders after this cursor.
         sort_by (OrderSortingInput | None): Sort orders by specific field.
         filter (OrderFilterInput | None): Filter and search orders by specific criteria.
+        fields (list[str] | None): Fields of the orders to fetch.
+        include_total (bool): Whether to return the total number of orders.
+        format (str): Format of the returned orders, `json` or `table`.
 
     """
 
@@ -65,23 +96,66 @@ async def orders(
     client = get_saleor_client()
     try:
         data = await client.list_orders(
-            first=first, after=after, sortBy=sort_by, filter=filter
+            first=first,
+            after=after,
+            sortBy=sort_by,
+            filter=filter,
+            withTotal=include_total,
+            fields=fields,
         )
     except Exception as e:
         await ctx.error(str(e))
         raise
 
-    orders_data = data.orders
-    edges = orders_data.edges if orders_data and orders_data.edges else []
-    page_info = orders_data.pageInfo if orders_data else None
+    return page_result(data, "orders", format, include_total)
 
-    return {
-        "data": {
-            "orders": edges,
-            "pageInfo": page_info,
-            "totalFetched": len(edges),
-        },
+
+@orders_router.tool(
+    annotations={
+        "title": "Fetch orders by IDs",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
     }
+)
+async def orders_by_ids(
+    ctx: Context,
+    ids: Annotated[list[str], "IDs of orders to fetch"],
+    fields: SelectedFields = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch orders with the given IDs from Saleor GraphQL API.
+
+    This tool retrieves the same information as the `orders` tool for a list of
+    order IDs, like the ones found in results of other tools. Orders are
+    returned in the order of the IDs, and IDs of orders which weren't found are
+    listed in `notFound`.
+
+    Args:
+        ctx (Context): The tool execution context.
+        ids (list[str]): IDs of orders to fetch.
+        fields (list[str] | None): Fields of the orders to fetch.
+        format (str): Format of the returned orders, `json` or `table`.
+
+    """
+
+    client = get_saleor_client()
+    # IDs are needed to put the orders in order.
+    fields = [*fields, "id"] if fields else None
+
+    async def fetch_page(ids: list[str]) -> list[Any]:
+        data = await client.list_orders(
+            first=len(ids), filter={"ids": ids}, fields=fields
+        )
+        return data.orders.edges if data.orders else []
+
+    try:
+        edges_by_id = await batch_fetcher.fetch(ids, fetch_page)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return ids_result(edges_by_id, ids, "orders", format)
 
 
 @orders_router.tool(
@@ -121,3 +195,255 @@ async def order_count(
     return {
         "data": {"totalCount": data.orders.totalCount if data and data.orders else 0}
     }
+
+
+@orders_router.tool(
+    annotations={
+        "title": "Fetch orders total",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def orders_total(
+    ctx: Context,
+    period: Annotated[
+        ReportingPeriod, "Period of time: `TODAY` or `THIS_MONTH`"
+    ] = ReportingPeriod.TODAY,
+    channel: Annotated[
+        str | None, "Slug of a channel for which the total should be returned"
+    ] = None,
+) -> dict[str, Any]:
+    """Fetch total sales amount of orders from a period from Saleor GraphQL API.
+
+    This tool retrieves the gross and net total of orders placed today or this month,
+    computed by Saleor in a single query, which is much cheaper than going through
+    the orders.
+
+    Args:
+        ctx (Context): The tool execution context.
+        period (ReportingPeriod): Period of time.
+        channel (str | None): Slug of a channel for which the total should be returned.
+
+    """
+
+    data = {}
+    client = get_saleor_client()
+    try:
+        data = await client.orders_total(period=period, channel=channel)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return {"data": {"ordersTotal": data.ordersTotal}}
+
+
+@orders_router.tool(
+    annotations={
+        "title": "Fetch orders count series",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def order_count_series(
+    ctx: Context,
+    gte: Annotated[date, "First day of the series"],
+    lte: Annotated[date | None, "Last day of the series. Defaults to today."] = None,
+    bucket: Annotated[
+        Bucket,
+        "Count orders created each `day`, `week` (starting on Monday) or `month`",
+    ] = "day",
+    filter: Annotated[
+        OrderFilterInput | None, "Filter and search orders by specific criteria"
+    ] = None,
+) -> dict[str, Any]:
+    """Fetch counts of orders created in each day, week or month of a date range.
+
+    This tool retrieves the number of orders matching the filter for every bucket
+    of the range, like a daily trend of orders over the last 30 days, in a single
+    call. The `created` criteria of the filter is replaced by the buckets.
+
+    Args:
+        ctx (Context): The tool execution context.
+        gte (date): First day of the series.
+        lte (date | None): Last day of the series.
+        bucket (str): Size of the buckets.
+        filter (OrderFilterInput | None): Filter and search orders by specific criteria.
+
+    """
+
+    order_filter = filter.model_dump(exclude_unset=True) if filter else None
+    buckets = date_buckets(gte, lte or datetime.now(UTC).date(), bucket)
+
+    client = get_saleor_client()
+    try:
+        counts = await client.count_orders_batch(
+            [created_between(order_filter, start, end) for start, end in buckets]
+        )
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return {
+        "data": {
+            "series": [
+                {"start": start, "end": end, "totalCount": count}
+                for (start, end), count in zip(buckets, counts, strict=True)
+            ],
+            "totalCount": sum(counts),
+        }
+    }
+
+
+@orders_router.tool(
+    annotations={
+        "title": "Aggregate orders",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def order_aggregates(
+    ctx: Context,
+    group_by: Annotated[
+        list[GroupBy] | None,
+        "Keys to group orders by: `day` or `month` of creation, `status`, "
+        "`channel` slug, `country` code of the shipping address, or `currency`. "
+        "Orders are always grouped by currency as well. Defaults to `day`.",
+    ] = None,
+    filter: Annotated[
+        OrderFilterInput | None, "Filter and search orders by specific criteria"
+    ] = None,
+    max_orders: Annotated[
+        int,
+        Field(
+            ge=1, description="Maximum number of orders to go through (default 10000)"
+        ),
+    ] = 10_000,
+) -> dict[str, Any]:
+    """Aggregate orders from Saleor GraphQL API.
+
+    This tool goes through all orders matching the filter, in ranges of days fetched
+    concurrently, and returns the number of orders and the sum of their gross totals
+    in groups, like revenue by day and channel. Only the summary is returned, not
+    the orders. When there are more than `max_orders` orders, only the oldest ones
+    are aggregated, and `truncated` is set.
+
+    Args:
+        ctx (Context): The tool execution context.
+        group_by (list[str] | None): Keys to group orders by.
+        filter (OrderFilterInput | None): Filter and search orders by specific criteria.
+        max_orders (int): Maximum number of orders to go through.
+
+    """
+
+    order_filter = filter.model_dump(exclude_unset=True) if filter else None
+
+    aggregator = OrderAggregator(group_by or DEFAULT_GROUP_BY)
+    client = get_saleor_client()
+    try:
+        shards = await order_scanner.shards(client, order_filter)
+        total = sum(shard.count for shard in shards)
+        # Closing the scan when stopping early cancels the shards still fetched.
+        async with aclosing(
+            order_scanner.scan(
+                client,
+                order_filter,
+                aggregator.fields,
+                # Shards of orders past `max_orders` aren't fetched.
+                shards=limit_shards(shards, max_orders),
+                page_size=min(MAX_PAGE_SIZE, max_orders),
+            )
+        ) as scan:
+            async for orders in scan:
+                for order in orders[: max_orders - aggregator.orders]:
+                    aggregator.add(order)
+                await ctx.report_progress(aggregator.orders, min(total, max_orders))
+                if aggregator.orders >= max_orders:
+                    break
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return {
+        "data": {
+            "groups": aggregator.groups(),
+            "totalOrders": aggregator.orders,
+            "truncated": aggregator.orders >= max_orders and total > max_orders,
+        }
+    }
+
+
+@orders_router.tool(
+    annotations={
+        "title": "Fetch orders changed since the last poll",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    }
+)
+async def orders_changed_since(
+    ctx: Context,
+    poller: Poller,
+    since: Annotated[
+        datetime | None,
+        "Fetch orders updated since this time, instead of since the last poll",
+    ] = None,
+    filter: Annotated[
+        OrderFilterInput | None, "Filter and search orders by specific criteria"
+    ] = None,
+    first: Annotated[
+        int, "Number of orders to fetch (max 100 per request)"
+    ] = MAX_PAGE_SIZE,
+    fields: SelectedFields = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch orders updated since the last poll from Saleor GraphQL API.
+
+    This tool returns only the orders updated since the previous call with the same
+    `poller` and filter, oldest update first, instead of listing all orders again.
+    The first poll only starts watching for changes and returns no orders, with
+    `reset` set, unless `since` is given. The returned `watermark` is the time of the
+    last update returned, and `hasMore` is set when there are more changes, to be
+    fetched by calling the tool again. Watermarks are forgotten after a week by
+    default. When `reset` is set on a later poll, changes since the previous
+    watermark weren't returned, and passing it as `since` fetches them.
+
+    Args:
+        ctx (Context): The tool execution context.
+        poller (str): Name of the poller the watermark is kept for.
+        since (datetime | None): Fetch orders updated since this time.
+        filter (OrderFilterInput | None): Filter and search orders by specific criteria.
+        first (int): Number of orders to fetch.
+        fields (list[str] | None): Fields of the orders to fetch.
+        format (str): Format of the returned orders, `json` or `table`.
+
+    """
+
+    order_filter = filter.model_dump(exclude_unset=True) if filter else {}
+    # IDs and update times are needed to move the watermark on.
+    fields = [*fields, "id", "updatedAt"] if fields else None
+
+    client = get_saleor_client()
+
+    async def fetch_page(updated_gte: str, after: str | None) -> tuple[list[Any], Any]:
+        updated_at = {**(order_filter.get("updatedAt") or {}), "gte": updated_gte}
+        data = await client.list_orders(
+            first=first,
+            after=after,
+            sortBy=LAST_MODIFIED_ASC,
+            filter={**order_filter, "updatedAt": updated_at},
+            fields=fields,
+        )
+        return connection_page(data, "orders")
+
+    try:
+        key = watermark_key(client, poller, "orders", order_filter)
+        changes = await fetch_changes(
+            watermark_store, key, since.isoformat() if since else None, fetch_page
+        )
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return changes_result(changes, "orders", format)
@@ -1,12 +1,28 @@
-from typing import Annotated, Any
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
 from fastmcp import Context, FastMCP
 
+from ..batch import MAX_PAGE_SIZE, batch_fetcher
+from ..catalog import catalog_mirrors
 from ..ctx_utils import get_saleor_client
+from ..saleor_client.enums import ReportingPeriod
 from ..saleor_client.input_types import (
     ProductOrder,
     StockFilterInput,
 )
+from ..sorting import LAST_MODIFIED_ASC
+from ..watermarks import fetch_changes, watermark_key, watermark_store
+from .results import (
+    IncludeTotal,
+    Poller,
+    ResultFormat,
+    SelectedFields,
+    changes_result,
+    connection_page,
+    ids_result,
+    page_result,
+)
 
 products_router = FastMCP("Products MCP")
 
@@ -34,6 +50,9 @@ async def products(
     ] = None,
     sort_by: Annotated[ProductOrder | None, "Sort products by specific field"] = None,
     search: Annotated[str | None, "Search products with full-text search"] = None,
+    fields: SelectedFields = None,
+    include_total: IncludeTotal = False,
+    format: ResultFormat = "json",
 ) -> dict[str, Any]:
     """Fetch list of products from Saleor GraphQL API.
 
@@ -45,34 +64,278 @@ async def products(
     product data specific to that channel. Otherwise, it will return general product
     data.
 
+    When the local catalog mirror is enabled, searches for general product data are
+    served from it.
+
     """
 
     sort_by = sort_by.model_dump(exclude_unset=True) if sort_by else None
 
-    data = {}
+    data = None
     client = get_saleor_client()
     try:
+        if (
+            catalog_mirrors is not None
+            and search
+            and not (channel or sort_by or fields)
+        ):
+            data = await catalog_mirrors.search_page(
+                client, search, first or 100, after
+            )
+        if data is None:
+            data = await client.list_products(
+                first=first,
+                after=after,
+                channel=channel,
+                sortBy=sort_by,
+                search=search,
+                withTotal=include_total,
+                fields=fields,
+            )
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return page_result(data, "products", format, include_total)
+
+
+@products_router.tool(
+    annotations={
+        "title": "Fetch products changed since the last poll",
+        "readOnlyHint": True,
+        "openWorldHint": True,
+    }
+)
+async def products_changed_since(
+    ctx: Context,
+    poller: Poller,
+    since: Annotated[
+        datetime | None,
+        "Fetch products updated since this time, instead of since the last poll",
+    ] = None,
+    channel: Annotated[
+        str | None,
+        "Slug of a channel for which the data should be returned. If not provided, "
+        "general product data is returned.",
+    ] = None,
+    first: Annotated[
+        int, "Number of products to fetch (max 100 per request)"
+    ] = MAX_PAGE_SIZE,
+    fields: SelectedFields = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch products updated since the last poll from Saleor GraphQL API.
+
+    This tool returns only the products updated since the previous call with the
+    same `poller` and channel, oldest update first, instead of listing all products
+    again. The first poll only starts watching for changes and returns no products, with
+    `reset` set, unless `since` is given. The returned `watermark` is the time of the
+    last update returned, and `hasMore` is set when there are more changes, to be
+    fetched by calling the tool again. Watermarks are forgotten after a week by
+    default. When `reset` is set on a later poll, changes since the previous
+    watermark weren't returned, and passing it as `since` fetches them.
+
+    Args:
+        ctx (Context): The tool execution context.
+        poller (str): Name of the poller the watermark is kept for.
+        since (datetime | None): Fetch products updated since this time.
+        channel (str | None): Slug of a channel for which the data should be returned.
+        first (int): Number of products to fetch.
+        fields (list[str] | None): Fields of the products to fetch.
+        format (str): Format of the returned products, `json` or `table`.
+
+    """
+
+    # IDs and update times are needed to move the watermark on.
+    fields = [*fields, "id", "updatedAt"] if fields else None
+
+    client = get_saleor_client()
+
+    async def fetch_page(updated_gte: str, after: str | None) -> tuple[list[Any], Any]:
         data = await client.list_products(
             first=first,
             after=after,
             channel=channel,
-            sortBy=sort_by,
-            search=search,
+            where={"updatedAt": {"range": {"gte": updated_gte}}},
+            sortBy=LAST_MODIFIED_ASC,
+            fields=fields,
+        )
+        return connection_page(data, "products")
+
+    try:
+        key = watermark_key(client, poller, "products", {"channel": channel})
+        changes = await fetch_changes(
+            watermark_store, key, since.isoformat() if since else None, fetch_page
         )
     except Exception as e:
         await ctx.error(str(e))
         raise
 
-    products_data = data.products
-    edges = products_data.edges if products_data and products_data.edges else []
-    page_info = products_data.pageInfo if products_data else None
-    return {
-        "data": {
-            "products": edges,
-            "pageInfo": page_info,
-            "totalFetched": len(edges),
-        },
+    return changes_result(changes, "products", format)
+
+
+@products_router.tool(
+    annotations={
+        "title": "Fetch product sales report",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def product_sales_report(
+    ctx: Context,
+    channel: Annotated[str, "Slug of a channel for which the sales should be returned"],
+    period: Annotated[
+        ReportingPeriod, "Period of time: `TODAY` or `THIS_MONTH`"
+    ] = ReportingPeriod.TODAY,
+    first: Annotated[
+        int | None, "Number of product variants to fetch (max 100 per request)"
+    ] = 100,
+    after: Annotated[
+        str | None, "Cursor for pagination - fetch variants after this cursor"
+    ] = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch top selling product variants from Saleor GraphQL API.
+
+    This tool retrieves the product variants sold in a channel today or this month,
+    from the best selling ones, with their SKU, product, quantity ordered and the
+    revenue they generated in the period. Sales are computed by Saleor in a single
+    query, which is much cheaper than going through order lines.
+
+    Args:
+        ctx (Context): The tool execution context.
+        channel (str): Slug of a channel for which the sales should be returned.
+        period (ReportingPeriod): Period of time.
+        first (int | None): Number of product variants to fetch (max 100 per request).
+        after (str | None): Cursor for pagination - fetch variants after this cursor.
+        format (str): Format of the returned variants, `json` or `table`.
+
+    """
+
+    data = {}
+    client = get_saleor_client()
+    try:
+        data = await client.report_product_sales(
+            period=period, channel=channel, first=first, after=after
+        )
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return page_result(data, "reportProductSales", format)
+
+
+@products_router.tool(
+    annotations={
+        "title": "Fetch products by IDs",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def products_by_ids(
+    ctx: Context,
+    ids: Annotated[list[str], "IDs of products to fetch"],
+    channel: Annotated[
+        str | None,
+        "Slug of a channel for which the data should be returned. If not provided, "
+        "general product data is returned.",
+    ] = None,
+    fields: SelectedFields = None,
+    format: ResultFormat = "json",
+) -> dict[str, Any]:
+    """Fetch products with the given IDs from Saleor GraphQL API.
+
+    This tool retrieves the same information as the `products` tool for a list of
+    product IDs, like the ones found in results of other tools. Products are
+    returned in the order of the IDs, and IDs of products which weren't found are
+    listed in `notFound`.
+
+    Args:
+        ctx (Context): The tool execution context.
+        ids (list[str]): IDs of products to fetch.
+        channel (str | None): Slug of a channel for which the data should be returned.
+        fields (list[str] | None): Fields of the products to fetch.
+        format (str): Format of the returned products, `json` or `table`.
+
+    """
+
+    client = get_saleor_client()
+    # IDs are needed to put the products in order.
+    fields = [*fields, "id"] if fields else None
+
+    async def fetch_page(ids: list[str]) -> list[Any]:
+        data = await client.list_products(
+            first=len(ids), where={"ids": ids}, channel=channel, fields=fields
+        )
+        return data.products.edges if data.products else []
+
+    try:
+        edges_by_id = {}
+        if catalog_mirrors is not None and not (channel or fields):
+            edges_by_id = await catalog_mirrors.lookup(
+                client, batch_fetcher.unique_ids(ids)
+            )
+        missing = [id for id in ids if id not in edges_by_id]
+        if missing:
+            edges_by_id |= await batch_fetcher.fetch(missing, fetch_page)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return ids_result(edges_by_id, ids, "products", format)
+
+
+@products_router.tool(
+    annotations={
+        "title": "Fetch catalog sync status",
+        "readOnlyHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
     }
+)
+async def catalog_sync_status(
+    ctx: Context,
+    start_sync: Annotated[
+        Literal["incremental", "full"] | None,
+        "Start an `incremental` sync of products updated since the last sync, or a "
+        "`full` one, in the background",
+    ] = None,
+) -> dict[str, Any]:
+    """Fetch status of the local catalog mirror of the connected Saleor instance.
+
+    When enabled, the mirror keeps a copy of products and their variants, which
+    serves product searches and lookups by IDs without calling Saleor. This tool
+    returns whether the mirror is ready, the number of mirrored products and
+    variants, and times of the last syncs.
+
+    When `start_sync` is given, the tool isn't read-only: it starts a sync which
+    fetches products from Saleor in the background and writes them to the mirror.
+    The mirror is only used once a first sync started here completes. Starting a
+    sync while another one of the same mirror is running does nothing.
+
+    Args:
+        ctx (Context): The tool execution context.
+        start_sync (str | None): Kind of sync to start in the background, `incremental`
+            or `full`.
+
+    """
+
+    if catalog_mirrors is None:
+        return {"data": {"enabled": False}}
+
+    client = get_saleor_client()
+    try:
+        sync_started = start_sync is not None and await catalog_mirrors.start_sync(
+            client, full=start_sync == "full"
+        )
+        status = await catalog_mirrors.status(client)
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    return {"data": {"enabled": True, "syncStarted": sync_started, **status}}
 
 
 @products_router.tool(
@@ -94,6 +357,9 @@ async def stocks(
     filter: Annotated[
         StockFilterInput | None, "Filter stocks by specific criteria"
     ] = None,
+    fields: SelectedFields = None,
+    include_total: IncludeTotal = False,
+    format: ResultFormat = "json",
 ) -> dict[str, Any]:
     """Fetch list of stocks from Saleor GraphQL API.
 
@@ -111,21 +377,14 @@ async def stocks(
             first=first,
             after=after,
             filter=filter_data,
+            withTotal=include_total,
+            fields=fields,
         )
     except Exception as e:
         await ctx.error(str(e))
         raise
 
-    stocks_data = data.stocks
-    edges = stocks_data.edges if stocks_data and stocks_data.edges else []
-    page_info = stocks_data.pageInfo if stocks_data else None
-    return {
-        "data": {
-            "stocks": edges,
-            "pageInfo": page_info,
-            "totalFetched": len(edges),
-        },
-    }
+    return page_result(data, "stocks", format, include_total)
 
 
 @products_router.tool(
@@ -162,3 +421,50 @@ async def warehouse_details(
             "warehouse": warehouse_data,
         },
     }
+
+
+@products_router.tool(
+    annotations={
+        "title": "Fetch details of many warehouses",
+        "readOnlyHint": True,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    }
+)
+async def warehouses_details(
+    ctx: Context,
+    ids: Annotated[list[str], "IDs of the warehouses to fetch details for"],
+) -> dict[str, Any]:
+    """Fetch details of many warehouses from Saleor GraphQL API at once.
+
+    This tool retrieves the same information as the `warehouse_details` tool for
+    a list of warehouse IDs, in as few requests as possible. Warehouses are returned
+    in the order of the IDs, and IDs of warehouses which weren't found are listed in
+    `notFound`.
+
+    Args:
+        ctx (Context): The tool execution context.
+        ids (list[str]): IDs of the warehouses to fetch details for.
+
+    """
+
+    client = get_saleor_client()
+    try:
+        ids = batch_fetcher.unique_ids(ids)
+        warehouses = await client.warehouses_details(
+            ids, max_concurrency=batch_fetcher.max_concurrency
+        )
+    except Exception as e:
+        await ctx.error(str(e))
+        raise
+
+    found = [warehouse for warehouse in warehouses.values() if warehouse is not None]
+    return {
+        "data": {
+            "warehouses": found,
+            "notFound": [
+                id for id, warehouse in warehouses.items() if warehouse is None
+            ],
+            "totalFetched": len(found),
+        },
+    }
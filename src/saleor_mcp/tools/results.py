@@ -0,0 +1,216 @@
+from typing import Annotated, Any, Literal
+
+from pydantic_core import to_jsonable_python
+
+from ..watermarks import Changes
+
+ResultFormat = Annotated[
+    Literal["json", "table"],
+    "Format of the returned items. `json` returns a list of edges with a node "
+    "each. `table` returns the names of columns once, followed by a list of rows "
+    "with a value for every column. Nested objects are flattened to columns with "
+    "dotted names, like `total.gross.amount`, and nested lists of objects are "
+    "returned as tables as well.",
+]
+
+SelectedFields = Annotated[
+    list[str] | None,
+    "Fields of the items to fetch, as dotted paths like `id` or "
+    "`total.gross.amount`. Fields of items of nested lists skip `edges.node`, "
+    "like `productVariants.sku`. Only fields returned by default can be selected. An "
+    "object field without subfields, like `total`, is fetched with its default "
+    "subfields. All default fields are fetched if not provided. Selecting only "
+    "the needed fields makes responses smaller and faster.",
+]
+
+IncludeTotal = Annotated[
+    bool,
+    "Whether to return `totalCount`, the number of all items matching the "
+    "criteria. Counting them makes the request slower on large stores, so only "
+    "ask for it when the total is needed.",
+]
+
+Poller = Annotated[
+    str,
+    "Name of the poller to keep the watermark of changes for, like the name of "
+    "a monitoring job. Polls with the same name continue from the changes the "
+    "previous one returned.",
+]
+
+
+def page_result(
+    data: Any,
+    field: str,
+    format: Literal["json", "table"] = "json",
+    include_total: bool = False,
+) -> dict[str, Any]:
+    """Return a tool result with a page of the `field` connection of the data.
+
+    The total number of items is added when `include_total` is set.
+
+    Data returned without validation is spliced into the result as it is, so the
+    page is serialized straight from the upstream response, without building
+    or dumping a model for every edge.
+    """
+    edges, page_info = connection_page(data, field)
+    if isinstance(data, dict):
+        total_count = (data.get(field) or {}).get("totalCount")
+    else:
+        # Not every operation selects the total count.
+        total_count = getattr(getattr(data, field), "totalCount", None)
+    result: dict[str, Any] = {
+        field: _items(edges, format),
+        "pageInfo": page_info,
+        "totalFetched": len(edges),
+    }
+    if include_total:
+        result["totalCount"] = total_count
+    return {"data": result}
+
+
+def connection_page(data: Any, field: str) -> tuple[list[Any], Any]:
+    """Return the edges and page info of the `field` connection of the data."""
+    if isinstance(data, dict):
+        connection = data.get(field) or {}
+        return connection.get("edges") or [], connection.get("pageInfo")
+    connection = getattr(data, field)
+    edges = connection.edges if connection and connection.edges else []
+    return edges, connection.pageInfo if connection else None
+
+
+def changes_result(
+    changes: Changes, field: str, format: Literal["json", "table"] = "json"
+) -> dict[str, Any]:
+    """Return a tool result with a page of changed objects and the new watermark.
+
+    `reset` tells the poller that changes weren't fetched since its previous
+    watermark, but the watermark was reset to the current time.
+    """
+    return {
+        "data": {
+            field: _items(changes.edges, format),
+            "watermark": changes.watermark,
+            "hasMore": changes.has_more,
+            "reset": changes.reset,
+            "totalFetched": len(changes.edges),
+        },
+    }
+
+
+def ids_result(
+    edges_by_id: dict[str, Any],
+    ids: list[str],
+    field: str,
+    format: Literal["json", "table"] = "json",
+) -> dict[str, Any]:
+    """Return a tool result with the edges of objects in the order of their IDs.
+
+    IDs of objects which weren't found are listed in `notFound`.
+    """
+    ids = list(dict.fromkeys(ids))
+    edges = [edges_by_id[id] for id in ids if id in edges_by_id]
+    return {
+        "data": {
+            field: _items(edges, format),
+            "notFound": [id for id in ids if id not in edges_by_id],
+            "totalFetched": len(edges),
+        },
+    }
+
+
+def _items(edges: list[Any], format: Literal["json", "table"]) -> Any:
+    if format == "table":
+        return table(to_jsonable_python(edges, by_alias=True))
+    return edges
+
+
+def table(items: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return objects as column names and rows of values.
+
+    Objects wrapped in edges are unwrapped from their `node`. Nested objects are
+    flattened to columns, unless they are null in some of the rows, in which case
+    they are returned whole in a single column. Columns are listed in the order
+    they are first found. A nested list of objects is a column named by
+    a single-key object holding its columns, and its cells are lists of rows.
+    """
+    items = [_unwrap(item) for item in items]
+    nullable = _nullable_objects(items)
+    flat_items = [_flatten(item, nullable) for item in items]
+    columns: dict[str, Any] = {}
+    for item in flat_items:
+        columns.update(dict.fromkeys(item))
+
+    nested_rows: dict[str, list[Any]] = {}
+    for name in columns:
+        nested_items = [item.get(name) for item in flat_items]
+        if not any(isinstance(value, _Rows) for value in nested_items):
+            continue
+        nested = table([obj for value in nested_items if value for obj in value])
+        columns[name] = {name: nested["columns"]}
+        rows = iter(nested["rows"])
+        nested_rows[name] = [
+            [next(rows) for _ in value] if isinstance(value, _Rows) else value
+            for value in nested_items
+        ]
+
+    return {
+        "columns": [spec or name for name, spec in columns.items()],
+        "rows": [
+            [
+                nested_rows[name][index] if name in nested_rows else item.get(name)
+                for name in columns
+            ]
+            for index, item in enumerate(flat_items)
+        ],
+    }
+
+
+class _Rows(list):
+    """Objects of a nested list, returned as rows of a nested table."""
+
+
+def _unwrap(item: dict[str, Any]) -> dict[str, Any]:
+    if item.keys() == {"node"} and isinstance(item["node"], dict):
+        return item["node"]
+    return item
+
+
+def _nullable_objects(items: list[dict[str, Any]]) -> set[str]:
+    """Return names of nested objects which are null in some of the items."""
+    nulls: set[str] = set()
+    objects: set[str] = set()
+
+    def visit(value: dict[str, Any], prefix: str) -> None:
+        for key, item in value.items():
+            name = prefix + key
+            if item is None:
+                nulls.add(name)
+            elif isinstance(item, dict):
+                objects.add(name)
+                visit(item, name + ".")
+
+    for item in items:
+        visit(item, "")
+    return nulls & objects
+
+
+def _flatten(
+    value: dict[str, Any],
+    nullable: set[str],
+    prefix: str = "",
+    row: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    row = {} if row is None else row
+    for key, item in value.items():
+        name = prefix + key
+        if isinstance(item, dict) and name not in nullable:
+            _flatten(item, nullable, name + ".", row)
+        elif item and isinstance(item, list) and _is_objects(item):
+            row[name] = _Rows(_unwrap(obj) for obj in item)
+        else:
+            row[name] = item
+    return row
+
+
+def _is_objects(items: list[Any]) -> bool:
+    return all(isinstance(item, dict) for item in items)
@@ -3,9 +3,15 @@ from unittest.mock import patch
 import pytest
 from fastmcp import Client as MCPClient
 from fastmcp.exceptions import ToolError
+from graphql import parse, validate
 
+from saleor_mcp.cache_backends import MemoryCacheBackend
+from saleor_mcp.documents import get_schema
 from saleor_mcp.main import mcp
 from saleor_mcp.saleor_client.client import Client as SaleorClient
+from saleor_mcp.saleor_client.orders_total import OrdersTotal
+from saleor_mcp.tools import orders as orders_tools
+from saleor_mcp.watermarks import WatermarkStore
 
 
 @pytest.mark.asyncio
@@ -194,6 +200,49 @@ async def test_order_count_with_all_parameters(
         }
 
 
+@pytest.mark.asyncio
+async def test_orders_table_format(sample_orders_response, mock_saleor_config):
+    """Test orders fetch returning a table of columns and rows."""
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_orders") as mock_list_orders,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_list_orders.return_value = sample_orders_response
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool("orders", {"format": "table"})
+
+        data = result.structured_content["data"]
+        orders = data["orders"]
+        assert orders["columns"][:3] == ["id", "number", "status"]
+        assert len(orders["rows"]) == 1
+        assert orders["rows"][0][0] == sample_orders_response.orders.edges[0].node.id
+        assert data["pageInfo"]["hasNextPage"] is True
+        assert data["totalFetched"] == 1
+
+
+@pytest.mark.asyncio
+async def test_orders_total_count(sample_orders_response, mock_saleor_config):
+    """Test orders fetch asking for the total count only when requested."""
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_orders") as mock_list_orders,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_list_orders.return_value = sample_orders_response
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool("orders", {})
+            assert "totalCount" not in result.data["data"]
+            assert mock_list_orders.call_args[1]["withTotal"] is False
+
+            result = await mcp_client.call_tool("orders", {"include_total": True})
+            data = result.data["data"]
+            assert data["totalCount"] == sample_orders_response.orders.totalCount
+            assert mock_list_orders.call_args[1]["withTotal"] is True
+
+
 @pytest.mark.asyncio
 async def test_order_count_with_saleor_error(mock_saleor_config):
     """Test order count error handling."""
@@ -231,3 +280,120 @@ async def test_order_count_empty_result(
 
         data = result.data["data"]
         assert data["totalCount"] == 0
+
+
+@pytest.mark.asyncio
+async def test_order_count_series(orders_api):
+    """Test counting orders per day in aliased requests."""
+    orders_api.orders = [
+        {"id": f"T3JkZXI6{day}", "created": f"2025-01-{day:02}T10:00:00+00:00"}
+        for day in (1, 1, 2, 30)
+    ]
+
+    async with MCPClient(mcp) as mcp_client:
+        result = await mcp_client.call_tool(
+            "order_count_series",
+            {"gte": "2025-01-01", "lte": "2025-01-30", "filter": {"search": "hoodie"}},
+        )
+
+    data = result.structured_content["data"]
+    assert data["totalCount"] == 4
+    assert len(data["series"]) == 30
+    assert data["series"][0] == {
+        "start": "2025-01-01",
+        "end": "2025-01-01",
+        "totalCount": 2,
+    }
+    assert [bucket["totalCount"] for bucket in data["series"][1:3]] == [1, 0]
+    # 30 counts are chunked into two requests.
+    first, second = orders_api.requests
+    assert len(first["variables"]) == 25
+    assert len(second["variables"]) == 5
+    assert first["variables"]["filter0"] == {
+        "search": "hoodie",
+        "created": {"gte": "2025-01-01", "lte": "2025-01-01"},
+    }
+    assert validate(get_schema(), parse(second["query"])) == []
+
+
+@pytest.mark.asyncio
+async def test_orders_total(mock_saleor_config):
+    """Test fetching total sales amount of orders."""
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "orders_total") as mock_orders_total,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_orders_total.return_value = OrdersTotal.model_validate(
+            {
+                "ordersTotal": {
+                    "currency": "USD",
+                    "gross": {"amount": 1200.5, "currency": "USD"},
+                    "net": {"amount": 1000.0, "currency": "USD"},
+                }
+            }
+        )
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "orders_total", {"period": "THIS_MONTH", "channel": "default-channel"}
+            )
+
+        assert result.structured_content["data"]["ordersTotal"]["gross"] == {
+            "amount": 1200.5,
+            "currency": "USD",
+        }
+        mock_orders_total.assert_called_once_with(
+            period="THIS_MONTH", channel="default-channel"
+        )
+
+
+@pytest.mark.asyncio
+async def test_orders_changed_since(orders_api, monkeypatch):
+    """Test polling orders updated since the watermark of a poller."""
+    monkeypatch.setattr(
+        orders_tools, "watermark_store", WatermarkStore(MemoryCacheBackend())
+    )
+    orders_api.orders = [
+        {
+            "id": f"T3JkZXI6{number}",
+            "number": str(number),
+            "created": "2025-01-01T10:00:00+00:00",
+            "updatedAt": f"2025-01-0{day}T10:00:00+00:00",
+        }
+        for number, day in ((1, 3), (2, 1), (3, 2))
+    ]
+    args = {"poller": "job", "filter": {"search": "hoodie"}, "fields": ["number"]}
+
+    async with MCPClient(mcp) as mcp_client:
+        first = await mcp_client.call_tool(
+            "orders_changed_since",
+            {**args, "since": "2025-01-01T10:00:00+00:00", "first": 2},
+        )
+        second = await mcp_client.call_tool("orders_changed_since", args)
+
+    data = first.structured_content["data"]
+    assert [edge["node"]["number"] for edge in data["orders"]] == ["2", "3"]
+    assert data["watermark"] == "2025-01-02T10:00:00+00:00"
+    assert data["hasMore"] is True
+    assert data["reset"] is False
+    data = second.structured_content["data"]
+    assert [edge["node"]["number"] for edge in data["orders"]] == ["1"]
+    assert data["hasMore"] is False
+    variables = orders_api.requests[-1]["variables"]
+    assert variables["filter"] == {
+        "search": "hoodie",
+        "updatedAt": {"gte": "2025-01-02T10:00:00+00:00"},
+    }
+    assert variables["sortBy"] == {"field": "LAST_MODIFIED_AT", "direction": "ASC"}
+    assert validate(get_schema(), parse(orders_api.requests[-1]["query"])) == []
+
+
+@pytest.mark.asyncio
+async def test_orders_changed_since_requires_poller(orders_api):
+    """Test that changes can't be polled without a poller name."""
+    async with MCPClient(mcp) as mcp_client:
+        with pytest.raises(ToolError, match="poller"):
+            await mcp_client.call_tool("orders_changed_since", {})
+
+    assert orders_api.requests == []
@@ -1,11 +1,18 @@
+import json
 from unittest.mock import patch
 
+import httpx
 import pytest
 from fastmcp import Client as MCPClient
 from fastmcp.exceptions import ToolError
 
+from saleor_mcp.cache import CACHE_TTL_SETTINGS, ResponseCache
+from saleor_mcp.cache_backends import MemoryCacheBackend
+from saleor_mcp.client import SaleorClient as SaleorMCPClient
 from saleor_mcp.main import mcp
 from saleor_mcp.saleor_client.client import Client as SaleorClient
+from saleor_mcp.tools import products as products_tools
+from saleor_mcp.watermarks import WatermarkStore
 
 
 @pytest.mark.asyncio
@@ -286,3 +293,163 @@ async def test_warehouse_details_with_saleor_error(mock_saleor_config):
 
         assert "Invalid warehouse ID" in str(e.value)
         mock_warehouse_details.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_products_by_ids(sample_products_response, mock_saleor_config):
+    """Test fetching products by IDs returns them in the order of the IDs."""
+    edges = sample_products_response.products.edges
+    ids = [edges[1].node.id, "UHJvZHVjdDo5OQ==", edges[0].node.id]
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_products") as mock_list_products,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_list_products.return_value = sample_products_response
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "products_by_ids", {"ids": ids, "channel": "default-channel"}
+            )
+
+        data = result.structured_content["data"]
+        assert [edge["node"]["id"] for edge in data["products"]] == [ids[0], ids[2]]
+        assert data["notFound"] == [ids[1]]
+        assert data["totalFetched"] == 2
+
+        mock_list_products.assert_called_once()
+        call_args = mock_list_products.call_args
+        assert call_args[1]["first"] == 3
+        assert call_args[1]["where"] == {"ids": ids}
+        assert call_args[1]["channel"] == "default-channel"
+
+
+@pytest.mark.asyncio
+async def test_warehouses_details(sample_warehouse_response, mock_saleor_config):
+    """Test fetching details of many warehouses at once."""
+    warehouse = sample_warehouse_response.warehouse
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorMCPClient, "warehouses_details") as mock_warehouses_details,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_warehouses_details.return_value = {
+            warehouse.id: warehouse,
+            "V2FyZWhvdXNlOjk5": None,
+        }
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "warehouses_details",
+                {"ids": [warehouse.id, "V2FyZWhvdXNlOjk5", warehouse.id]},
+            )
+
+        data = result.structured_content["data"]
+        assert [item["id"] for item in data["warehouses"]] == [warehouse.id]
+        assert data["notFound"] == ["V2FyZWhvdXNlOjk5"]
+        assert data["totalFetched"] == 1
+        assert mock_warehouses_details.call_args[0][0] == [
+            warehouse.id,
+            "V2FyZWhvdXNlOjk5",
+        ]
+
+
+PRODUCT_SALES = {
+    "reportProductSales": {
+        "pageInfo": {
+            "hasNextPage": False,
+            "hasPreviousPage": False,
+            "startCursor": "YQ==",
+            "endCursor": "YQ==",
+        },
+        "edges": [
+            {
+                "node": {
+                    "id": "UHJvZHVjdFZhcmlhbnQ6MQ==",
+                    "name": "XL",
+                    "sku": "HOODIE-XL",
+                    "product": {"id": "UHJvZHVjdDox", "name": "Hoodie"},
+                    "quantityOrdered": 12,
+                    "revenue": {
+                        "gross": {"amount": 360.0, "currency": "USD"},
+                        "net": {"amount": 300.0, "currency": "USD"},
+                    },
+                }
+            }
+        ],
+    }
+}
+
+
+@pytest.mark.asyncio
+async def test_product_sales_report_is_cached(serve_saleor_api):
+    """Test product sales report is fetched once for repeated calls."""
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"data": PRODUCT_SALES})
+
+    cache = ResponseCache(
+        ttls={"ReportProductSales": CACHE_TTL_SETTINGS["ReportProductSales"][1]}
+    )
+    serve_saleor_api(handler, cache=cache)
+
+    async with MCPClient(mcp) as mcp_client:
+        for _ in range(2):
+            result = await mcp_client.call_tool(
+                "product_sales_report",
+                {"channel": "default-channel", "period": "THIS_MONTH"},
+            )
+
+    data = result.structured_content["data"]
+    assert data["totalFetched"] == 1
+    assert data["reportProductSales"] == PRODUCT_SALES["reportProductSales"]["edges"]
+    assert len(requests) == 1
+    assert requests[0]["variables"] == {
+        "period": "THIS_MONTH",
+        "channel": "default-channel",
+        "first": 100,
+        "after": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_products_changed_since(
+    sample_products_response, mock_saleor_config, monkeypatch
+):
+    """Test polling products updated since a given time, oldest update first."""
+    monkeypatch.setattr(
+        products_tools, "watermark_store", WatermarkStore(MemoryCacheBackend())
+    )
+    with (
+        patch("saleor_mcp.ctx_utils.get_config_from_headers") as mock_get_config,
+        patch.object(SaleorClient, "list_products") as mock_list_products,
+    ):
+        mock_get_config.return_value = mock_saleor_config
+        mock_list_products.return_value = sample_products_response
+
+        async with MCPClient(mcp) as mcp_client:
+            result = await mcp_client.call_tool(
+                "products_changed_since",
+                {
+                    "since": "2023-01-01T00:00:00Z",
+                    "poller": "job",
+                    "channel": "default-channel",
+                },
+            )
+
+        data = result.data["data"]
+        assert data["totalFetched"] == 2
+        assert data["watermark"] == "2023-02-02T00:00:00Z"
+        assert data["hasMore"] is True
+
+        call_args = mock_list_products.call_args
+        assert call_args[1]["channel"] == "default-channel"
+        assert call_args[1]["where"] == {
+            "updatedAt": {"range": {"gte": "2023-01-01T00:00:00+00:00"}}
+        }
+        assert call_args[1]["sortBy"] == {
+            "field": "LAST_MODIFIED_AT",
+            "direction": "ASC",
+        }
@@ -0,0 +1,120 @@
+from pydantic_core import to_jsonable_python
+
+from saleor_mcp.tools.results import page_result, table
+from saleor_mcp.trusted_data import TrustedData
+
+
+def test_page_result_splices_trusted_data(sample_orders_response):
+    """Test page results use trusted data as it is."""
+    data = TrustedData(sample_orders_response.model_dump(mode="json"))
+
+    result = page_result(data, "orders")
+
+    assert result["data"]["orders"] is data["orders"]["edges"]
+    assert result["data"]["pageInfo"] is data["orders"]["pageInfo"]
+    assert result["data"]["totalFetched"] == 1
+
+
+def test_page_result_matches_models(sample_orders_response):
+    """Test page results of trusted data match those of models."""
+    data = TrustedData(sample_orders_response.model_dump(mode="json"))
+
+    result = page_result(sample_orders_response, "orders")
+
+    assert result["data"]["orders"] == sample_orders_response.orders.edges
+    assert page_result(data, "orders") == {
+        "data": {
+            "orders": [
+                edge.model_dump(mode="json") for edge in result["data"]["orders"]
+            ],
+            "pageInfo": result["data"]["pageInfo"].model_dump(mode="json"),
+            "totalFetched": 1,
+        }
+    }
+
+
+def test_page_result_handles_missing_connection():
+    """Test page results of a missing connection are empty."""
+    expected = {"data": {"stocks": [], "pageInfo": None, "totalFetched": 0}}
+
+    assert page_result(TrustedData({"stocks": None}), "stocks") == expected
+
+
+def test_table_flattens_nested_objects():
+    """Test tables flatten nested objects into columns."""
+    items = [
+        {"node": {"id": "1", "total": {"amount": 10.5}, "voucher": {"code": "A"}}},
+        {"node": {"id": "2", "total": {"amount": 3.0}, "voucher": None}},
+    ]
+
+    assert table(items) == {
+        "columns": ["id", "total.amount", "voucher"],
+        "rows": [["1", 10.5, {"code": "A"}], ["2", 3.0, None]],
+    }
+
+
+def test_table_returns_nested_lists_of_objects_as_tables():
+    """Test nested lists of objects are returned as tables."""
+    items = [
+        {
+            "id": "1",
+            "lines": [{"sku": "A", "quantity": 1}, {"sku": "B", "quantity": 2}],
+            "tags": ["new"],
+        },
+        {"id": "2", "lines": [], "tags": []},
+        {"id": "3", "lines": [{"sku": "C", "price": {"amount": 3}}], "tags": []},
+    ]
+
+    assert table(items) == {
+        "columns": [
+            "id",
+            {"lines": ["sku", "quantity", "price.amount"]},
+            "tags",
+        ],
+        "rows": [
+            ["1", [["A", 1, None], ["B", 2, None]], ["new"]],
+            ["2", [], []],
+            ["3", [["C", None, 3]], []],
+        ],
+    }
+
+
+def unflatten(columns, row):
+    """Rebuild an object from a table row, for checking that nothing is lost."""
+    item = {}
+    for column, value in zip(columns, row, strict=True):
+        if isinstance(column, dict):
+            ((name, nested_columns),) = column.items()
+            value = [unflatten(nested_columns, nested) for nested in value]
+        else:
+            name = column
+        *path, key = name.split(".")
+        target = item
+        for part in path:
+            target = target.setdefault(part, {})
+        target[key] = value
+    return item
+
+
+def without_nodes(value):
+    """Unwrap objects from edges, like tables do."""
+    if isinstance(value, list):
+        return [without_nodes(item) for item in value]
+    if isinstance(value, dict):
+        if value.keys() == {"node"}:
+            return without_nodes(value["node"])
+        return {key: without_nodes(item) for key, item in value.items()}
+    return value
+
+
+def test_table_keeps_all_data(sample_orders_response, sample_products_response):
+    """Test tables keep all data of the items."""
+    for data, field in (
+        (sample_orders_response, "orders"),
+        (sample_products_response, "products"),
+    ):
+        edges = page_result(data, field)["data"][field]
+        result = page_result(data, field, "table")["data"][field]
+
+        nodes = [unflatten(result["columns"], row) for row in result["rows"]]
+        assert nodes == without_nodes(to_jsonable_python(edges))
@@ -0,0 +1,28 @@
+from typing import Any
+
+
+class TrustedData(dict):
+    """Response data used as it was returned by Saleor, without validation.
+
+    Fields can be read as attributes, like on the generated models, and nested
+    objects are wrapped when they are read. Being a plain dict otherwise, it's
+    serialized as is, without building and dumping a model for every object.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return wrap(value)
+
+
+def wrap(value: Any) -> Any:
+    """Wrap dicts, and dicts in a list, in `TrustedData`."""
+    if isinstance(value, dict) and not isinstance(value, TrustedData):
+        return TrustedData(value)
+    if isinstance(value, list):
+        return [wrap(item) for item in value]
+    return value
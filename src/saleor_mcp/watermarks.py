@@ -0,0 +1,162 @@
+import hashlib
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from . import json_codec
+from .cache_backends import KEY_PREFIX, CacheBackend, CacheEntry, create_cache_backend
+from .client import SaleorClient, hash_token
+from .config import get_env_float, get_env_int
+
+
+@dataclass
+class Watermark:
+    """Time of the last update of objects returned so far.
+
+    Objects updated at that very time are fetched again by the next poll, since
+    the filter includes it, so their IDs are kept to skip them.
+    """
+
+    updated_at: str
+    ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Changes:
+    """Page of changed objects returned by a poll."""
+
+    edges: list[Any]
+    watermark: str
+    has_more: bool
+    # Set when there was no watermark to continue from, so the poll started
+    # watching for changes from the current time.
+    reset: bool = False
+
+
+class WatermarkStore:
+    """Keep watermarks of pollers of changes, expiring after `ttl` seconds.
+
+    Watermarks are stored in a cache backend of their own, not shared with cached
+    responses, so they aren't evicted to make room for responses. Processes
+    sharing the backend share the watermarks too, and the memory backend bounds
+    the memory they take.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = 7 * 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.clock = clock
+
+    async def get(self, key: str) -> Watermark | None:
+        entry = await self.backend.get(key)
+        if entry is None or entry.stale_until <= self.clock():
+            return None
+        value = json_codec.loads(entry.value)
+        return Watermark(updated_at=value["updatedAt"], ids=value["ids"])
+
+    async def set(self, key: str, watermark: Watermark) -> None:
+        expires_at = self.clock() + self.ttl
+        await self.backend.set(
+            key,
+            CacheEntry(
+                value=json_codec.dumps(
+                    {"updatedAt": watermark.updated_at, "ids": watermark.ids}
+                ),
+                fresh_until=expires_at,
+                stale_until=expires_at,
+            ),
+        )
+
+
+def watermark_key(
+    client: SaleorClient, poller: str, kind: str, filter: dict[str, Any] | None
+) -> str:
+    """Return the key of a watermark of a poller of changes of a kind of objects.
+
+    Polls with different filters, tokens or API URLs don't share watermarks.
+    """
+    token_hash = hash_token((client.headers or {}).get("Authorization", ""))
+    filter_hash = hashlib.sha256(
+        json_codec.dumps(filter or {}, sort_keys=True)
+    ).hexdigest()
+    key = "\0".join((client.url.rstrip("/"), token_hash, poller, kind, filter_hash))
+    return f"{KEY_PREFIX}watermark:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+async def fetch_changes(
+    store: WatermarkStore,
+    key: str,
+    since: str | None,
+    fetch_page: Callable[[str, str | None], Awaitable[tuple[list[Any], Any]]],
+) -> Changes:
+    """Return a page of changes since the watermark and move the watermark on.
+
+    `fetch_page` gets the time to fetch objects updated since and a cursor, and
+    returns a page of edges sorted by `updatedAt` with its page info. A single
+    page of changes is returned, so memory doesn't grow with their number.
+
+    Without a stored watermark or `since`, like on the first poll or after the
+    watermark expired, the watermark is reset to the current time and no changes
+    are returned, with `reset` set.
+    """
+    watermark = await store.get(key)
+    if since is not None:
+        watermark = Watermark(updated_at=since)
+    if watermark is None:
+        now = time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(store.clock()))
+        await store.set(key, Watermark(updated_at=now))
+        return Changes(edges=[], watermark=now, has_more=False, reset=True)
+
+    skipped_ids = set(watermark.ids)
+    after = None
+    while True:
+        edges, page_info = await fetch_page(watermark.updated_at, after)
+        has_more = bool(_value(page_info, "hasNextPage"))
+        edges = [edge for edge in edges if _node(edge, "id") not in skipped_ids]
+        # Pages of objects skipped as returned before are passed over.
+        if edges or not has_more:
+            break
+        after = _value(page_info, "endCursor")
+
+    if edges:
+        updated_at = max(_node(edge, "updatedAt") for edge in edges)
+        ids = [
+            _node(edge, "id")
+            for edge in edges
+            if _node(edge, "updatedAt") == updated_at
+        ]
+        if updated_at == watermark.updated_at:
+            ids = [*watermark.ids, *ids]
+        watermark = Watermark(updated_at=updated_at, ids=ids)
+    await store.set(key, watermark)
+    return Changes(edges=edges, watermark=watermark.updated_at, has_more=has_more)
+
+
+def _value(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name)
+
+
+def _node(edge: Any, name: str) -> Any:
+    value = _value(_value(edge, "node"), name)
+    # Validated models parse dates, while raw responses keep them as strings.
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+watermark_store = WatermarkStore(
+    create_cache_backend(
+        os.getenv("WATERMARK_URL", "memory://"),
+        max_bytes=get_env_int("WATERMARK_MAX_BYTES", 16 * 1024 * 1024),
+    ),
+    ttl=get_env_float("WATERMARK_TTL", 7 * 86400.0),
+)
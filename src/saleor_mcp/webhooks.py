@@ -0,0 +1,120 @@
+import hashlib
+import hmac
+import logging
+import os
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from .cache import response_cache
+from .config import validate_api_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_OPERATIONS = ("ListChannels", "ListProducts")
+CUSTOMER_OPERATIONS = ("ListCustomers",)
+ORDER_OPERATIONS = ("ListOrders", "CountOrders", "OrdersTotal", "ReportProductSales")
+PRODUCT_OPERATIONS = ("ListProducts", "ListStocks")
+STOCK_OPERATIONS = ("ListStocks",)
+SHIPPING_ZONE_OPERATIONS = ("WarehouseDetails",)
+WAREHOUSE_OPERATIONS = ("WarehouseDetails", "ListChannels", "ListStocks")
+
+# Cached operations whose responses can change after a given webhook event.
+INVALIDATED_OPERATIONS: dict[str, tuple[str, ...]] = {
+    "CHANNEL_CREATED": CHANNEL_OPERATIONS,
+    "CHANNEL_UPDATED": CHANNEL_OPERATIONS,
+    "CHANNEL_DELETED": CHANNEL_OPERATIONS,
+    "CHANNEL_STATUS_CHANGED": CHANNEL_OPERATIONS,
+    "CUSTOMER_CREATED": CUSTOMER_OPERATIONS,
+    "CUSTOMER_UPDATED": CUSTOMER_OPERATIONS,
+    "CUSTOMER_DELETED": CUSTOMER_OPERATIONS,
+    "ORDER_CREATED": ORDER_OPERATIONS,
+    "ORDER_CONFIRMED": ORDER_OPERATIONS,
+    "ORDER_PAID": ORDER_OPERATIONS,
+    "ORDER_FULLY_PAID": ORDER_OPERATIONS,
+    "ORDER_REFUNDED": ORDER_OPERATIONS,
+    "ORDER_FULLY_REFUNDED": ORDER_OPERATIONS,
+    "ORDER_UPDATED": ORDER_OPERATIONS,
+    "ORDER_CANCELLED": ORDER_OPERATIONS,
+    "ORDER_EXPIRED": ORDER_OPERATIONS,
+    "ORDER_FULFILLED": ORDER_OPERATIONS,
+    "ORDER_BULK_CREATED": ORDER_OPERATIONS,
+    "PRODUCT_CREATED": PRODUCT_OPERATIONS,
+    "PRODUCT_UPDATED": PRODUCT_OPERATIONS,
+    "PRODUCT_DELETED": PRODUCT_OPERATIONS,
+    "PRODUCT_VARIANT_CREATED": PRODUCT_OPERATIONS,
+    "PRODUCT_VARIANT_UPDATED": PRODUCT_OPERATIONS,
+    "PRODUCT_VARIANT_DELETED": PRODUCT_OPERATIONS,
+    "PRODUCT_VARIANT_OUT_OF_STOCK": STOCK_OPERATIONS,
+    "PRODUCT_VARIANT_BACK_IN_STOCK": STOCK_OPERATIONS,
+    "PRODUCT_VARIANT_STOCK_UPDATED": STOCK_OPERATIONS,
+    "SHIPPING_ZONE_CREATED": SHIPPING_ZONE_OPERATIONS,
+    "SHIPPING_ZONE_UPDATED": SHIPPING_ZONE_OPERATIONS,
+    "SHIPPING_ZONE_DELETED": SHIPPING_ZONE_OPERATIONS,
+    "WAREHOUSE_CREATED": WAREHOUSE_OPERATIONS,
+    "WAREHOUSE_UPDATED": WAREHOUSE_OPERATIONS,
+    "WAREHOUSE_DELETED": WAREHOUSE_OPERATIONS,
+    "WAREHOUSE_METADATA_UPDATED": WAREHOUSE_OPERATIONS,
+}
+
+
+def webhook_secret(secret_key: str, api_url: str) -> str:
+    """Return the secret key of webhooks of a Saleor instance.
+
+    Every instance gets a key of its own, derived from `WEBHOOK_SECRET_KEY` and
+    its API URL, so a signature is only valid for the API URL it was made for.
+    """
+    return hmac.new(
+        secret_key.encode(), api_url.rstrip("/").encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
+    """Check the HMAC-SHA256 signature Saleor sends for webhooks with a secret key."""
+    expected = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+async def handle_saleor_webhook(request: Request) -> JSONResponse:
+    """Evict cached responses affected by a Saleor webhook event.
+
+    The webhook must be created in Saleor with the secret key of its instance,
+    returned by `webhook_secret` for the `WEBHOOK_SECRET_KEY` env variable and
+    the API URL, which is used to verify the payload signature. Responses cached
+    for the API URL that sent the event are evicted, regardless of the auth token
+    they were fetched with.
+    """
+    secret_key = os.getenv("WEBHOOK_SECRET_KEY", "")
+    if not secret_key:
+        return JSONResponse({"error": "Webhooks are not enabled"}, status_code=404)
+
+    api_url = request.headers.get("saleor-api-url")
+    event = request.headers.get("saleor-event", "").upper()
+    if not api_url or not event:
+        return JSONResponse(
+            {"error": "Missing Saleor-Api-Url or Saleor-Event header"},
+            status_code=400,
+        )
+
+    payload = await request.body()
+    signature = request.headers.get("saleor-signature", "")
+    if not verify_signature(payload, signature, webhook_secret(secret_key, api_url)):
+        return JSONResponse({"error": "Invalid signature"}, status_code=401)
+
+    allowed_domain_pattern = os.getenv("ALLOWED_DOMAIN_PATTERN", "")
+    if allowed_domain_pattern and not validate_api_url(api_url, allowed_domain_pattern):
+        return JSONResponse(
+            {"error": f"API URL '{api_url}' is not allowed"}, status_code=403
+        )
+
+    operations = INVALIDATED_OPERATIONS.get(event, ())
+    invalidated = (
+        await response_cache.invalidate(api_url, operations) if operations else 0
+    )
+    logger.info(
+        "Received %s webhook from %s, invalidated %d cached responses",
+        event,
+        api_url,
+        invalidated,
+    )
+    return JSONResponse({"event": event, "invalidated": invalidated})